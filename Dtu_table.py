@@ -1,92 +1,529 @@
 #%%
-import csv
+import copy
+import itertools
+import math
+import os
+import threading
+from bisect import bisect_left
+from collections import namedtuple
 import numpy as np
+from polar_io import get_polar_cache_path, load_polar_cache, read_polars, save_polar_cache
+
+PolarCoefficients = namedtuple('PolarCoefficients', ['Cl', 'Cd', 'Cm'])
+""" οι αεροδυναμικοί συντελεστές Cl, Cd, Cm που επιστρέφει η μέθοδος coefficients (αριθμοί ή πίνακες) """
+
+PolarTables = namedtuple('PolarTables', [
+    'tc_values', 'angles', 'coefs', 'angle_step', 'original_angles', 'original_coefs', 're_values', 're_coefs',
+    'original_re_coefs', 'tc_list', 'angle_list', 'coef_list', 'log_re_list', 're_coef_lists', 'source_signature', 'version'])
+"""
+όλοι οι πίνακες ενός DTU_calc σε μία αμετάβλητη πλειάδα (βλ. DTU_calc.tables): οι πίνακες NumPy, τα αντίγραφά τους σε
+λίστες Python (tc_list, angle_list, coef_list, log_re_list, re_coef_lists) για τις μεμονωμένες τιμές, η υπογραφή του
+αρχείου από το οποίο διαβάστηκαν και η έκδοσή τους
+"""
+
+_table_versions = itertools.count(1) # μοναδικές εκδόσεις πινάκων (το next είναι ατομικό)
+
+def _uniform_angles(original_angles, angle_step):
+    """ 
+    ομοιόμορφο πλέγμα γωνιών από την ελάχιστη ως τη μέγιστη γωνία του αρχείου. Το βήμα προσαρμόζεται ελάχιστα ώστε
+    το πλέγμα να τελειώνει ακριβώς στη μέγιστη γωνία.
+
+    Returns:
+        (tuple): οι γωνίες και το προσαρμοσμένο βήμα
+    """
+    angle0, angle_last = original_angles[0], original_angles[-1]
+    no_angles = max(int(round((angle_last - angle0) / angle_step)), 1) + 1
+    return np.linspace(angle0, angle_last, no_angles), float((angle_last - angle0) / (no_angles - 1))
+
+def get_uniform_bracket_index(angle0, angle_step, no_angles, desired_values):
+    """ 
+    οι δείκτες i ώστε angles[i] <= desired_value <= angles[i+1] για ομοιόμορφο πλέγμα γωνιών
+    angles = angle0 + k * angle_step, μόνο με αριθμητική πράξη: floor((α - α0) / Δα)
+    """
+    i = np.floor((np.asarray(desired_values, dtype=float) - angle0) / angle_step).astype(int)
+    return np.clip(i, 0, no_angles - 2)
+
+def get_reynolds_bracket(re_values, reynolds):
+    """ 
+    οι δείκτες i1, i2 και τα βάρη w για τη γραμμική παρεμβολή ως προς log(Re) ανάμεσα στους πίνακες re_values[i1] και
+    re_values[i2]: y = (1 - w) * y[i1] + w * y[i2]. Οι αριθμοί Reynolds εκτός του εύρους του αρχείου αντιστοιχούν
+    στον πλησιέστερο πίνακα (δεν γίνεται προέκταση). Δέχεται αριθμό ή πίνακα τιμών.
+    """
+    log_re = np.log(re_values)
+    log_reynolds = np.log(np.clip(np.asarray(reynolds, dtype=float), re_values[0], re_values[-1]))
+    if re_values.size == 1:
+        i = np.zeros(log_reynolds.shape, dtype=int)
+        return i, i, np.zeros(log_reynolds.shape)
+    i = np.clip(np.searchsorted(log_re, log_reynolds, side='left') - 1, 0, re_values.size - 2)
+    return i, i + 1, (log_reynolds - log_re[i]) / (log_re[i + 1] - log_re[i])
+
+def _table_property(name):
+    """ ιδιότητα μόνο για ανάγνωση του πεδίου name του DTU_calc.tables """
+    return property(lambda self: getattr(self.tables, name), doc=f"το πεδίο {name} του self.tables")
+
+def _interpolate_angles(angles, original_angles, table):
+    """ γραμμική παρεμβολή των συντελεστών του πίνακα table (..., n_angles, 3) στις γωνίες angles """
+    flat = table.reshape(-1, original_angles.size, table.shape[-1])
+    resampled = np.empty((flat.shape[0], angles.size, table.shape[-1]))
+    for i in range(flat.shape[0]):
+        for k in range(table.shape[-1]):
+            resampled[i, :, k] = np.interp(angles, original_angles, flat[i, :, k])
+    return resampled.reshape(table.shape[:-2] + resampled.shape[-2:])
 
 class DTU_calc:
     """
     Κλάση για τον υπολογισμό των αεροδυναμικών συντελεστών άνωσης και οπισθέλκουσας
     για την αεροτομή DTU με βάση τη γωνία προσβολής αλλά και το λόγο t/c (thickness / chord ratio)
     """
-    def __init__(self, csv_data_file_DTU):
+    coef_names = PolarCoefficients._fields # η σειρά των συντελεστών στην τελευταία διάσταση του πίνακα self.coefs
+    tc_values = _table_property('tc_values')
+    angles = _table_property('angles')
+    coefs = _table_property('coefs')
+    angle_step = _table_property('angle_step')
+    original_angles = _table_property('original_angles')
+    original_coefs = _table_property('original_coefs')
+    re_values = _table_property('re_values')
+    re_coefs = _table_property('re_coefs')
+    original_re_coefs = _table_property('original_re_coefs')
+    source_signature = _table_property('source_signature')
+    version = _table_property('version')
+
+    def __init__(self, csv_data_file_DTU, angle_step=None, use_cache=True, cache_dir=None, reynolds=None):
         """ 
-        Δημιουργούμε ένα λεξικό που θα αποθηκεύει τα δεδομένα της αεροτομής. Στη συνέχεια
-        χρησιμοποιούμε ένα σύνολο (set) για να αποθηκεύουμε τις μοναδικές τιμές του λόγου t/c που υπάρχουν στο αρχείο CSV. 
-        Τέλος καλούμε τη μέθοδο load_data, η οποία θα διαβάσει το αρχείο CSV και θα γεμίσει τo λεξικό.
+        Τα δεδομένα της αεροτομής αποθηκεύονται σε συνεχόμενους ταξινομημένους πίνακες NumPy:
+        self.tc_values (n_tc) με τους λόγους t/c, self.angles (n_angles) με τις γωνίες προσβολής και
+        self.coefs (n_tc, n_angles, 3) με τους συντελεστές Cl, Cd, Cm για κάθε οικογένεια t/c.
+        Αν το αρχείο έχει στήλη Reynolds, self.re_values (n_re) είναι οι αριθμοί Reynolds και self.re_coefs (n_re, n_tc, n_angles, 3)
+        οι πίνακες για κάθε Re, ενώ ο self.coefs αντιστοιχεί στον αριθμό Reynolds αναφοράς reynolds (ο μικρότερος του αρχείου
+        αν δεν δοθεί) και χρησιμοποιείται όταν δεν δίνεται Re στην coefficients. Χωρίς στήλη Reynolds, self.re_values = None.
+        Αν δοθεί το angle_step, οι πίνακες επαναδειγματοληπτούνται σε ομοιόμορφο πλέγμα γωνιών (βλ. resample).
+        Τέλος καλούμε τη μέθοδο load_data, η οποία θα διαβάσει το αρχείο CSV και θα γεμίσει τους πίνακες.
+        Με use_cache=True οι πίνακες αποθηκεύονται και σε δυαδικό αρχείο .npz (βλ. get_polar_cache_path),
+        από το οποίο διαβάζονται στις επόμενες φορές, μέχρι να αλλάξει το περιεχόμενο του αρχείου CSV.
+        Με csv_data_file_DTU=None οι πίνακες δίνονται αργότερα με την set_arrays (βλ. from_arrays).
+
+        Όλοι οι πίνακες βρίσκονται στην αμετάβλητη πλειάδα self.tables (PolarTables), την οποία κάθε ανάγνωση του αρχείου
+        αντικαθιστά με μία ανάθεση. Οι μέθοδοι υπολογισμού διαβάζουν μία φορά το self.tables, επομένως ένα νήμα που
+        υπολογίζει συντελεστές ενώ άλλο ξαναδιαβάζει το αρχείο (reload_if_changed) χρησιμοποιεί πάντα πίνακες της ίδιας ανάγνωσης.
+        Τα self.tc_values, self.angles, self.coefs κ.λπ. είναι ιδιότητες μόνο για ανάγνωση των πεδίων του self.tables.
         """
-        self.data = {} 
-        self.tc_values = set() 
-        self.load_data(csv_data_file_DTU) 
+        empty_coefs = np.empty((0, 0, len(self.coef_names)))
+        # angle_step: το βήμα του ομοιόμορφου πλέγματος γωνιών (None για τις γωνίες του αρχείου),
+        # version: αλλάζει κάθε φορά που αλλάζουν οι πίνακες (βλ. set_arrays)
+        self.tables = PolarTables(np.empty(0), np.empty(0), empty_coefs, angle_step, np.empty(0), empty_coefs, None, None,
+                                  None, [], [], [], None, None, None, 0)
+        self.reynolds = reynolds
+        self.csv_data_file = None
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.cache_path = None # το αρχείο cache από το οποίο διαβάστηκαν (ή στο οποίο αποθηκεύτηκαν) οι πίνακες
+        self._reload_lock = threading.Lock() # ώστε πολλά νήματα να μην ξαναδιαβάζουν ταυτόχρονα το ίδιο αρχείο
+        if csv_data_file_DTU is not None:
+            self.load_data(csv_data_file_DTU) 
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_reload_lock"] # (τα locks δεν αντιγράφονται με pickle)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reload_lock = threading.Lock()
+
+    @classmethod
+    def from_arrays(cls, tc_values, angles, coefs, re_values=None, angle_step=None, reynolds=None):
+        """ 
+        δημιουργία από πίνακες της μορφής της set_arrays (π.χ. τους original_* πίνακες ενός άλλου DTU_calc),
+        χωρίς αρχείο csv. Οι πίνακες δεν αντιγράφονται, επομένως μπορούν να βρίσκονται σε κοινόχρηστη μνήμη (βλ. parallel_sweep).
+        """
+        dtu = cls(None, angle_step=angle_step, use_cache=False, reynolds=reynolds)
+        dtu.set_arrays(tc_values, angles, coefs, re_values)
+        return dtu
 
     def load_data(self, csv_data_file_DTU):
-        with open(csv_data_file_DTU, mode='r') as file:
-            reader = csv.reader(file, delimiter=';')
-            next(reader) # Αγνοούμε την πρώτη γραμμή του αρχείου που είναι οι επικεφαλίδες από κάθε στήλη
-            for row in reader:
-                angle_of_attack = round(float(row[0]), 3)
-                cl_value = float(row[1])
-                cd_value = float(row[2])
-                cm_value = float(row[3])
-                tc_ratio = float(row[4]) # Ο λόγος t/c
-                
-                """ 
-                Αν το tc_ratio δεν υπάρχει ήδη στο self.data, δημιουργούμε ένα νέο υπολεξικό για αυτό.
-                Αποθηκεύουμε στο λεξικό self.data τα δεδομένα των συντελεστών Cl, Cd, Cm με βάση τη γωνία προσβολής.
-                Προσθέτουμε την τιμή του tc_ratio στο σύνολο self.tc_values
-                """
-                if tc_ratio not in self.data: 
-                    self.data[tc_ratio] = {}
-                self.data[tc_ratio][angle_of_attack] = {'Cl': cl_value, 'Cd': cd_value, 'Cm': cm_value} 
-                self.tc_values.add(tc_ratio) 
-        
-        """ 
-        Ταξινόμηση των λόγων t/c, δηλαδή ταξινομούμε τη λίστα self.tc_values, ώστε οι τιμές t/c να είναι με αύξουσα σειρά.
-        Ταξινόμηση των γωνιών προσβολής για κάθε t/c, δηλαδή για κάθε tc_ratio ταξινομούμε τις γωνίες προσβολής (angle_of_attack) μέσα στο λεξικό.
-        """
-        self.tc_values = sorted(self.tc_values) 
-        for tc in self.data:
-            self.data[tc] = dict(sorted(self.data[tc].items())) 
+        """ ανάγνωση των πινάκων από το αρχείο (ή την cache του) και αντικατάσταση του self.tables με μία ανάθεση """
+        source_signature = self.get_source_signature(csv_data_file_DTU)
+        cache_path = get_polar_cache_path(csv_data_file_DTU, self.cache_dir) if self.use_cache else None
+        arrays = load_polar_cache(cache_path) if self.use_cache else None
+        if arrays is not None:
+            tables = self._build_tables(arrays["tc_values"], arrays["angles"], arrays["coefs"], arrays.get("re_values"),
+                                        source_signature)
+        else:
+            polars = read_polars(csv_data_file_DTU) # CSV (',' ή ';') ή XLSX, βλ. polar_io
+            tables = self._build_tables(polars.tc_values, polars.angles, polars.coefs, polars.re_values, source_signature)
+            if self.use_cache:
+                if tables.re_values is None:
+                    save_polar_cache(cache_path, tc_values=tables.tc_values, angles=tables.original_angles,
+                                     coefs=tables.original_coefs)
+                else:
+                    save_polar_cache(cache_path, tc_values=tables.tc_values, angles=tables.original_angles,
+                                     coefs=tables.original_re_coefs, re_values=tables.re_values)
+        self.csv_data_file = csv_data_file_DTU
+        self.cache_path = cache_path
+        self.tables = tables
+
+    def set_tables(self, data):
+        """ 
+        Δημιουργία των πινάκων από λεξικό της μορφής {t/c: {γωνία προσβολής: (Cl, Cd, Cm)}}.
+        Οι λόγοι t/c και οι γωνίες προσβολής ταξινομούνται με αύξουσα σειρά. Αν οι οικογένειες t/c δεν έχουν
+        τις ίδιες γωνίες προσβολής, κάθε οικογένεια παρεμβάλλεται γραμμικά στην ένωση των γωνιών (η παρεμβολή
+        ως προς τη γωνία προσβολής δεν αλλάζει, αφού περιλαμβάνει ήδη τα σημεία κάθε οικογένειας).
+        """
+        tc_values = np.array(sorted(data), dtype=float)
+        angles = np.array(sorted(set().union(*(data[tc].keys() for tc in data))), dtype=float)
+        coefs = np.empty((tc_values.size, angles.size, len(self.coef_names)))
+        for i, tc in enumerate(tc_values):
+            family = sorted(data[tc].items())
+            family_angles = np.array([angle for angle, _ in family])
+            family_coefs = np.array([values for _, values in family], dtype=float)
+            for k in range(len(self.coef_names)):
+                coefs[i, :, k] = np.interp(angles, family_angles, family_coefs[:, k])
+        self.set_arrays(tc_values, angles, coefs)
+
+    def set_arrays(self, tc_values, angles, coefs, re_values=None):
+        """ 
+        Δημιουργία των πινάκων από τους ταξινομημένους πίνακες tc_values (n_tc), angles (n_angles)
+        και coefs (n_tc, n_angles, 3), π.χ. όπως διαβάζονται από την cache. Αν δοθούν οι αριθμοί Reynolds
+        re_values (n_re), ο coefs έχει σχήμα (n_re, n_tc, n_angles, 3).
+        """
+        self.tables = self._build_tables(tc_values, angles, coefs, re_values, self.source_signature)
+
+    def _build_tables(self, tc_values, angles, coefs, re_values=None, source_signature=None, angle_step=None):
+        """ 
+        οι νέοι πίνακες (PolarTables) από τους πίνακες της set_arrays, με ομοιόμορφο πλέγμα γωνιών βήματος angle_step
+        (ή self.angle_step αν δεν δοθεί). Δεν αλλάζει το self.
+        """
+        if angle_step is None:
+            angle_step = self.angle_step
+        tc_values = np.asarray(tc_values, dtype=float)
+        original_angles = np.asarray(angles, dtype=float)
+        if re_values is None:
+            original_re_coefs = None
+            original_coefs = np.asarray(coefs, dtype=float)
+        else:
+            re_values = np.asarray(re_values, dtype=float)
+            original_re_coefs = np.asarray(coefs, dtype=float)
+            original_coefs = self._reference_table(re_values, original_re_coefs)
+        angles, coefs, re_coefs = original_angles, original_coefs, original_re_coefs
+        if angle_step is not None:
+            angles, angle_step = _uniform_angles(original_angles, angle_step)
+            coefs = _interpolate_angles(angles, original_angles, original_coefs)
+            if re_values is not None:
+                re_coefs = _interpolate_angles(angles, original_angles, original_re_coefs)
+        # αντίγραφα σε λίστες Python για τη γρήγορη αναζήτηση μεμονωμένων τιμών (αποφεύγεται το κόστος των κλήσεων NumPy)
+        return PolarTables(
+            tc_values, angles, coefs, angle_step, original_angles, original_coefs, re_values, re_coefs, original_re_coefs,
+            tc_values.tolist(), angles.tolist(), coefs.tolist(),
+            None if re_values is None else np.log(re_values).tolist(), None if re_values is None else re_coefs.tolist(),
+            source_signature, next(_table_versions))
+
+    def _reference_table(self, re_values, re_coefs):
+        """ ο πίνακας (n_tc, n_angles, 3) των re_coefs για τον αριθμό Reynolds αναφοράς self.reynolds """
+        i1, i2, w = get_reynolds_bracket(re_values, re_values[0] if self.reynolds is None else self.reynolds)
+        return (1 - w) * re_coefs[i1] + w * re_coefs[i2]
+
+    def resample(self, angle_step):
+        """ 
+        μέθοδος που επιστρέφει αντίγραφο του πίνακα με ομοιόμορφο πλέγμα γωνιών προσβολής βήματος angle_step (σε μοίρες).
+        Στο ομοιόμορφο πλέγμα η αναζήτηση της γωνίας γίνεται μόνο με αριθμητική πράξη, floor((α - α0) / Δα),
+        αντί για δυαδική αναζήτηση. Το σφάλμα παρεμβολής σε σχέση με τον αρχικό πίνακα δίνει η max_interpolation_error.
+
+        Returns:
+            (DTU_calc): ο επαναδειγματοληπτημένος πίνακας
+        """
+        tables = self.tables
+        resampled = copy.copy(self)
+        resampled._reload_lock = threading.Lock()
+        resampled.tables = self._build_tables(
+            tables.tc_values, tables.original_angles, tables.original_coefs if tables.re_values is None else tables.original_re_coefs,
+            tables.re_values, tables.source_signature, angle_step)
+        return resampled
+
+    def max_interpolation_error(self):
+        """ 
+        το μέγιστο απόλυτο σφάλμα των συντελεστών του (επαναδειγματοληπτημένου) πίνακα σε σχέση με τον αρχικό πίνακα του αρχείου.
+        Και οι δύο πίνακες είναι τμηματικά γραμμικοί ως προς τη γωνία, επομένως το μέγιστο σφάλμα εμφανίζεται στις γωνίες του αρχείου.
+
+        Returns:
+            (dict): το μέγιστο σφάλμα για κάθε συντελεστή
+        """
+        tables = self.tables
+        errors = np.zeros(len(self.coef_names))
+        for i in range(tables.tc_values.size):
+            for k in range(len(self.coef_names)):
+                values = np.interp(tables.original_angles, tables.angles, tables.coefs[i, :, k])
+                errors[k] = max(errors[k], np.max(np.abs(values - tables.original_coefs[i, :, k])))
+        return dict(zip(self.coef_names, errors.tolist()))
+
+    def resampling_report(self, angle_steps=(0.1, 0.25, 0.5, 1.0, 2.0)):
+        """ 
+        αναφορά του μέγιστου σφάλματος παρεμβολής για διάφορα βήματα ομοιόμορφου πλέγματος,
+        ώστε να επιλέγεται η ανάλυση γνωρίζοντας την ακρίβεια που θυσιάζεται
+
+        Returns:
+            (list): ένα λεξικό για κάθε βήμα με το βήμα, το πλήθος των γωνιών και το μέγιστο σφάλμα κάθε συντελεστή
+        """
+        report = []
+        for angle_step in angle_steps:
+            resampled = self.resample(angle_step)
+            row = {"angle_step (degrees)": resampled.angle_step, "no_angles": resampled.angles.size}
+            row.update({f"max error {coef}": error for coef, error in resampled.max_interpolation_error().items()})
+            report.append(row)
+        return report
+
+    @staticmethod
+    def get_source_signature(csv_data_file_DTU):
+        """ χρόνος τελευταίας τροποποίησης και μέγεθος του αρχείου, για τον εντοπισμό αλλαγών σε αυτό """
+        stat = os.stat(csv_data_file_DTU)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self):
+        """ 
+        μέθοδος που ξαναδιαβάζει το αρχείο csv αν αυτό έχει αλλάξει από την τελευταία ανάγνωση
+
+        Returns:
+            (bool): True αν τα δεδομένα ξαναδιαβάστηκαν
+        """
+        if self.csv_data_file is None or self.get_source_signature(self.csv_data_file) == self.source_signature:
+            return False
+        with self._reload_lock:
+            if self.get_source_signature(self.csv_data_file) == self.source_signature: # (το ξαναδιάβασε άλλο νήμα)
+                return False
+            self.load_data(self.csv_data_file)
+        return True
+
+    def blend(self, tc_ratios, tables=None):
+        """ 
+        μέθοδος που υπολογίζει για κάθε λόγο t/c του tc_ratios έναν πίνακα Cl, Cd, Cm ως προς τη γωνία προσβολής,
+        με γραμμική παρεμβολή ανάμεσα στις δύο πλησιέστερες οικογένειες t/c (όπως η get_interpolated_values).
+        Αν υπάρχουν πίνακες για πολλούς αριθμούς Reynolds, αναμειγνύονται όλοι (βλ. SectionPolars.re_coefs).
+        Με tables (PolarTables) χρησιμοποιούνται αυτοί οι πίνακες αντί για τους τρέχοντες (self.tables).
+
+        Returns:
+            (SectionPolars): οι πίνακες (len(tc_ratios), n_angles, 3) για τις γωνίες προσβολής self.angles
+        """
+        if tables is None:
+            tables = self.tables
+        tc_ratios = np.atleast_1d(np.asarray(tc_ratios, dtype=float))
+        i_tc = self.get_bracket_index(tables.tc_values, tc_ratios)
+        tc1, tc2 = tables.tc_values[i_tc], tables.tc_values[i_tc + 1]
+        coefs = self.linear_interpolation(tc_ratios[:, None, None], tc1[:, None, None], tc2[:, None, None],
+                                          tables.coefs[i_tc], tables.coefs[i_tc + 1])
+        if tables.re_values is None:
+            return SectionPolars(tables.angles, coefs, tables.angle_step)
+        re_coefs = self.linear_interpolation(tc_ratios[:, None, None, None], tc1[:, None, None, None], tc2[:, None, None, None],
+                                             tables.re_coefs[:, i_tc].swapaxes(0, 1), tables.re_coefs[:, i_tc + 1].swapaxes(0, 1))
+        return SectionPolars(tables.angles, coefs, tables.angle_step, tables.re_values, re_coefs)
 
     def linear_interpolation(self, x, x1, x2, y1, y2):
         return y1 + (y2 - y1) * ((x - x1) / (x2 - x1)) 
     """
     από τη σχέση της γραμμικής παρεμβολής y = y1 + [(x-x1)/(x2-x1)]*(y2-y1)]
     """
-    
+
+    def get_bracket_index(self, values, desired_values):
+        """ 
+        μέθοδος που βρίσκει με δυαδική αναζήτηση (searchsorted) τους δείκτες i ώστε values[i] <= desired_value <= values[i+1].
+        Δέχεται αριθμό ή πίνακα τιμών.
+        """
+        desired_values = np.asarray(desired_values, dtype=float)
+        outside = (desired_values < values[0]) | (desired_values > values[-1]) | np.isnan(desired_values)
+        if np.any(outside):
+            raise ValueError(f'Η τιμή {desired_values[outside] if desired_values.ndim else desired_values} είναι εκτός του εύρους δεδομένων που περιλαμβάνει το αρχείο csv.')
+        return np.clip(np.searchsorted(values, desired_values, side='left') - 1, 0, len(values) - 2)
+
+    def get_angle_index(self, angle_of_attack, tables=None):
+        """ 
+        οι δείκτες των πλησιέστερων γωνιών προσβολής (στους πίνακες tables ή self.tables): με αριθμητική πράξη
+        στο ομοιόμορφο πλέγμα, αλλιώς με δυαδική αναζήτηση
+        """
+        if tables is None:
+            tables = self.tables
+        if tables.angle_step is None:
+            return self.get_bracket_index(tables.angles, angle_of_attack)
+        self.get_bracket_index(tables.angles[[0, -1]], angle_of_attack) # έλεγχος εύρους
+        return get_uniform_bracket_index(tables.angles[0], tables.angle_step, tables.angles.size, angle_of_attack)
+
     def get_nearest_value(self, values, desired_value): 
         """ μέθοδος που βρίσκει τα δύο κοντινότερα διαθέσιμα σημεία στο dataset που περιβάλλουν την επιθυμητή τιμή (desired_value) """
-        for i in range(len(values) - 1):
-            if values[i] <= desired_value <= values[i + 1]:
-                return values[i], values[i + 1]
-        raise ValueError(f'Η τιμή {desired_value} είναι εκτός του εύρους δεδομένων που περιλαμβάνει το αρχείο csv.')
-    
-    def get_interpolated_value(self, angle_of_attack, tc_ratio, coef):
+        values = np.asarray(values, dtype=float)
+        i = self.get_bracket_index(values, desired_value)
+        return values[i], values[i + 1]
+
+    def get_interpolated_values(self, angle_of_attack, tc_ratio, coefs=coef_names, reynolds=None):
         """ 
-        Βρίσκουμε τα δύο πλησιέστερα t/c γύρω από το tc_ratio και στη συνέχεια
-        βρίσκουμε τις δύο πλησιέστερες γωνίες προσβολής γύρω από το angle_of_attack
+        Βρίσκουμε τα δύο πλησιέστερα t/c γύρω από το tc_ratio και τις δύο πλησιέστερες γωνίες προσβολής γύρω από το angle_of_attack
+        και υπολογίζουμε με μία κλήση όλους τους ζητούμενους συντελεστές. Τα angle_of_attack και tc_ratio μπορεί να είναι αριθμοί ή πίνακες.
+        Αν δοθεί ο αριθμός Reynolds (και το αρχείο έχει πίνακες για πολλά Re), γίνεται επιπλέον γραμμική παρεμβολή ως προς log(Re)
+        ανάμεσα στους δύο πλησιέστερους πίνακες (βλ. get_reynolds_bracket).
+
+        Returns:
+            (tuple): μία τιμή (ή ένας πίνακας) για κάθε συντελεστή του coefs
         """
-        tc1, tc2 = self.get_nearest_value(self.tc_values, tc_ratio) 
-        angle1, angle2 = self.get_nearest_value(list(self.data[tc1].keys()), angle_of_attack) 
-        
+        tables = self.tables # (μία ανάγνωση, ώστε όλοι οι πίνακες να είναι της ίδιας ανάγνωσης του αρχείου)
+        if reynolds is not None and tables.re_values is None:
+            reynolds = None # πίνακες μόνο για έναν αριθμό Reynolds
+        if np.ndim(angle_of_attack) == 0 and np.ndim(tc_ratio) == 0 and np.ndim(reynolds) == 0:
+            if reynolds is None:
+                return self._get_interpolated_scalar_values(tables, float(angle_of_attack), float(tc_ratio), coefs)
+            return self._get_interpolated_scalar_re_values(tables, float(angle_of_attack), float(tc_ratio), float(reynolds), coefs)
+        angle_of_attack, tc_ratio = np.broadcast_arrays(np.asarray(angle_of_attack, dtype=float), np.asarray(tc_ratio, dtype=float))
+        k = [self.coef_names.index(coef) for coef in coefs]
+        if reynolds is None:
+            values = self._interpolate_table(tables, tables.coefs, (), angle_of_attack, tc_ratio, k)
+        else:
+            angle_of_attack, tc_ratio, reynolds = np.broadcast_arrays(angle_of_attack, tc_ratio, np.asarray(reynolds, dtype=float))
+            i_re1, i_re2, w = get_reynolds_bracket(tables.re_values, reynolds)
+            values1 = self._interpolate_table(tables, tables.re_coefs, (i_re1,), angle_of_attack, tc_ratio, k)
+            values2 = self._interpolate_table(tables, tables.re_coefs, (i_re2,), angle_of_attack, tc_ratio, k)
+            # Παρεμβολή ως προς log(Re)
+            values = values1 + (values2 - values1) * w[..., None]
+        return tuple(values[..., j][()] for j in range(len(k)))
+
+    def _interpolate_table(self, tables, table, index, angle_of_attack, tc_ratio, k):
+        """ 
+        η διγραμμική παρεμβολή (γωνία προσβολής, t/c) των συντελεστών k στους πίνακες table[index] (index: οι δείκτες
+        των προηγούμενων διαστάσεων, π.χ. του Re) με τα t/c και τις γωνίες των tables (PolarTables).
+        Επιστρέφει πίνακα με τελευταία διάσταση τους συντελεστές.
+        """
+        i_tc = self.get_bracket_index(tables.tc_values, tc_ratio)
+        i_angle = self.get_angle_index(angle_of_attack, tables)
+        tc1, tc2 = tables.tc_values[i_tc], tables.tc_values[i_tc + 1]
+        angle1, angle2 = tables.angles[i_angle], tables.angles[i_angle + 1]
+
         # Παρεμβολή πρώτα ως προς τη γωνία προσβολής
-        coef1 = self.linear_interpolation(angle_of_attack, angle1, angle2, 
-                                 self.data[tc1][angle1][coef], self.data[tc1][angle2][coef])
-        coef2 = self.linear_interpolation(angle_of_attack, angle1, angle2, 
-                                 self.data[tc2][angle1][coef], self.data[tc2][angle2][coef])
-        
+        coef1 = self.linear_interpolation(angle_of_attack[..., None], angle1[..., None], angle2[..., None],
+                                          table[index + (i_tc, i_angle)][..., k], table[index + (i_tc, i_angle + 1)][..., k])
+        coef2 = self.linear_interpolation(angle_of_attack[..., None], angle1[..., None], angle2[..., None],
+                                          table[index + (i_tc + 1, i_angle)][..., k], table[index + (i_tc + 1, i_angle + 1)][..., k])
+
         # Παρεμβολή ως προς το λόγο t/c
-        return self.linear_interpolation(tc_ratio, tc1, tc2, coef1, coef2)
+        return self.linear_interpolation(tc_ratio[..., None], tc1[..., None], tc2[..., None], coef1, coef2)
+
+    def _get_scalar_bracket_index(self, values, desired_value):
+        """ η get_bracket_index για μεμονωμένη τιμή, με δυαδική αναζήτηση (bisect) σε λίστα Python """
+        if not values[0] <= desired_value <= values[-1]:
+            raise ValueError(f'Η τιμή {desired_value} είναι εκτός του εύρους δεδομένων που περιλαμβάνει το αρχείο csv.')
+        return min(max(bisect_left(values, desired_value) - 1, 0), len(values) - 2)
+
+    def _get_interpolated_scalar_values(self, tables, angle_of_attack, tc_ratio, coefs, coef_list=None):
+        """ 
+        η get_interpolated_values για μεμονωμένες τιμές angle_of_attack και tc_ratio στους πίνακες tables
+        (στον πίνακα coef_list, αν δοθεί)
+        """
+        tc_list, angle_list = tables.tc_list, tables.angle_list
+        i_tc = self._get_scalar_bracket_index(tc_list, tc_ratio)
+        if tables.angle_step is None:
+            i_angle = self._get_scalar_bracket_index(angle_list, angle_of_attack)
+        else:
+            self._get_scalar_bracket_index(angle_list[::len(angle_list) - 1], angle_of_attack) # έλεγχος εύρους
+            i_angle = min(max(math.floor((angle_of_attack - angle_list[0]) / tables.angle_step), 0), len(angle_list) - 2)
+        tc1, tc2 = tc_list[i_tc], tc_list[i_tc + 1]
+        angle1, angle2 = angle_list[i_angle], angle_list[i_angle + 1]
+        if coef_list is None:
+            coef_list = tables.coef_list
+        family1, family2 = coef_list[i_tc], coef_list[i_tc + 1]
+        values = []
+        for coef in coefs:
+            k = self.coef_names.index(coef)
+            coef1 = self.linear_interpolation(angle_of_attack, angle1, angle2, family1[i_angle][k], family1[i_angle + 1][k])
+            coef2 = self.linear_interpolation(angle_of_attack, angle1, angle2, family2[i_angle][k], family2[i_angle + 1][k])
+            values.append(self.linear_interpolation(tc_ratio, tc1, tc2, coef1, coef2))
+        return tuple(values)
+
+    def _get_interpolated_scalar_re_values(self, tables, angle_of_attack, tc_ratio, reynolds, coefs):
+        """ η get_interpolated_values για μεμονωμένες τιμές angle_of_attack, tc_ratio και reynolds στους πίνακες tables """
+        log_re = tables.log_re_list
+        log_reynolds = math.log(min(max(reynolds, tables.re_values[0]), tables.re_values[-1]))
+        i_re = min(max(bisect_left(log_re, log_reynolds) - 1, 0), len(log_re) - 2) if len(log_re) > 1 else 0
+        values1 = self._get_interpolated_scalar_values(tables, angle_of_attack, tc_ratio, coefs, tables.re_coef_lists[i_re])
+        if len(log_re) == 1:
+            return values1
+        values2 = self._get_interpolated_scalar_values(tables, angle_of_attack, tc_ratio, coefs, tables.re_coef_lists[i_re + 1])
+        return tuple(self.linear_interpolation(log_reynolds, log_re[i_re], log_re[i_re + 1], value1, value2)
+                     for value1, value2 in zip(values1, values2))
+
+    def get_interpolated_value(self, angle_of_attack, tc_ratio, coef, reynolds=None):
+        """ μέθοδος που επιστρέφει την τιμή (ή τον πίνακα τιμών) ενός συντελεστή """
+        return self.get_interpolated_values(angle_of_attack, tc_ratio, (coef,), reynolds)[0]
+
+    def coefficients(self, angle_of_attack, tc_ratio, reynolds=None):
+        """ 
+        μέθοδος που επιστρέφει μαζί τους συντελεστές Cl, Cd και Cm, βρίσκοντας μία μόνο φορά
+        τα πλησιέστερα t/c και τις πλησιέστερες γωνίες προσβολής (και, αν δοθεί ο reynolds, τους πλησιέστερους αριθμούς Reynolds)
+
+        Returns:
+            (PolarCoefficients): οι συντελεστές Cl, Cd, Cm (αριθμοί ή πίνακες)
+        """
+        return PolarCoefficients(*self.get_interpolated_values(angle_of_attack, tc_ratio, self.coef_names, reynolds))
 
-    def cl(self, angle_of_attack, tc_ratio): 
+    def cl(self, angle_of_attack, tc_ratio, reynolds=None): 
         """ μέθοδος που θα μας επιστρέψει την τιμή του συντελεστή άνωσης Cl """
-        return self.get_interpolated_value(angle_of_attack, tc_ratio, 'Cl')
+        return self.get_interpolated_value(angle_of_attack, tc_ratio, 'Cl', reynolds)
 
-    def cd(self, angle_of_attack, tc_ratio): 
+    def cd(self, angle_of_attack, tc_ratio, reynolds=None): 
         """ μέθοδος που θα μας επιστρέψει την τιμή του συντελεστή αντίστασης (ή οπισθέλκουσας) Cd """
-        return self.get_interpolated_value(angle_of_attack, tc_ratio, 'Cd') 
+        return self.get_interpolated_value(angle_of_attack, tc_ratio, 'Cd', reynolds) 
     
-    def cm(self, angle_of_attack, tc_ratio): 
+    def cm(self, angle_of_attack, tc_ratio, reynolds=None): 
         """ μέθοδος που θα μας επιστρέψει την τιμή του συντελεστή ροπής Cm """
-        return self.get_interpolated_value(angle_of_attack, tc_ratio, 'Cm')
+        return self.get_interpolated_value(angle_of_attack, tc_ratio, 'Cm', reynolds)
+
+class SectionPolars:
+    """
+    Κλάση με έναν μονοδιάστατο πίνακα Cl, Cd, Cm ως προς τη γωνία προσβολής για κάθε τμήμα του πτερυγίου,
+    ήδη αναμεμειγμένο για το λόγο t/c του τμήματος (βλ. DTU_calc.blend). Έτσι σε κάθε επανάληψη του αλγορίθμου
+    γίνεται μόνο μία αναζήτηση ως προς τη γωνία προσβολής (και, αν υπάρχουν πίνακες για πολλά Re, μία ως προς το Re).
+    """
+    def __init__(self, angles, coefs, angle_step=None, re_values=None, re_coefs=None):
+        """
+        Args:
+            angles (np.ndarray): οι ταξινομημένες γωνίες προσβολής σε μοίρες (n_angles)
+            coefs (np.ndarray): οι συντελεστές Cl, Cd, Cm κάθε τμήματος (n_sections, n_angles, 3)
+            angle_step (float, optional): το βήμα, αν οι γωνίες είναι ομοιόμορφα κατανεμημένες. Defaults to None.
+            re_values (np.ndarray, optional): οι ταξινομημένοι αριθμοί Reynolds των πινάκων re_coefs (n_re). Defaults to None.
+            re_coefs (np.ndarray, optional): οι συντελεστές κάθε τμήματος για κάθε Re (n_sections, n_re, n_angles, 3). Defaults to None.
+        """
+        self.angles = angles
+        self.coefs = coefs
+        self.angle_step = angle_step
+        self.re_values = re_values
+        self.re_coefs = re_coefs
+
+    @property
+    def no_sections(self):
+        return self.coefs.shape[0]
+
+    def coefficients(self, angle_of_attack, section_index, reynolds=None):
+        """ 
+        μέθοδος που επιστρέφει τους συντελεστές Cl, Cd, Cm για τις γωνίες προσβολής angle_of_attack (σε μοίρες)
+        των τμημάτων section_index (αριθμοί ή πίνακες ίδιου σχήματος). Αν δοθεί ο αριθμός Reynolds reynolds και υπάρχουν
+        πίνακες για πολλά Re, οι συντελεστές παρεμβάλλονται γραμμικά ως προς log(Re) (βλ. get_reynolds_bracket).
+
+        Returns:
+            (PolarCoefficients): οι συντελεστές Cl, Cd, Cm
+        """
+        angle_of_attack, section_index = np.broadcast_arrays(np.asarray(angle_of_attack, dtype=float), np.asarray(section_index))
+        outside = (angle_of_attack < self.angles[0]) | (angle_of_attack > self.angles[-1]) | np.isnan(angle_of_attack)
+        if np.any(outside):
+            raise ValueError(f'Η τιμή {angle_of_attack[outside]} είναι εκτός του εύρους δεδομένων που περιλαμβάνει το αρχείο csv.')
+        if self.angle_step is None:
+            i = np.clip(np.searchsorted(self.angles, angle_of_attack, side='left') - 1, 0, self.angles.size - 2)
+        else:
+            i = get_uniform_bracket_index(self.angles[0], self.angle_step, self.angles.size, angle_of_attack)
+        angle1, angle2 = self.angles[i][..., None], self.angles[i + 1][..., None]
+        weight = (angle_of_attack[..., None] - angle1) / (angle2 - angle1)
+        if reynolds is None or self.re_values is None:
+            y1, y2 = self.coefs[section_index, i], self.coefs[section_index, i + 1]
+            values = y1 + (y2 - y1) * weight
+        else:
+            i_re1, i_re2, w = get_reynolds_bracket(self.re_values, np.broadcast_to(reynolds, angle_of_attack.shape))
+            y1, y2 = self.re_coefs[section_index, i_re1, i], self.re_coefs[section_index, i_re1, i + 1]
+            values1 = y1 + (y2 - y1) * weight
+            y1, y2 = self.re_coefs[section_index, i_re2, i], self.re_coefs[section_index, i_re2, i + 1]
+            values2 = y1 + (y2 - y1) * weight
+            values = values1 + (values2 - values1) * w[..., None]
+        return PolarCoefficients(values[..., 0][()], values[..., 1][()], values[..., 2][()])
 
 # # Παράδειγμα χρήσης
 # naca4415 = DTU_calc('csv_data_file_DTU.csv')
@@ -1,29 +1,117 @@
 #%%
 """
 Κλάση για τον υπολογισμό των αεροδυναμικών συντελεστών άνωσης και οπισθέλκουσας
-για την αεροτομή Naca4415 με βάση τη γωνία προσβολής, σε αριθμό Reynolds = 200.000
+για την αεροτομή Naca4415 με βάση τη γωνία προσβολής, σε αριθμό Reynolds = 200.000.
+Οι κοινές ενότητες (π.χ. polar_io) βρίσκονται στον γονικό φάκελο, που πρέπει να είναι στο sys.path (π.χ. μέσω PYTHONPATH,
+βλ. την algorithmos_Naca και το conftest.py των tests).
 """
 
-import csv
+import copy
+import math
+from bisect import bisect_right
+from collections import namedtuple
 import numpy as np
+from polar_io import get_polar_cache_path, load_polar_cache, read_polars, save_polar_cache
+
+PolarCoefficients = namedtuple('PolarCoefficients', ['Cl', 'Cd', 'Cm'])
+""" οι αεροδυναμικοί συντελεστές Cl, Cd, Cm που επιστρέφει η μέθοδος coefficients (αριθμοί ή πίνακες) """
 
 class Naca_calc:
-    def __init__(self, csv_data_file_Naca):
+    def __init__(self, csv_data_file_Naca, angle_step=None, use_cache=True, cache_dir=None):
+        """ 
+        Με use_cache=True οι πίνακες αποθηκεύονται και σε δυαδικό αρχείο .npz (βλ. get_polar_cache_path),
+        από το οποίο διαβάζονται στις επόμενες φορές, μέχρι να αλλάξει το περιεχόμενο του αρχείου CSV.
+        """
         self.data = {}
+        self.angle_step = angle_step # το βήμα του ομοιόμορφου πλέγματος γωνιών (None για τις γωνίες του αρχείου), βλ. resample
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.cache_path = None # το αρχείο cache από το οποίο διαβάστηκαν (ή στο οποίο αποθηκεύτηκαν) οι πίνακες
         self.load_data(csv_data_file_Naca)
 
     def load_data(self, csv_data_file_Naca):
-        with open(csv_data_file_Naca, mode = 'r') as file:
-            reader = csv.reader(file)
-            next(reader) # Αγνοούμε την πρώτη γραμμή του αρχείου που είναι οι επικεφαλίδες από κάθε στήλη
-            for row in reader:
-                angle_of_attack = round(float(row[0]), 3)
-                cl_value = float(row[1])
-                cd_value = float(row[2])
-                self.data[angle_of_attack] = {'Cl': cl_value, 'Cd': cd_value}
-                
+        arrays = None
+        if self.use_cache:
+            self.cache_path = get_polar_cache_path(csv_data_file_Naca, self.cache_dir)
+            arrays = load_polar_cache(self.cache_path)
+        if arrays is None:
+            polars = read_polars(csv_data_file_Naca) # CSV (',' ή ';') ή XLSX, βλ. polar_io
+            if polars.re_values is not None:
+                raise ValueError("Ο πίνακας της Naca4415 αφορά έναν αριθμό Reynolds, για πίνακες με στήλη Reynolds βλ. DTU_calc")
+            arrays = {"angles": polars.angles, "coefs": polars.coefs[0]}
+            if self.use_cache:
+                save_polar_cache(self.cache_path, **arrays)
+        self.data = {angle: dict(zip(PolarCoefficients._fields, values))
+                     for angle, values in zip(arrays["angles"].tolist(), arrays["coefs"].tolist())}
+        self.set_arrays()
+
+    def set_arrays(self):
+        """ δημιουργία των πινάκων NumPy από το λεξικό self.data """
         self.sorted_angles = sorted(self.data.keys()) 
         """ ταξινόμηση των γωνιών προσβολής """
+        # πίνακες NumPy: οι γωνίες προσβολής και οι συντελεστές (Cl, Cd, Cm) εναλλάξ σε κάθε γραμμή
+        self.angles = np.array(self.sorted_angles, dtype=float)
+        self.coefs = np.array([[self.data[angle][coef] for coef in PolarCoefficients._fields]
+                               for angle in self.sorted_angles], dtype=float)
+        self.original_angles = self.angles # οι γωνίες και οι συντελεστές όπως διαβάστηκαν από το αρχείο
+        self.original_coefs = self.coefs
+        if self.angle_step is not None:
+            self._set_uniform_angles(self.angle_step)
+        self._coef_list = self.coefs.tolist()
+
+    def _set_uniform_angles(self, angle_step):
+        """ 
+        επαναδειγματοληψία των αρχικών πινάκων σε ομοιόμορφο πλέγμα γωνιών από την ελάχιστη ως τη μέγιστη γωνία του αρχείου.
+        Το βήμα προσαρμόζεται ελάχιστα ώστε το πλέγμα να τελειώνει ακριβώς στη μέγιστη γωνία.
+        """
+        angle0, angle_last = self.original_angles[0], self.original_angles[-1]
+        no_angles = max(int(round((angle_last - angle0) / angle_step)), 1) + 1
+        self.angles = np.linspace(angle0, angle_last, no_angles)
+        self.angle_step = float((angle_last - angle0) / (no_angles - 1))
+        self.coefs = np.stack([np.interp(self.angles, self.original_angles, self.original_coefs[:, k])
+                               for k in range(len(PolarCoefficients._fields))], axis=-1)
+        self.sorted_angles = [round(angle, 3) for angle in self.angles.tolist()]
+        self.data = {angle: dict(zip(PolarCoefficients._fields, values))
+                     for angle, values in zip(self.sorted_angles, self.coefs.tolist())}
+
+    def resample(self, angle_step):
+        """ 
+        μέθοδος που επιστρέφει αντίγραφο του πίνακα με ομοιόμορφο πλέγμα γωνιών προσβολής βήματος angle_step (σε μοίρες).
+        Στο ομοιόμορφο πλέγμα η αναζήτηση της γωνίας στη coefficients γίνεται μόνο με αριθμητική πράξη, floor((α - α0) / Δα).
+        Το σφάλμα παρεμβολής σε σχέση με τον αρχικό πίνακα δίνει η max_interpolation_error.
+
+        Returns:
+            (Naca_calc): ο επαναδειγματοληπτημένος πίνακας
+        """
+        resampled = copy.copy(self)
+        resampled._set_uniform_angles(angle_step)
+        resampled._coef_list = resampled.coefs.tolist()
+        return resampled
+
+    def max_interpolation_error(self):
+        """ 
+        το μέγιστο απόλυτο σφάλμα των συντελεστών του (επαναδειγματοληπτημένου) πίνακα σε σχέση με τον αρχικό πίνακα του αρχείου
+
+        Returns:
+            (dict): το μέγιστο σφάλμα για κάθε συντελεστή
+        """
+        return {coef: float(np.max(np.abs(np.interp(self.original_angles, self.angles, self.coefs[:, k]) - self.original_coefs[:, k])))
+                for k, coef in enumerate(PolarCoefficients._fields)}
+
+    def resampling_report(self, angle_steps=(0.05, 0.1, 0.25, 0.5, 1.0)):
+        """ 
+        αναφορά του μέγιστου σφάλματος παρεμβολής για διάφορα βήματα ομοιόμορφου πλέγματος
+
+        Returns:
+            (list): ένα λεξικό για κάθε βήμα με το βήμα, το πλήθος των γωνιών και το μέγιστο σφάλμα κάθε συντελεστή
+        """
+        report = []
+        for angle_step in angle_steps:
+            resampled = self.resample(angle_step)
+            row = {"angle_step (degrees)": resampled.angle_step, "no_angles": resampled.angles.size}
+            row.update({f"max error {coef}": error for coef, error in resampled.max_interpolation_error().items()})
+            report.append(row)
+        return report
 
     def interpolate(self, angle_of_attack, val1, val2, angle1, angle2):
         return val1 + (val2 - val1) * (angle_of_attack - angle1) / (angle2 - angle1) 
@@ -65,6 +153,40 @@ class Naca_calc:
             cd2 = self.data[angle2]['Cd']
             return self.interpolate(angle_of_attack, cd1, cd2, angle1, angle2)
 
+    def coefficients(self, angle_of_attack, tc_ratio=None):
+        """ 
+        μέθοδος που επιστρέφει μαζί τους συντελεστές Cl, Cd και Cm, βρίσκοντας μία μόνο φορά τις δύο πλησιέστερες
+        γωνίες προσβολής. Η γωνία προσβολής μπορεί να είναι αριθμός ή πίνακας. Το tc_ratio αγνοείται
+        (υπάρχει για να έχει η μέθοδος την ίδια μορφή με την DTU_calc.coefficients).
+
+        Returns:
+            (PolarCoefficients): οι συντελεστές Cl, Cd, Cm
+        """
+        if np.ndim(angle_of_attack) == 0:
+            angle_of_attack = round(float(angle_of_attack), 3) # Στρογγυλοποίηση στα 3 δεκαδικά ψηφία
+            if not self.sorted_angles[0] <= angle_of_attack <= self.sorted_angles[-1]:
+                raise ValueError(f'Η γωνία προσβολής {angle_of_attack} είναι εκτός του εύρους δεδομένων που περιλαμβάνει το αρχείο csv.')
+            if self.angle_step is None:
+                i = min(bisect_right(self.sorted_angles, angle_of_attack) - 1, len(self.sorted_angles) - 2)
+            else:
+                i = min(max(math.floor((angle_of_attack - self.sorted_angles[0]) / self.angle_step), 0), len(self.sorted_angles) - 2)
+            angle1, angle2 = self.sorted_angles[i], self.sorted_angles[i + 1]
+            row1, row2 = self._coef_list[i], self._coef_list[i + 1]
+            return PolarCoefficients(*(self.interpolate(angle_of_attack, val1, val2, angle1, angle2)
+                                       for val1, val2 in zip(row1, row2)))
+
+        angle_of_attack = np.round(np.asarray(angle_of_attack, dtype=float), 3)
+        outside = (angle_of_attack < self.angles[0]) | (angle_of_attack > self.angles[-1]) | np.isnan(angle_of_attack)
+        if np.any(outside):
+            raise ValueError(f'Η γωνία προσβολής {angle_of_attack[outside]} είναι εκτός του εύρους δεδομένων που περιλαμβάνει το αρχείο csv.')
+        if self.angle_step is None:
+            i = np.minimum(np.searchsorted(self.angles, angle_of_attack, side='right') - 1, self.angles.size - 2)
+        else:
+            i = np.clip(np.floor((angle_of_attack - self.angles[0]) / self.angle_step).astype(int), 0, self.angles.size - 2)
+        values = self.interpolate(angle_of_attack[..., None], self.coefs[i], self.coefs[i + 1],
+                                  self.angles[i][..., None], self.angles[i + 1][..., None])
+        return PolarCoefficients(values[..., 0], values[..., 1], values[..., 2])
+
 # naca4415 = Naca_calc('csv_data_file_Naca.csv')
 
 # cl_value = naca4415.cl(8.55)
@@ -1,11 +1,13 @@
 
 #%% 
 import json
-import pandas as pd
+import os
+import sys
+if __name__ == "__main__": # εκτέλεση ως script: οι κοινές ενότητες (π.χ. trace_writer, polar_io) βρίσκονται στον γονικό φάκελο
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import numpy as np
 from Naca_table import Naca_calc
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
+from trace_writer import get_default_trace_writer
 
 #%%
 def blade_geometry_seperation(r_is, chords, pitch,
@@ -19,13 +21,9 @@ def blade_geometry_seperation(r_is, chords, pitch,
     # ορίζουμε τα νέα ακτινικά σημεία
     r_new = np.linspace(r_first, r_last, num_sections)
 
-    # φτιάχνουμε τις συναρτήσεις παρεμβολής από τα αρχικά δεδομένα
-    chord_interp = interp1d(r_is, chords, kind='linear')
-    pitch_interp = interp1d(r_is, pitch, kind='linear')
-    
-    # υπολογίζουμε τις νέες τιμές
-    chords_new = chord_interp(r_new)
-    pitch_new = pitch_interp(r_new)
+    # υπολογίζουμε τις νέες τιμές με γραμμική παρεμβολή από τα αρχικά δεδομένα
+    chords_new = np.interp(r_new, r_is, chords)
+    pitch_new = np.interp(r_new, r_is, pitch)
 
     return r_new, chords_new, pitch_new
 
@@ -37,8 +35,17 @@ class Hansen_Algorithm:
     """
     tolerance = 1e-4 # Σταθερά για τον έλεγχο σύγκλισης των τιμών των συντελεστών αξονικής και εφαπτομενικής επαγωγής a και a'
     max_iter = 100 # Μέγιστος αριθμός επαναλήψεων κατά τη διαδικασία σύγκλισης
+    trace_levels = ('off', 'summary', 'full') # Επίπεδα καταγραφής της επαναληπτικής διαδικασίας της segment_calculation
+    # Μία γραμμή ανά επανάληψη για trace='full' (τα a, a_p είναι οι τιμές με τις οποίες ξεκίνησε η επανάληψη)
+    trace_dtype = np.dtype([
+        ("counter", np.int64), ("a", float), ("a_p", float),
+        ("flow_angle (rads)", float), ("angle_of_attack (rads)", float),
+        ("Cl", float), ("Cd", float), ("Cn", float), ("Ct", float),
+        ("a_new", float), ("a_p_new", float),
+    ])
     
-    def __init__(self, blade_geom_Naca, B=3, air_density=1.225, airfoil_type=None, csv_data_file='csv_data_file_Naca.csv'):
+    def __init__(self, blade_geom_Naca, B=3, air_density=1.225, airfoil_type=None, csv_data_file='csv_data_file_Naca.csv',
+                 polar_angle_step=None):
         """ 
         μέθοδος αρχικοποίησης των βασικών μεταβλητών 
 
@@ -48,6 +55,8 @@ class Hansen_Algorithm:
             air_density (float, optional): η πυκνότητα του αέρα σε kg/m^3. Defaults to 1.225.
             airfoil_type (string, optional): ο τύπος της αεροτομής που χρησιμοποιείται. Defaults to None.
             csv_data_file (csv file, optional): το αρχείο csv που περιέχει τα δεδομένα για τους αεροδυναμικούς συντελεστές Cl και Cd. Defaults to None.
+            polar_angle_step (float, optional): αν δοθεί, οι πίνακες της αεροτομής επαναδειγματοληπτούνται σε ομοιόμορφο
+                πλέγμα γωνιών προσβολής με αυτό το βήμα σε μοίρες (βλ. Naca_calc.resample). Defaults to None.
         """
         with open(blade_geom_Naca, 'r') as f:
             blade_geom_Naca = json.load(f)
@@ -79,7 +88,7 @@ class Hansen_Algorithm:
         # self.rotation_speed = rotation_speed # ταχύτητα περιστροφής του ρότορα (σε rad/sec)
         self.B = B 
         self.air_density = air_density 
-        self.airfoil_calc = Naca_calc(csv_data_file) # Χρήση DTU δεδομένων
+        self.airfoil_calc = Naca_calc(csv_data_file, angle_step=polar_angle_step) # Χρήση DTU δεδομένων
 
     def calculation_of_flow_angle_rad(self, a, a_p, r:float, v0:int, w_rps:float):
         """
@@ -134,8 +143,7 @@ class Hansen_Algorithm:
         Returns:
              (float): αεροδυναμικούς συντελεστές άνωσης και οπισθέλκουσας Cl και Cd
         """
-        Cl = self.airfoil_calc.cl(angle_of_attack_deg) # Υπολογισμός Cl με βάση τη γωνία προσβολής και t/c
-        Cd = self.airfoil_calc.cd(angle_of_attack_deg) # Υπολογισμός Cd με βάση τη γωνία προσβολής και t/c
+        Cl, Cd, _ = self.airfoil_calc.coefficients(angle_of_attack_deg) # Υπολογισμός Cl και Cd με μία αναζήτηση στον πίνακα
         return Cl, Cd
     
     def calculation_of_Cn_and_Ct(self, Cl:float, Cd:float, flow_angle_rad:float):
@@ -206,63 +214,48 @@ class Hansen_Algorithm:
         return L, D, pn, pt
      
     def segment_calculation(self, wind_speed_V0, omega_rad_sec, r, chord, pitch_angle_deg, twist_deg, 
-                            f=0.3, debug_mode=False):
-        """ εκτέλεση του αλγορίθμου για κάθε τμήμα του πτερυγίου """
-        v0 = wind_speed_V0
-        w_rps = omega_rad_sec
-        
-        _debug_lst = []
+                            f=0.3, debug_mode=False, trace='off', trace_writer=None):
+        """ 
+        εκτέλεση του αλγορίθμου για κάθε τμήμα του πτερυγίου.
+        Με trace='summary' το αποτέλεσμα περιέχει επιπλέον τα "converged", "residual a" και "residual a_p" της τελευταίας
+        επανάληψης, ενώ με trace='full' και το "trace": πίνακα NumPy (trace_dtype) με μία γραμμή ανά επανάληψη.
+        Αν δοθεί trace_writer (TraceWriter), ο πίνακας αυτός γράφεται στο αρχείο του από νήμα στο παρασκήνιο, μαζί με τα
+        δεδομένα εισόδου του τμήματος. Με debug_mode=True χρησιμοποιείται ο κοινός TraceWriter
+        (βλ. trace_writer.get_default_trace_writer).
+        """
+        if trace not in self.trace_levels:
+            raise ValueError(f"Άγνωστο επίπεδο καταγραφής {trace!r} (επιτρεπτά: {self.trace_levels})")
+        if debug_mode and trace_writer is None:
+            trace_writer = get_default_trace_writer()
+        if trace_writer is not None:
+            trace = 'full'
+        history = np.zeros(self.max_iter + 1, dtype=self.trace_dtype) if trace == 'full' else None
+
         a, a_p = 0, 0 # αρχικοποίηση των συντελεστών επαγωγής a και a' σε 0
-        exit_flag = False
+        converged = False
         counter = 0 # αρχικά ο μετρητής έχει την τιμή 0
-        
-        
-        while not exit_flag:
+
+        while not converged:
             flow_angle_rad = self.calculation_of_flow_angle_rad(a=a, a_p=a_p, r=r, v0=wind_speed_V0, w_rps=omega_rad_sec)
             angle_of_attack_rad = self.calculation_of_local_angle_of_attack_rad(flow_angle_rad=flow_angle_rad, pitch_angle_deg=pitch_angle_deg, twist_deg=twist_deg)
             Cl, Cd = self.calculation_of_Cl_and_Cd(angle_of_attack_deg=np.degrees(angle_of_attack_rad))
             Cn, Ct = self.calculation_of_Cn_and_Ct(Cl=Cl, Cd=Cd, flow_angle_rad=flow_angle_rad)
             a_new, a_p_new = self.calculation_of_updated_induction_factors(Cn=Cn, Ct=Ct, r=r, chord=chord, flow_angle_rad=flow_angle_rad)
-            
-            if abs(a - a_new) < self.tolerance and abs(a_p - a_p_new) < self.tolerance: # έχω σύγκλιση των τιμών
-                exit_flag = True
+            residual_a, residual_a_p = abs(a - a_new), abs(a_p - a_p_new)
+            if history is not None:
+                history[counter] = (counter + 1, a, a_p, flow_angle_rad, angle_of_attack_rad, Cl, Cd, Cn, Ct, a_new, a_p_new)
+
+            if residual_a < self.tolerance and residual_a_p < self.tolerance: # έχω σύγκλιση των τιμών
+                converged = True
             else: # συνεχίζω τον αλγόριθμο
                 a = a * (1 - f) + f * a_new
                 a_p = a_p * (1 - f) + f * a_p_new  
             counter += 1 # αύξηση της τιμής του μετρητή κατά 1 
-            if counter > self.max_iter:
+            if counter > self.max_iter: # δεν έχω σύγκλιση, επιστρέφονται οι τελευταίες τιμές (βλ. "converged")
                 break
-                raise Exception("Δεν έχω σύγκλιση")
-            L, D, pn, pt = self.calculation_of_local_loads(r=r, a=a, a_p=a_p, v0=v0, w_rps=omega_rad_sec, chord=chord, flow_angle_rad=flow_angle_rad, Cl=Cl, Cd=Cd)
-            temp_dict = {
-                "r_i (m)": r,
-                "chord (m)": chord,
-                "pitch_angle (degrees)": pitch_angle_deg,
-                "twist (degrees)": twist_deg,
-                "a": a,
-                "a_p": a_p,
-                "flow_angle (rads)": flow_angle_rad,
-                "flow angle (degrees)": np.degrees(flow_angle_rad),
-                "angle_of_attack (rads)": angle_of_attack_rad,
-                "angle of attack (degrees)": np.degrees(angle_of_attack_rad),
-                "Cl": Cl,
-                "Cd": Cd,
-                "Cn": Cn,
-                "Ct": Ct,
-                "a_new": a_new,
-                "a_p_new": a_p_new,
-                "Lift (N/m)": L,
-                "Drag (N/m)": D,
-                "pn (N/m)": pn,
-                "pt (N/m)": pt,
-                "counter":counter
-            }
-            _debug_lst.append(temp_dict)
-            
-        if debug_mode:
-            df = pd.DataFrame(_debug_lst)
-            df.to_excel("save_res.xlsx")
-              
+
+        # τα τοπικά φορτία υπολογίζονται μία φορά, μετά το τέλος των επαναλήψεων
+        L, D, pn, pt = self.calculation_of_local_loads(r=r, a=a, a_p=a_p, v0=wind_speed_V0, w_rps=omega_rad_sec, chord=chord, flow_angle_rad=flow_angle_rad, Cl=Cl, Cd=Cd)
         res_dict =  {
             "r_i (m)": r,
             "chord (m)": chord,
@@ -286,6 +279,16 @@ class Hansen_Algorithm:
             "pt (N/m)": pt,
             "counter": counter
         }
+        if trace != 'off':
+            res_dict["converged"] = converged
+            res_dict["residual a"] = residual_a
+            res_dict["residual a_p"] = residual_a_p
+        if trace == 'full':
+            res_dict["trace"] = history[:counter]
+            if trace_writer is not None:
+                trace_writer.submit(
+                    res_dict["trace"], wind_speed_V0=wind_speed_V0, omega_rad_sec=omega_rad_sec, r=r, chord=chord,
+                    pitch_angle_deg=pitch_angle_deg, twist_deg=twist_deg)
         return res_dict
 
     def Naca_blade_calculation(self, wind_speed_V0, rotation_speed):
@@ -348,6 +351,7 @@ class Hansen_Algorithm:
 #     # print(f"Συνολική Ισχύς της Ανεμογεννήτριας: {3*total_power:.2f} Watt")
 #%%
 if __name__ == "__main__":
+    import pandas as pd
     blade_geom_Naca = "blade_geom_Naca.json"
     hansen = Hansen_Algorithm(
         blade_geom_Naca=blade_geom_Naca,
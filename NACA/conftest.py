@@ -0,0 +1,5 @@
+import os
+import sys
+
+# οι κοινές ενότητες του αποθετηρίου (π.χ. polar_io) βρίσκονται στον γονικό φάκελο, και για τα tests που εκτελούνται από τον NACA
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
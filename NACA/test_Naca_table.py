@@ -0,0 +1,42 @@
+import os
+import numpy as np
+import pytest
+
+from Naca_table import Naca_calc
+
+@pytest.fixture
+def naca():
+    return Naca_calc(os.path.join(os.path.dirname(__file__), 'csv_data_file_Naca.csv'))
+
+def test_coefficients_match_cl_and_cd(naca):
+    for angle in (-11.75, -3.1, 0.0, 8.55, 19.25):
+        coefs = naca.coefficients(angle)
+        assert coefs.Cl == pytest.approx(naca.cl(angle), rel=1e-12)
+        assert coefs.Cd == pytest.approx(naca.cd(angle), rel=1e-12)
+
+def test_coefficients_array(naca):
+    angles = np.array([-3.1, 0.0, 8.55])
+    coefs = naca.coefficients(angles)
+    assert coefs.Cm.shape == (3,)
+    assert coefs.Cl[2] == pytest.approx(naca.cl(8.55), rel=1e-12)
+    with pytest.raises(ValueError):
+        naca.coefficients(np.array([0.0, 25.0]))
+
+def test_resample(naca):
+    resampled = naca.resample(0.25)
+    assert resampled.angle_step == pytest.approx(0.25)
+    assert resampled.max_interpolation_error()['Cl'] == pytest.approx(0, abs=1e-12)
+    assert resampled.coefficients(3.3).Cl == pytest.approx(naca.coefficients(3.3).Cl)
+    coarse = naca.resample(1.0)
+    assert coarse.max_interpolation_error()['Cl'] > 0
+    assert len(naca.resampling_report(angle_steps=(0.5, 1.0))) == 2
+
+def test_polar_cache(tmp_path):
+    parsed = Naca_calc(os.path.join(os.path.dirname(__file__), 'csv_data_file_Naca.csv'), use_cache=False)
+    first = Naca_calc(os.path.join(os.path.dirname(__file__), 'csv_data_file_Naca.csv'), cache_dir=str(tmp_path))
+    cached = Naca_calc(os.path.join(os.path.dirname(__file__), 'csv_data_file_Naca.csv'), cache_dir=str(tmp_path))
+    assert os.path.dirname(cached.cache_path) == str(tmp_path)
+    assert cached.cache_path == first.cache_path
+    assert np.array_equal(cached.coefs, parsed.coefs)
+    assert cached.sorted_angles == parsed.sorted_angles
+    assert cached.cl(8.55) == parsed.cl(8.55)
@@ -1,10 +1,14 @@
 #%% 
-import json
-import pandas as pd
+import hashlib
+import os
+import threading
 import numpy as np
 from Dtu_table import DTU_calc
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
+from blade_geometry import BladeGeometry
+import bem_kernels
+from bem_results import BEMResults
+from solver_config import SolverConfig
+from trace_writer import get_default_trace_writer
 
 #%%
 def blade_geometry_seperation(r_is, chords, pitch, tc_ratios,
@@ -18,15 +22,10 @@ def blade_geometry_seperation(r_is, chords, pitch, tc_ratios,
     # ορίζουμε τα νέα ακτινικά σημεία
     r_new = np.linspace(r_first, r_last, num_sections)
 
-    # φτιάχνουμε τις συναρτήσεις παρεμβολής από τα αρχικά δεδομένα
-    chord_interp = interp1d(r_is, chords, kind='linear')
-    pitch_interp = interp1d(r_is, pitch, kind='linear')
-    tc_interp = interp1d(r_is, tc_ratios, kind='linear')
-    
-    # υπολογίζουμε τις νέες τιμές
-    chords_new = chord_interp(r_new)
-    pitch_new = pitch_interp(r_new)
-    tc_new = tc_interp(r_new)
+    # υπολογίζουμε τις νέες τιμές με γραμμική παρεμβολή από τα αρχικά δεδομένα
+    chords_new = np.interp(r_new, r_is, chords)
+    pitch_new = np.interp(r_new, r_is, pitch)
+    tc_new = np.interp(r_new, r_is, tc_ratios)
 
     return r_new, chords_new, pitch_new, tc_new
 
@@ -35,55 +34,165 @@ class Hansen_Algorithm:
     """
     Κλάση που εμπεριέχει όλα τα βήματα του αλγορίθμου της αεροδυναμικής θεωρίας Blade Element Momentum (θεωρία στοιχείων πτερύγωσης - ορμής)
     για την ανάλυση της αεροδυναμικής συμπεριφοράς πτερυγίων ανεμογεννητριών.
+    Μετά τη δημιουργία η κατάσταση του ρότορα (γεωμετρία, αεροτομή, ρυθμίσεις) δεν αλλάζει και κάθε κλήση χρησιμοποιεί
+    μόνο δικούς της πίνακες εργασίας, επομένως ο ίδιος αλγόριθμος μπορεί να χρησιμοποιείται ταυτόχρονα από πολλά νήματα.
+    Οι ρυθμίσεις της επαναληπτικής διαδικασίας δίνονται με ένα SolverConfig ανά αλγόριθμο ή ανά κλήση.
     """
-    tolerance = 1e-4 # Σταθερά για τον έλεγχο σύγκλισης των τιμών των συντελεστών αξονικής και εφαπτομενικής επαγωγής a και a'
-    max_iter = 100 # Μέγιστος αριθμός επαναλήψεων κατά τη διαδικασία σύγκλισης
+    solver_version = 2 # αυξάνεται όταν αλλάζουν τα αποτελέσματα του αλγορίθμου, ώστε να μη χρησιμοποιούνται παλιά αποτελέσματα από τη RotorResultCache
+    trace_levels = ('off', 'summary', 'full') # Επίπεδα καταγραφής της επαναληπτικής διαδικασίας της segment_calculation
+    # Μία γραμμή ανά επανάληψη για trace='full' (τα a, a_p είναι οι τιμές με τις οποίες ξεκίνησε η επανάληψη)
+    trace_dtype = np.dtype([
+        ("counter", np.int64), ("a", float), ("a_p", float),
+        ("flow_angle (rads)", float), ("angle_of_attack (rads)", float),
+        ("Cl", float), ("Cd", float), ("Cn", float), ("Ct", float),
+        ("a_new", float), ("a_p_new", float),
+    ])
     
-    def __init__(self, blade_geom_DTU, B=3, air_density=1.225, airfoil_type=None, csv_data_file='csv_data_file_DTU.csv'):
+    def __init__(self, blade_geom_DTU, B=3, air_density=1.225, airfoil_type=None, csv_data_file='csv_data_file_DTU.csv',
+                 polar_angle_step=None, backend='auto', kinematic_viscosity=1.5e-5, num_sections=10, section_spacing='linear',
+                 solve_cache=None, config=None):
         """ 
         μέθοδος αρχικοποίησης των βασικών μεταβλητών 
 
         Args:
-            R (float): η ακτίνα του ρότορα σε m
+            blade_geom_DTU (str or BladeGeometry): το αρχείο json με τη γεωμετρία του πτερυγίου ή η ίδια η γεωμετρία
             B (int, optional): ο αριθμός των πτερυγίων. Defaults to 3.
             air_density (float, optional): η πυκνότητα του αέρα σε kg/m^3. Defaults to 1.225.
             airfoil_type (string, optional): ο τύπος της αεροτομής που χρησιμοποιείται. Defaults to None.
-            csv_data_file (csv file, optional): το αρχείο csv που περιέχει τα δεδομένα για τους αεροδυναμικούς συντελεστές Cl και Cd. Defaults to None.
-        """
-        with open(blade_geom_DTU, 'r') as f:
-            blade_geom_DTU = json.load(f)
-        r_is_original = blade_geom_DTU["r_is"]
-        chords_original = blade_geom_DTU["chords"]
-        pitch_original = blade_geom_DTU["pitch"]
-        tc_ratios_original = blade_geom_DTU["tc_ratios"]
-        no_sections = blade_geom_DTU["no_sections"]
-
-        r_first = r_is_original[0] 
-        r_last = np.max(r_is_original)             
-
-        # Δημιουργούμε 10 σημεία με γραμμική παρεμβολή
-        r_new, chords_new, pitch_new, tc_new = blade_geometry_seperation(
-            r_is_original,
-            chords_original,
-            pitch_original,
-            tc_ratios_original,
-            r_first,
-            r_last,
-            num_sections = 10
-        )
+            csv_data_file (csv file or DTU_calc, optional): το αρχείο csv που περιέχει τα δεδομένα για τους αεροδυναμικούς συντελεστές Cl και Cd
+                ή ένα ήδη δημιουργημένο DTU_calc (οπότε το polar_angle_step δεν χρησιμοποιείται). Defaults to 'csv_data_file_DTU.csv'.
+            polar_angle_step (float, optional): αν δοθεί, οι πίνακες της αεροτομής επαναδειγματοληπτούνται σε ομοιόμορφο
+                πλέγμα γωνιών προσβολής με αυτό το βήμα σε μοίρες (βλ. DTU_calc.resample). Defaults to None.
+            backend (str, optional): υλοποίηση της επαναληπτικής διαδικασίας της sections_calculation: 'numpy',
+                'numba' (μεταγλωττισμένος πυρήνας, βλ. bem_kernels) ή 'auto' ('numba' όταν είναι εγκατεστημένο). Defaults to 'auto'.
+            kinematic_viscosity (float, optional): το κινηματικό ιξώδες του αέρα σε m^2/sec, για τον αριθμό Reynolds των τμημάτων
+                όταν το αρχείο csv έχει πίνακες για πολλούς αριθμούς Reynolds. Defaults to 1.5e-5.
+            num_sections (int, optional): το πλήθος των τμημάτων στα οποία χωρίζεται το πτερύγιο ή None για τα τμήματα
+                της γεωμετρίας χωρίς επαναδειγματοληψία. Defaults to 10.
+            section_spacing (str, optional): η κατανομή των τμημάτων, 'linear' ή 'cosine' (βλ. BladeGeometry.resample). Defaults to 'linear'.
+            solve_cache (SectionSolveCache, optional): μνήμη LRU με τις λύσεις των τμημάτων, που μπορεί να μοιράζεται
+                μεταξύ αλγορίθμων. Χρησιμοποιείται από τις segment_calculation (χωρίς καταγραφή) και sections_calculation
+                (χωρίς αρχικές τιμές). Defaults to None.
+            config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας, όταν δεν δίνονται στην κλήση.
+                Defaults to None (δηλ. SolverConfig()).
+
+        Raises:
+            TypeError: αν το config δεν είναι SolverConfig
+        """
+        if not isinstance(blade_geom_DTU, BladeGeometry):
+            blade_geom_DTU = BladeGeometry.from_json(blade_geom_DTU)
+        # Δημιουργούμε num_sections σημεία με γραμμική παρεμβολή (η επαναδειγματοληψία αποθηκεύεται στη BladeGeometry)
+        geometry = blade_geom_DTU if num_sections is None else blade_geom_DTU.resample(num_sections, spacing=section_spacing)
 
-        self.r_is = r_new
-        self.chords = chords_new
-        self.pitch = pitch_new
-        self.tc_ratios = tc_new
-        self.no_sections = len(r_new)
+        self.geometry = geometry
+        self.r_is = geometry.r_is
+        self.chords = geometry.chords
+        self.pitch = geometry.pitch
+        self.tc_ratios = geometry.tc_ratios
+        self.no_sections = geometry.no_sections
 
         # self.wind_speed_V0 = wind_speed_V0 # ταχύτητα του ανέμου (σε m/sec)
-        self.R = r_last
+        self.R = geometry.R # η ακτίνα του ρότορα (ελεγμένη από τη BladeGeometry, δηλ. R >= r_is[-1])
         # self.rotation_speed = rotation_speed # ταχύτητα περιστροφής του ρότορα (σε rad/sec)
         self.B = B 
         self.air_density = air_density 
-        self.airfoil_calc = DTU_calc(csv_data_file) # Χρήση DTU δεδομένων
+        self.kinematic_viscosity = kinematic_viscosity
+        if isinstance(csv_data_file, DTU_calc):
+            self.airfoil_calc = csv_data_file
+        else:
+            self.airfoil_calc = DTU_calc(csv_data_file, angle_step=polar_angle_step) # Χρήση DTU δεδομένων
+        self.backend = bem_kernels.resolve_backend(backend)
+        self.solve_cache = solve_cache
+        self.config = self._check_config(SolverConfig() if config is None else config)
+        self._lock = threading.Lock() # για τις (σπάνιες) ενημερώσεις των πινάκων των τμημάτων και του hash της αεροτομής
+        self._section_polars_state = None # (κλειδί, SectionPolars), βλ. section_polars
+        self._polar_digest = None # (υπογραφή του αρχείου csv, sha256 του περιεχομένου του), βλ. result_cache_key
+        self._frozen = True
+        self.compile_rotor()
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"Η κατάσταση του Hansen_Algorithm δεν αλλάζει μετά τη δημιουργία (δεν αλλάζει το {name}), "
+                                 "βλ. with_config για άλλες ρυθμίσεις")
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"] # (τα locks δεν αντιγράφονται με pickle)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__["_lock"] = threading.Lock()
+
+    @staticmethod
+    def _check_config(config):
+        if not isinstance(config, SolverConfig):
+            raise TypeError(f"Οι ρυθμίσεις πρέπει να είναι SolverConfig (δόθηκε {type(config).__name__})")
+        return config
+
+    def _get_config(self, config):
+        """ οι ρυθμίσεις της κλήσης: το config αν δοθεί, αλλιώς του αλγορίθμου """
+        return self.config if config is None else self._check_config(config)
+
+    def with_config(self, config=None, **changes):
+        """ 
+        ο ίδιος ρότορας (με κοινή γεωμετρία, αεροτομή και πίνακες τμημάτων) με τις ρυθμίσεις config ή με τις αλλαγές
+        changes στις τρέχουσες ρυθμίσεις, π.χ. hansen.with_config(tolerance=1e-6)
+
+        Returns:
+            (Hansen_Algorithm): νέος αλγόριθμος
+        """
+        config = self._get_config(config)
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.__dict__["config"] = config.replace(**changes) if changes else config
+        clone.__dict__["_lock"] = threading.Lock()
+        return clone
+
+    @property
+    def tolerance(self):
+        """ η ανοχή σύγκλισης των ρυθμίσεων του αλγορίθμου (βλ. SolverConfig) """
+        return self.config.tolerance
+
+    @property
+    def max_iter(self):
+        """ ο μέγιστος αριθμός επαναλήψεων των ρυθμίσεων του αλγορίθμου (βλ. SolverConfig) """
+        return self.config.max_iter
+
+    def compile_rotor(self):
+        """ 
+        προ-υπολογισμός ενός πίνακα Cl, Cd, Cm ως προς τη γωνία προσβολής για κάθε τμήμα του πτερυγίου,
+        ήδη αναμεμειγμένου για το λόγο t/c του τμήματος. Καλείται στην αρχικοποίηση και ξανά αυτόματα
+        (βλ. section_polars) όταν αλλάξει το αρχείο csv της αεροτομής. Οι πίνακες και το κλειδί τους αντικαθίστανται
+        μαζί (μία πλειάδα), ώστε ένα νήμα που διαβάζει τη section_polars να μη βλέπει ποτέ μισή ενημέρωση.
+
+        Returns:
+            (SectionPolars): οι πίνακες των τμημάτων
+        """
+        with self._lock:
+            self.airfoil_calc.reload_if_changed()
+            tables = self.airfoil_calc.tables # (το κλειδί και οι πίνακες από την ίδια ανάγνωση του αρχείου)
+            state = ((id(self.airfoil_calc), tables.version), self.airfoil_calc.blend(self.tc_ratios, tables))
+            object.__setattr__(self, '_section_polars_state', state)
+        return state[1]
+
+    def _get_section_polars_key(self):
+        return id(self.airfoil_calc), self.airfoil_calc.version
+
+    @property
+    def section_polars(self):
+        """ οι προ-υπολογισμένοι πίνακες των τμημάτων (βλ. compile_rotor), που ξαναδημιουργούνται αν δεν είναι πλέον έγκυροι """
+        self.airfoil_calc.reload_if_changed()
+        state = self._section_polars_state
+        if state is None or state[0] != self._get_section_polars_key():
+            return self.compile_rotor()
+        return state[1]
+
+    @property
+    def uses_reynolds(self):
+        """ True αν οι συντελεστές Cl, Cd εξαρτώνται και από τον αριθμό Reynolds κάθε τμήματος (πίνακες για πολλά Re) """
+        return self.airfoil_calc.re_values is not None
 
     def calculation_of_flow_angle_rad(self, a, a_p, r:float, v0:int, w_rps:float):
         """
@@ -107,7 +216,7 @@ class Hansen_Algorithm:
         v_axial = v0 * (1 - a) # συνιστώσα αξονικής ταχύτητας
         v_tangential = w_rps* r * (1 + a_p) # συνιστώσα εφαπτομενικής ταχύτητας
 
-        if a_p == -1:
+        if np.any(np.equal(a_p, -1)):
             raise ValueError("Διαίρεση με το 0")
         else:
             return np.arctan(v_axial / v_tangential)
@@ -126,20 +235,32 @@ class Hansen_Algorithm:
         """
         return (flow_angle_rad - (np.radians(pitch_angle_deg) + np.radians(twist_deg)))
     
-    def calculation_of_Cl_and_Cd(self, angle_of_attack_deg:float, tc_ratio=None):
+    def calculation_of_reynolds_number(self, a, a_p, r:float, v0:int, w_rps:float, chord:float):
+        """
+        μέθοδος για τον υπολογισμό του αριθμού Reynolds Re = Vrel * c / ν του τμήματος,
+        με τη σχετική ταχύτητα Vrel που προκύπτει από τους τρέχοντες συντελεστές επαγωγής a και a΄
+
+        Returns:
+            (float): ο αριθμός Reynolds
+        """
+        Vrel = np.sqrt((v0 * (1 - a))**2 + (w_rps * r * (1 + a_p))**2)
+        return Vrel * chord / self.kinematic_viscosity
+
+    def calculation_of_Cl_and_Cd(self, angle_of_attack_deg:float, tc_ratio=None, reynolds=None):
         """ 
         πίνακας για τους αεροδυναμικούς συντελεστές άνωσης και οπισθέλκουσας Cl and Cd
         βάσει του angle_of_attack (γωνία προσβολής), αλλά και του λόγου t/c (thickness/chord ratio) (ΒΗΜΑ 4 ΤΟΥ ΑΛΓΟΡΙΘΜΟΥ)
         
         Args:
-            angle_of_attack_deg (float): η γωνία προσβολής α σε μοίρες
-            tc_ratio (float): o λόγος πάχους αεροτομής / χορδή αεροτομής
+            angle_of_attack_deg (float or np.ndarray): η γωνία προσβολής α σε μοίρες
+            tc_ratio (float or np.ndarray): o λόγος πάχους αεροτομής / χορδή αεροτομής
+            reynolds (float or np.ndarray, optional): ο αριθμός Reynolds του τμήματος. Defaults to None
+                (δηλ. ο αριθμός Reynolds αναφοράς της αεροτομής).
             
         Returns:
              (float): αεροδυναμικούς συντελεστές άνωσης και οπισθέλκουσας Cl και Cd
         """
-        Cl = self.airfoil_calc.cl(angle_of_attack_deg, tc_ratio) # Υπολογισμός Cl με βάση τη γωνία προσβολής και t/c
-        Cd = self.airfoil_calc.cd(angle_of_attack_deg, tc_ratio) # Υπολογισμός Cd με βάση τη γωνία προσβολής και t/c
+        Cl, Cd, _ = self.airfoil_calc.coefficients(angle_of_attack_deg, tc_ratio, reynolds) # Υπολογισμός Cl και Cd με μία αναζήτηση στον πίνακα
         return Cl, Cd
     
     def calculation_of_Cn_and_Ct(self, Cl:float, Cd:float, flow_angle_rad:float):
@@ -210,63 +331,73 @@ class Hansen_Algorithm:
         return L, D, pn, pt
      
     def segment_calculation(self, wind_speed_V0, omega_rad_sec, r, chord, pitch_angle_deg, twist_deg, tc_ratio, 
-                            f=0.3, debug_mode=False):
-        """ εκτέλεση του αλγορίθμου για κάθε τμήμα του πτερυγίου """
-        v0 = wind_speed_V0
-        w_rps = omega_rad_sec
-        
-        _debug_lst = []
+                            f=None, debug_mode=False, solver='fixed_point', trace='off', trace_writer=None, config=None):
+        """ 
+        εκτέλεση του αλγορίθμου για κάθε τμήμα του πτερυγίου.
+        Με solver='bracketed' η γωνία ροής υπολογίζεται ως ρίζα του υπολοίπου R(φ) (βλ. sections_calculation)
+        και το αποτέλεσμα περιέχει επιπλέον το "bracket_found".
+        Με trace='summary' το αποτέλεσμα περιέχει επιπλέον τα "converged", "residual a" και "residual a_p" της τελευταίας
+        επανάληψης, ενώ με trace='full' και το "trace": πίνακα NumPy (trace_dtype) με μία γραμμή ανά επανάληψη.
+        Αν δοθεί trace_writer (TraceWriter), ο πίνακας αυτός γράφεται στο αρχείο του από νήμα στο παρασκήνιο, μαζί με τα
+        δεδομένα εισόδου του τμήματος. Με debug_mode=True χρησιμοποιείται ο κοινός TraceWriter
+        (βλ. trace_writer.get_default_trace_writer).
+        Αν η αεροτομή έχει πίνακες για πολλούς αριθμούς Reynolds, σε κάθε επανάληψη οι Cl, Cd υπολογίζονται για τον αριθμό
+        Reynolds του τμήματος (βλ. calculation_of_reynolds_number) και το αποτέλεσμα περιέχει επιπλέον το "Reynolds number".
+        Οι ρυθμίσεις της επαναληπτικής διαδικασίας δίνει το config (ή οι ρυθμίσεις του αλγορίθμου) και ο συντελεστής
+        χαλάρωσης f, αν δοθεί, αντικαθιστά το config.relaxation.
+        """
+        config = self._get_config(config)
+        f = config.relaxation if f is None else f
+        if solver != 'fixed_point':
+            if trace != 'off' or debug_mode or trace_writer is not None:
+                raise ValueError("Η καταγραφή των επαναλήψεων υποστηρίζεται μόνο με solver='fixed_point'")
+            res = self.sections_calculation(
+                wind_speed_V0=wind_speed_V0, omega_rad_sec=omega_rad_sec, r=r, chord=chord,
+                pitch_angle_deg=pitch_angle_deg, twist_deg=twist_deg, tc_ratio=tc_ratio, f=f, solver=solver, config=config)
+            if res.pop("failed"):
+                raise ValueError("Διαίρεση με το 0")
+            return {key: value[()] for key, value in res.items()}
+        if trace not in self.trace_levels:
+            raise ValueError(f"Άγνωστο επίπεδο καταγραφής {trace!r} (επιτρεπτά: {self.trace_levels})")
+        cache_key = None
+        if self.solve_cache is not None and trace == 'off' and not debug_mode and trace_writer is None:
+            cache_key = self.solve_cache.keys(self._solve_cache_settings('segment', solver, f, config), wind_speed_V0, omega_rad_sec,
+                                              r, chord, pitch_angle_deg, twist_deg, tc_ratio)[0]
+            cached = self.solve_cache.get(cache_key)
+            if cached is not None:
+                return dict(zip(cached.names, cached.values))
+        if debug_mode and trace_writer is None:
+            trace_writer = get_default_trace_writer()
+        if trace_writer is not None:
+            trace = 'full'
+        history = np.zeros(config.max_iter + 1, dtype=self.trace_dtype) if trace == 'full' else None
+
         a, a_p = 0, 0 # αρχικοποίηση των συντελεστών επαγωγής a και a' σε 0
-        exit_flag = False
+        converged = False
         counter = 0 # αρχικά ο μετρητής έχει την τιμή 0
-        
-        
-        while not exit_flag:
+
+        while not converged:
             flow_angle_rad = self.calculation_of_flow_angle_rad(a=a, a_p=a_p, r=r, v0=wind_speed_V0, w_rps=omega_rad_sec)
             angle_of_attack_rad = self.calculation_of_local_angle_of_attack_rad(flow_angle_rad=flow_angle_rad, pitch_angle_deg=pitch_angle_deg, twist_deg=twist_deg)
-            Cl, Cd = self.calculation_of_Cl_and_Cd(angle_of_attack_deg=np.degrees(angle_of_attack_rad), tc_ratio=tc_ratio)
+            reynolds = self.calculation_of_reynolds_number(a=a, a_p=a_p, r=r, v0=wind_speed_V0, w_rps=omega_rad_sec, chord=chord) if self.uses_reynolds else None
+            Cl, Cd = self.calculation_of_Cl_and_Cd(angle_of_attack_deg=np.degrees(angle_of_attack_rad), tc_ratio=tc_ratio, reynolds=reynolds)
             Cn, Ct = self.calculation_of_Cn_and_Ct(Cl=Cl, Cd=Cd, flow_angle_rad=flow_angle_rad)
             a_new, a_p_new = self.calculation_of_updated_induction_factors(Cn=Cn, Ct=Ct, r=r, chord=chord, flow_angle_rad=flow_angle_rad)
-            
-            if abs(a - a_new) < self.tolerance and abs(a_p - a_p_new) < self.tolerance: # έχω σύγκλιση των τιμών
-                exit_flag = True
+            residual_a, residual_a_p = abs(a - a_new), abs(a_p - a_p_new)
+            if history is not None:
+                history[counter] = (counter + 1, a, a_p, flow_angle_rad, angle_of_attack_rad, Cl, Cd, Cn, Ct, a_new, a_p_new)
+
+            if residual_a < config.tolerance and residual_a_p < config.tolerance: # έχω σύγκλιση των τιμών
+                converged = True
             else: # συνεχίζω τον αλγόριθμο
                 a = a * (1 - f) + f * a_new
                 a_p = a_p * (1 - f) + f * a_p_new  
             counter += 1 # αύξηση της τιμής του μετρητή κατά 1 
-            if counter > self.max_iter:
+            if counter > config.max_iter: # δεν έχω σύγκλιση, επιστρέφονται οι τελευταίες τιμές (βλ. "converged")
                 break
-                raise Exception("Δεν έχω σύγκλιση")
-            L, D, pn, pt = self.calculation_of_local_loads(r=r, a=a, a_p=a_p, v0=v0, w_rps=omega_rad_sec, chord=chord, flow_angle_rad=flow_angle_rad, Cl=Cl, Cd=Cd)
-            temp_dict = {
-                "r_i (m)": r,
-                "chord (m)": chord,
-                "pitch_angle (degrees)": pitch_angle_deg,
-                "twist (degrees)": twist_deg,
-                "a": a,
-                "a_p": a_p,
-                "flow_angle (rads)": flow_angle_rad,
-                "flow angle (degrees)": np.degrees(flow_angle_rad),
-                "angle_of_attack (rads)": angle_of_attack_rad,
-                "angle of attack (degrees)": np.degrees(angle_of_attack_rad),
-                "Cl": Cl,
-                "Cd": Cd,
-                "Cn": Cn,
-                "Ct": Ct,
-                "a_new": a_new,
-                "a_p_new": a_p_new,
-                "Lift (N/m)": L,
-                "Drag (N/m)": D,
-                "pn (N/m)": pn,
-                "pt (N/m)": pt,
-                "counter":counter
-            }
-            _debug_lst.append(temp_dict)
-            
-        if debug_mode:
-            df = pd.DataFrame(_debug_lst)
-            df.to_excel("save_res.xlsx")
-              
+
+        # τα τοπικά φορτία υπολογίζονται μία φορά, μετά το τέλος των επαναλήψεων
+        L, D, pn, pt = self.calculation_of_local_loads(r=r, a=a, a_p=a_p, v0=wind_speed_V0, w_rps=omega_rad_sec, chord=chord, flow_angle_rad=flow_angle_rad, Cl=Cl, Cd=Cd)
         res_dict =  {
             "r_i (m)": r,
             "chord (m)": chord,
@@ -290,9 +421,441 @@ class Hansen_Algorithm:
             "pt (N/m)": pt,
             "counter": counter
         }
+        if reynolds is not None:
+            res_dict["Reynolds number"] = reynolds
+        if cache_key is not None:
+            self.solve_cache.put(cache_key, res_dict.keys(), res_dict.values())
+        if trace != 'off':
+            res_dict["converged"] = converged
+            res_dict["residual a"] = residual_a
+            res_dict["residual a_p"] = residual_a_p
+        if trace == 'full':
+            res_dict["trace"] = history[:counter]
+            if trace_writer is not None:
+                trace_writer.submit(
+                    res_dict["trace"], wind_speed_V0=wind_speed_V0, omega_rad_sec=omega_rad_sec, r=r, chord=chord,
+                    pitch_angle_deg=pitch_angle_deg, twist_deg=twist_deg, tc_ratio=tc_ratio)
         return res_dict
 
-    def DTU_blade_calculation(self, wind_speed_V0, rotation_speed):
+    def sections_calculation(self, wind_speed_V0, omega_rad_sec, r, chord, pitch_angle_deg, twist_deg, tc_ratio,
+                             f=None, section_index=None, solver='fixed_point', a_init=None, a_p_init=None, backend=None,
+                             config=None):
+        """
+        εκτέλεση του αλγορίθμου για όλα τα τμήματα του πτερυγίου ταυτόχρονα, με πίνακες NumPy.
+        Με solver='fixed_point' κάθε τμήμα έχει τη δική του μάσκα σύγκλισης: όταν ένα τμήμα συγκλίνει (ή ξεπεράσει το max_iter)
+        σταματά να ενημερώνεται, ενώ τα υπόλοιπα συνεχίζουν. Οι επαναλήψεις είναι ίδιες με αυτές της segment_calculation.
+        Με solver='bracketed' η γωνία ροής φ κάθε τμήματος υπολογίζεται ως ρίζα της calculation_of_flow_angle_residual
+        (βλ. _bracketed_solve).
+
+        Args:
+            wind_speed_V0 (float or np.ndarray): η ταχύτητα του ανέμου σε m/sec
+            omega_rad_sec (float or np.ndarray): η ταχύτητα περιστροφής του ρότορα σε rad/sec
+            r (np.ndarray): οι ακτίνες των τμημάτων του πτερυγίου σε m
+            chord (np.ndarray): τα μήκη χορδής των τμημάτων σε m
+            pitch_angle_deg (np.ndarray): οι γωνίες βήματος των τμημάτων σε μοίρες
+            twist_deg (float or np.ndarray): οι γωνίες συστροφής των τμημάτων σε μοίρες
+            tc_ratio (np.ndarray): οι λόγοι t/c των τμημάτων
+            f (float, optional): συντελεστής χαλάρωσης. Defaults to None (δηλ. config.relaxation).
+            section_index (np.ndarray, optional): οι δείκτες των τμημάτων του ρότορα. Αν δοθούν, οι συντελεστές
+                Cl και Cd υπολογίζονται από τους προ-υπολογισμένους πίνακες section_polars (και το tc_ratio
+                δεν χρησιμοποιείται). Defaults to None.
+            solver (str, optional): 'fixed_point' ή 'bracketed'. Defaults to 'fixed_point'.
+            a_init (np.ndarray, optional): αρχικές τιμές του συντελεστή a για την επαναληπτική διαδικασία
+                (π.χ. η λύση σε γειτονικό σημείο λειτουργίας). Defaults to None (δηλ. 0).
+            a_p_init (np.ndarray, optional): αρχικές τιμές του συντελεστή a'. Defaults to None (δηλ. 0).
+            backend (str, optional): 'numpy', 'numba' ή 'auto' για την επαναληπτική διαδικασία. Ο πυρήνας του numba
+                χρησιμοποιείται μόνο με solver='fixed_point' και section_index. Defaults to None (δηλ. self.backend).
+            config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας. Defaults to None (δηλ. self.config).
+
+        Returns:
+            (dict): λεξικό με πίνακες (ίδιου σχήματος με τα ορίσματα) για τα μεγέθη της segment_calculation,
+            καθώς και τη μάσκα "failed" για τα τμήματα που δεν ήταν δυνατόν να υπολογιστούν
+            (και τη μάσκα "bracket_found" για solver='bracketed'). Αν η αεροτομή έχει πίνακες για πολλούς αριθμούς Reynolds,
+            περιέχει και τον αριθμό Reynolds κάθε τμήματος ("Reynolds number") στην τελευταία επανάληψη.
+        """
+        if solver not in ('fixed_point', 'bracketed'):
+            raise ValueError(f"Άγνωστη μέθοδος επίλυσης {solver}")
+        if solver == 'bracketed' and self.uses_reynolds:
+            raise ValueError("Οι πίνακες για πολλούς αριθμούς Reynolds υποστηρίζονται μόνο με solver='fixed_point'")
+        config = self._get_config(config)
+        f = config.relaxation if f is None else f
+        section_polars = None
+        if section_index is not None:
+            section_polars = self.section_polars
+        else:
+            section_index = 0
+        v0, w_rps, r, chord, pitch_angle_deg, twist_deg, tc_ratio, section_index = np.broadcast_arrays(
+            *[np.asarray(x, dtype=float) for x in (wind_speed_V0, omega_rad_sec, r, chord, pitch_angle_deg, twist_deg, tc_ratio)],
+            np.asarray(section_index, dtype=int))
+        shape = r.shape
+        # εργαζόμαστε σε μονοδιάστατους πίνακες και επαναφέρουμε το σχήμα στο τέλος
+        sections = {key: x.ravel() for key, x in zip(
+            ("v0", "w_rps", "r", "chord", "pitch_angle_deg", "twist_deg", "tc_ratio", "section_index"),
+            (v0, w_rps, r, chord, pitch_angle_deg, twist_deg, tc_ratio, section_index))}
+        sections["section_polars"] = section_polars
+        sections["config"] = config # οι ρυθμίσεις της κλήσης ταξιδεύουν μαζί με τους πίνακές της
+        if a_init is not None:
+            a_init = np.broadcast_to(np.asarray(a_init, dtype=float), shape).ravel()
+        if a_p_init is not None:
+            a_p_init = np.broadcast_to(np.asarray(a_p_init, dtype=float), shape).ravel()
+        backend = self.backend if backend is None else bem_kernels.resolve_backend(backend)
+
+        if self.solve_cache is not None and a_init is None and a_p_init is None:
+            res = self._solve_sections_cached(sections, solver, f, backend)
+        else: # με αρχικές τιμές η λύση εξαρτάται και από αυτές, επομένως δεν χρησιμοποιείται η cache
+            res = self._solve_sections(sections, solver, f, backend, a_init, a_p_init)
+        return {key: value.reshape(shape) for key, value in res.items()}
+
+    def _solve_sections(self, sections, solver, f, backend, a_init=None, a_p_init=None):
+        """ η επίλυση της sections_calculation για τους μονοδιάστατους πίνακες sections (χωρίς την cache) """
+        n = sections["r"].size
+        state = {
+            # αρχικοποίηση των συντελεστών επαγωγής a και a' σε 0 (ή στις τιμές a_init, a_p_init)
+            "a": np.zeros(n) if a_init is None else a_init.copy(),
+            "a_p": np.zeros(n) if a_p_init is None else a_p_init.copy(),
+            "counter": np.zeros(n, dtype=int),
+            "failed": np.zeros(n, dtype=bool),
+        }
+        state.update({key: np.full(n, np.nan) for key in self._evaluation_keys})
+        if self.uses_reynolds:
+            state["Reynolds number"] = np.full(n, np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # ο μεταγλωττισμένος πυρήνας δεν υποστηρίζει (ακόμη) την παρεμβολή ως προς τον αριθμό Reynolds
+            if solver == 'fixed_point' and backend == 'numba' and sections["section_polars"] is not None and not self.uses_reynolds:
+                self._fixed_point_iteration_compiled(sections, state, f)
+            elif solver == 'fixed_point':
+                self._fixed_point_iteration(sections, state, np.arange(n), f)
+            else:
+                self._bracketed_solve(sections, state, np.arange(n), f)
+
+            L, D, pn, pt = self.calculation_of_local_loads(
+                r=sections["r"], a=state["a"], a_p=state["a_p"], v0=sections["v0"], w_rps=sections["w_rps"], chord=sections["chord"],
+                flow_angle_rad=state["flow_angle (rads)"], Cl=state["Cl"], Cd=state["Cd"])
+        res = {
+            "r_i (m)": sections["r"],
+            "chord (m)": sections["chord"],
+            "pitch_angle (degrees)": sections["pitch_angle_deg"],
+            "twist (degrees)": sections["twist_deg"],
+            "a": state["a"],
+            "a_p": state["a_p"],
+            "flow_angle (rads)": state["flow_angle (rads)"],
+            "flow angle (degrees)": np.degrees(state["flow_angle (rads)"]),
+            "angle_of_attack (rads)": state["angle_of_attack (rads)"],
+            "angle of attack (degrees)": np.degrees(state["angle_of_attack (rads)"]),
+            "Cl": state["Cl"],
+            "Cd": state["Cd"],
+            "Cn": state["Cn"],
+            "Ct": state["Ct"],
+            "a_new": state["a_new"],
+            "a_p_new": state["a_p_new"],
+            "Lift (N/m)": L,
+            "Drag (N/m)": D,
+            "pn (N/m)": pn,
+            "pt (N/m)": pt,
+            "counter": state["counter"],
+            "failed": state["failed"],
+        }
+        if solver == 'bracketed':
+            res["bracket_found"] = state["bracket_found"]
+        if self.uses_reynolds:
+            res["Reynolds number"] = state["Reynolds number"]
+        return res
+
+    def _solve_cache_settings(self, mode, solver, f, config, backend=None):
+        """ 
+        οι ρυθμίσεις του αλγορίθμου και η ταυτότητα των πινάκων της αεροτομής για το κλειδί της solve_cache
+        (mode: 'segment', 'sections' ή 'section_polars', αφού οι τρεις τρόποι αναζήτησης των Cl, Cd δεν δίνουν
+        αποτελέσματα ίδια σε όλα τα ψηφία)
+        """
+        airfoil = self.airfoil_calc
+        # (ένα DTU_calc χωρίς αρχείο csv αναγνωρίζεται από την ταυτότητα και την έκδοση των πινάκων του)
+        source = (id(airfoil), airfoil.version) if airfoil.csv_data_file is None else os.path.abspath(airfoil.csv_data_file)
+        polar_id = (source, airfoil.source_signature, airfoil.angle_step, airfoil.reynolds,
+                    self.kinematic_viscosity if self.uses_reynolds else None)
+        return (mode, solver, float(f), config.tolerance, config.max_iter, self.B, self.air_density, backend, polar_id)
+
+    def result_cache_key(self, solver='fixed_point', backend=None, config=None):
+        """ 
+        το κλειδί του ρότορα για τη RotorResultCache: hash της γεωμετρίας, του περιεχομένου του αρχείου της αεροτομής,
+        των ρυθμίσεων (config ή self.config) και της έκδοσης του αλγορίθμου (solver_version)
+        """
+        config = self._get_config(config)
+        airfoil = self.airfoil_calc
+        airfoil.reload_if_changed()
+        if airfoil.csv_data_file is None: # πίνακες χωρίς αρχείο csv (βλ. DTU_calc.from_arrays)
+            tables = airfoil.tables
+            if self._polar_digest is None or self._polar_digest[0] != (id(airfoil), tables.version):
+                polar_digest = hashlib.sha256()
+                for array in (tables.tc_values, tables.original_angles,
+                              tables.original_coefs if tables.re_values is None else tables.original_re_coefs):
+                    polar_digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+                if tables.re_values is not None:
+                    polar_digest.update(np.ascontiguousarray(tables.re_values, dtype=float).tobytes())
+                object.__setattr__(self, '_polar_digest', ((id(airfoil), tables.version), polar_digest.hexdigest()))
+        elif self._polar_digest is None or self._polar_digest[0] != (airfoil.csv_data_file, airfoil.source_signature):
+            with open(airfoil.csv_data_file, mode='rb') as file:
+                object.__setattr__(self, '_polar_digest', ((airfoil.csv_data_file, airfoil.source_signature),
+                                                           hashlib.sha256(file.read()).hexdigest()))
+        digest = hashlib.sha256()
+        for array in (self.r_is, self.chords, self.pitch, self.tc_ratios):
+            digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+        settings = (self.solver_version, float(self.R), self.B, self.air_density, config.tolerance, config.max_iter, config.relaxation, solver,
+                    self.backend if backend is None else bem_kernels.resolve_backend(backend),
+                    self._polar_digest[1], airfoil.angle_step, airfoil.reynolds, self.kinematic_viscosity if self.uses_reynolds else None)
+        digest.update(repr(settings).encode())
+        return digest.hexdigest()
+
+    def _solve_sections_cached(self, sections, solver, f, backend):
+        """ η _solve_sections μόνο για τα τμήματα που δεν υπάρχουν στην solve_cache (βλ. SectionSolveCache) """
+        cache = self.solve_cache
+        if sections["section_polars"] is None:
+            settings = self._solve_cache_settings('sections', solver, f, sections["config"])
+            tc_ratio = sections["tc_ratio"]
+        else: # οι πίνακες των τμημάτων αντιστοιχούν στους λόγους t/c του ρότορα
+            settings = self._solve_cache_settings('section_polars', solver, f, sections["config"], backend)
+            tc_ratio = np.asarray(self.tc_ratios, dtype=float)[sections["section_index"]]
+        keys = cache.keys(settings, sections["v0"], sections["w_rps"], sections["r"], sections["chord"],
+                          sections["pitch_angle_deg"], sections["twist_deg"], tc_ratio)
+        entries = [cache.get(key) for key in keys]
+        miss = np.array([entry is None for entry in entries], dtype=bool)
+        if not miss.any() and entries:
+            names = entries[0].names
+            return {name: np.array([entry.values[j] for entry in entries]) for j, name in enumerate(names)}
+        solved = self._solve_sections(
+            {key: value[miss] if isinstance(value, np.ndarray) else value for key, value in sections.items()}, solver, f, backend)
+        names = tuple(solved)
+        for key, values in zip((key for key, missed in zip(keys, miss) if missed), zip(*(solved[name].tolist() for name in names))):
+            cache.put(key, names, values)
+        res = {}
+        hits = [entry for entry in entries if entry is not None]
+        for j, name in enumerate(names):
+            res[name] = np.empty(miss.size, dtype=solved[name].dtype)
+            res[name][miss] = solved[name]
+            res[name][~miss] = [entry.values[j] for entry in hits]
+        return res
+
+    _evaluation_keys = ("flow_angle (rads)", "angle_of_attack (rads)", "Cl", "Cd", "Cn", "Ct", "a_new", "a_p_new")
+
+    def _evaluate_flow_angle(self, sections, flow_angle_rad, idx, reynolds=None):
+        """ 
+        τα ΒΗΜΑΤΑ 3 έως 6 του αλγορίθμου για τη γωνία ροής flow_angle_rad των τμημάτων idx της sections_calculation
+        (με τους αριθμούς Reynolds reynolds των τμημάτων, αν δοθούν)
+        """
+        angle_of_attack_rad = self.calculation_of_local_angle_of_attack_rad(
+            flow_angle_rad=flow_angle_rad, pitch_angle_deg=sections["pitch_angle_deg"][idx], twist_deg=sections["twist_deg"][idx])
+        if sections["section_polars"] is None:
+            Cl, Cd = self.calculation_of_Cl_and_Cd(angle_of_attack_deg=np.degrees(angle_of_attack_rad), tc_ratio=sections["tc_ratio"][idx], reynolds=reynolds)
+        else: # μία μόνο αναζήτηση ως προς τη γωνία προσβολής στον πίνακα κάθε τμήματος
+            Cl, Cd, _ = sections["section_polars"].coefficients(np.degrees(angle_of_attack_rad), sections["section_index"][idx], reynolds)
+        Cn, Ct = self.calculation_of_Cn_and_Ct(Cl=Cl, Cd=Cd, flow_angle_rad=flow_angle_rad)
+        a_new, a_p_new = self.calculation_of_updated_induction_factors(
+            Cn=Cn, Ct=Ct, r=sections["r"][idx], chord=sections["chord"][idx], flow_angle_rad=flow_angle_rad)
+        return dict(zip(self._evaluation_keys, (flow_angle_rad, angle_of_attack_rad, Cl, Cd, Cn, Ct, a_new, a_p_new)))
+
+    def _fixed_point_iteration(self, sections, state, idx, f):
+        """ η επαναληπτική διαδικασία (με χαλάρωση f) της sections_calculation για τα τμήματα idx """
+        a, a_p, counter, failed = state["a"], state["a_p"], state["counter"], state["failed"]
+        config = sections["config"]
+        active = idx # δείκτες των τμημάτων που δεν έχουν ακόμη συγκλίνει
+        while active.size:
+            flow_angle_rad = self.calculation_of_flow_angle_rad(
+                a=a[active], a_p=a_p[active], r=sections["r"][active], v0=sections["v0"][active], w_rps=sections["w_rps"][active])
+            reynolds = None
+            if self.uses_reynolds:
+                reynolds = self.calculation_of_reynolds_number(
+                    a=a[active], a_p=a_p[active], r=sections["r"][active], v0=sections["v0"][active],
+                    w_rps=sections["w_rps"][active], chord=sections["chord"][active])
+                state["Reynolds number"][active] = reynolds
+            evaluation = self._evaluate_flow_angle(sections, flow_angle_rad, active, reynolds)
+            for key, value in evaluation.items():
+                state[key][active] = value
+            a_new, a_p_new = evaluation["a_new"], evaluation["a_p_new"]
+
+            converged = (np.abs(a[active] - a_new) < config.tolerance) & (np.abs(a_p[active] - a_p_new) < config.tolerance)
+            update = active[~converged] # τα τμήματα που συνεχίζουν τον αλγόριθμο
+            a[update] = a[update] * (1 - f) + f * a_new[~converged]
+            a_p[update] = a_p[update] * (1 - f) + f * a_p_new[~converged]
+            counter[active] += 1
+
+            # αποκλείουμε τα τμήματα για τα οποία η εφαπτομενική ταχύτητα θα μηδενιζόταν
+            singular = a_p[active] == -1
+            failed[active[singular]] = True
+            active = active[~(converged | singular | (counter[active] > config.max_iter))]
+
+    def _fixed_point_iteration_compiled(self, sections, state, f):
+        """ η επαναληπτική διαδικασία της sections_calculation με τον μεταγλωττισμένο πυρήνα bem_kernels.fixed_point_sections """
+        polars, config = sections["section_polars"], sections["config"]
+        # αντίγραφα, αφού οι πίνακες μπορεί να είναι όψεις (views) της np.broadcast_arrays
+        inputs = [np.array(sections[key]) for key in ("v0", "w_rps", "r", "chord", "pitch_angle_deg", "twist_deg", "section_index")]
+        results = bem_kernels.compile_kernels()(
+            *inputs, state["a"], state["a_p"], polars.angles, polars.coefs,
+            0.0 if polars.angle_step is None else float(polars.angle_step), float(self.B), float(f), config.tolerance, config.max_iter)
+        for key, value in zip(self._evaluation_keys, results[:-2]):
+            state[key] = value
+        state["counter"], status = results[-2], results[-1]
+        outside = status == bem_kernels.STATUS_OUT_OF_RANGE
+        if np.any(outside):
+            raise ValueError(f'Η τιμή {np.degrees(state["angle_of_attack (rads)"][outside])} είναι εκτός του εύρους δεδομένων που περιλαμβάνει το αρχείο csv.')
+        state["failed"] = status == bem_kernels.STATUS_SINGULAR
+
+    def calculation_of_flow_angle_residual(self, Cn, Ct, r, chord, flow_angle_rad, v0, w_rps):
+        """
+        μέθοδος για τον υπολογισμό του υπολοίπου R(φ) = λr sinφ (1 + k) - cosφ (1 - k΄), με λr = ωr/V0,
+        k = σCn / (4 sin²φ) και k΄ = σCt / (4 sinφ cosφ). Αφού a = k/(1+k) και a΄ = k΄/(1-k΄), το R(φ) μηδενίζεται
+        όταν tanφ = V0(1-a) / (ωr(1+a΄)), δηλαδή όταν η γωνία ροής συμφωνεί με τους συντελεστές επαγωγής που προκύπτουν από αυτή.
+
+        Returns:
+            (float): το υπόλοιπο R(φ)
+        """
+        solidity_factor = (self.B * chord) / (2 * np.pi * r) # solidity factor (συντελεστής στερεότητας)
+        k = solidity_factor * Cn / (4 * np.sin(flow_angle_rad)**2)
+        k_p = solidity_factor * Ct / (4 * np.sin(flow_angle_rad) * np.cos(flow_angle_rad))
+        local_speed_ratio = w_rps * r / v0
+        return local_speed_ratio * np.sin(flow_angle_rad) * (1 + k) - np.cos(flow_angle_rad) * (1 - k_p)
+
+    def _flow_angle_residual(self, sections, flow_angle_rad, idx):
+        evaluation = self._evaluate_flow_angle(sections, flow_angle_rad, idx)
+        residual = self.calculation_of_flow_angle_residual(
+            Cn=evaluation["Cn"], Ct=evaluation["Ct"], r=sections["r"][idx], chord=sections["chord"][idx],
+            flow_angle_rad=flow_angle_rad, v0=sections["v0"][idx], w_rps=sections["w_rps"][idx])
+        return residual, evaluation
+
+    def _bracketed_solve(self, sections, state, idx, f, flow_angle_tolerance=1e-10, shrink=0.7, max_bracket_steps=25):
+        """
+        επίλυση της sections_calculation ως ρίζα R(φ) = 0 της calculation_of_flow_angle_residual για τα τμήματα idx.
+        Ξεκινώντας από τη γωνία ροής χωρίς επαγωγή φ0 = arctan(V0 / ωr) (όπου R(π/2) > 0) μειώνουμε τη φ κατά τον
+        συντελεστή shrink μέχρι να αλλάξει πρόσημο το R, ώστε να εγκλωβιστεί η μεγαλύτερη ρίζα κάτω από το φ0
+        (αυτή στην οποία συγκλίνει και η επαναληπτική διαδικασία). Η ρίζα βρίσκεται με τη μέθοδο regula falsi
+        (παραλλαγή Illinois), που παραμένει πάντα μέσα στο διάστημα. Τα τμήματα για τα οποία δεν βρέθηκε διάστημα
+        (bracket_found = False) υπολογίζονται με την επαναληπτική διαδικασία.
+        """
+        n = state["a"].size
+        counter = state["counter"]
+        state["bracket_found"] = np.zeros(n, dtype=bool)
+        v0, w_rps, r = sections["v0"][idx], sections["w_rps"][idx], sections["r"][idx]
+
+        def store(ids, evaluation):
+            for key, value in evaluation.items():
+                state[key][ids] = value
+            counter[ids] += 1
+
+        # με ω = 0 η γωνία ροής είναι π/2 ανεξάρτητα από τους συντελεστές επαγωγής
+        still = w_rps * r == 0
+        ids = idx[still]
+        store(ids, self._evaluate_flow_angle(sections, np.full(ids.size, np.pi / 2), ids))
+        state["bracket_found"][ids] = True
+        state["a"][ids] = state["a_new"][ids]
+        state["a_p"][ids] = state["a_p_new"][ids]
+        idx, v0, w_rps, r = idx[~still], v0[~still], w_rps[~still], r[~still]
+
+        # εγκλωβισμός της ρίζας: R(hi) > 0 >= R(lo)
+        hi = np.full(idx.size, np.pi / 2)
+        R_hi = np.full(idx.size, np.inf)
+        lo = np.arctan(v0 / (w_rps * r))
+        R_lo = np.full(idx.size, np.nan)
+        searching = np.arange(idx.size)
+        for _ in range(max_bracket_steps):
+            if not searching.size:
+                break
+            residual, evaluation = self._flow_angle_residual(sections, lo[searching], idx[searching])
+            store(idx[searching], evaluation)
+            negative = residual <= 0
+            R_lo[searching[negative]] = residual[negative]
+            positive = searching[~negative]
+            hi[positive], R_hi[positive] = lo[positive], residual[~negative]
+            lo[positive] *= shrink
+            searching = positive
+        # όταν το R είναι ήδη αρνητικό στο φ0 υπολογίζουμε και το R(π/2), για να έχει η regula falsi δύο άκρα
+        at_right_angle = np.flatnonzero(~np.isnan(R_lo) & np.isinf(R_hi))
+        if at_right_angle.size:
+            residual, _ = self._flow_angle_residual(sections, hi[at_right_angle], idx[at_right_angle])
+            counter[idx[at_right_angle]] += 1
+            R_hi[at_right_angle] = np.where(residual > 0, residual, np.nan)
+        found = ~np.isnan(R_lo) & ~np.isnan(R_hi)
+        state["bracket_found"][idx[found]] = True
+
+        # regula falsi (Illinois) στα διαστήματα [lo, hi]
+        active = np.flatnonzero(found)
+        phi_prev = np.full(idx.size, np.nan)
+        side = np.zeros(idx.size, dtype=int)
+        for _ in range(sections["config"].max_iter):
+            if not active.size:
+                break
+            phi = (lo[active] * R_hi[active] - hi[active] * R_lo[active]) / (R_hi[active] - R_lo[active])
+            # αν η regula falsi δίνει ένα από τα άκρα, το άκρο αυτό είναι (αριθμητικά) η ρίζα
+            at_end = ~((phi > lo[active]) & (phi < hi[active]))
+            phi[at_end] = np.where(np.abs(R_lo[active]) <= np.abs(R_hi[active]), lo[active], hi[active])[at_end]
+            residual, evaluation = self._flow_angle_residual(sections, phi, idx[active])
+            store(idx[active], evaluation)
+
+            negative = residual <= 0
+            left, right = active[negative], active[~negative]
+            lo[left], R_lo[left] = phi[negative], residual[negative]
+            R_hi[left[side[left] == -1]] *= 0.5 # Illinois: μειώνουμε το βάρος του άκρου που δεν μετακινείται
+            side[left] = -1
+            hi[right], R_hi[right] = phi[~negative], residual[~negative]
+            R_lo[right[side[right] == 1]] *= 0.5
+            side[right] = 1
+
+            done = at_end | (residual == 0) | (np.abs(phi - phi_prev[active]) < flow_angle_tolerance) | (hi[active] - lo[active] < flow_angle_tolerance)
+            phi_prev[active] = phi
+            active = active[~done]
+
+        solved = idx[found]
+        state["a"][solved] = state["a_new"][solved]
+        state["a_p"][solved] = state["a_p_new"][solved]
+
+        # τα τμήματα χωρίς διάστημα εγκλωβισμού υπολογίζονται με την επαναληπτική διαδικασία
+        unbracketed = idx[~found]
+        if unbracketed.size:
+            bracket_evaluations = counter[unbracketed]
+            counter[unbracketed] = 0
+            self._fixed_point_iteration(sections, state, unbracketed, f)
+            counter[unbracketed] += bracket_evaluations
+
+    def calculation_of_dM_and_dT(self, wind_speed_V0, rotation_speed, r, chord, a, a_p, flow_angle_rad, Cn, Ct, dr):
+        """
+        μέθοδος για τον υπολογισμό της ροπής dM και της ώσης dT ενός τμήματος του πτερυγίου πλάτους dr
+        (για όλα τα πτερύγια του ρότορα). Δέχεται είτε αριθμούς είτε πίνακες NumPy.
+
+        Returns:
+             (float): η ροπή dM σε Nm και η ώση dT σε N
+        """
+        # Η εφαπτομενική συνιστώσα είναι αυτή που παράγει τη ροπή
+        dM = (
+            0.5 * self.air_density * self.B *
+            ((wind_speed_V0 * (1 - a) * rotation_speed * r * (1 + a_p)) /
+             (np.sin(flow_angle_rad) * np.cos(flow_angle_rad))) *
+            chord * Ct * r * dr
+        )
+        dT = ( 
+            0.5 * self.air_density * self.B * 
+        ((wind_speed_V0**2 * (1 - a)**2) / (np.sin(flow_angle_rad)**2)) * chord * Cn * dr 
+        )
+        return dM, dT
+
+    def DTU_blade_calculation(self, wind_speed_V0, rotation_speed, vectorized=False, solver='fixed_point', columnar=False, config=None):
+        """
+        υπολογισμός όλων των τμημάτων του πτερυγίου και της συνολικής ισχύος, ροπής και ώσης του ρότορα
+
+        Args:
+            wind_speed_V0 (float): η ταχύτητα του ανέμου σε m/sec
+            rotation_speed (float): η ταχύτητα περιστροφής του ρότορα σε rad/sec
+            vectorized (bool, optional): αν True, όλα τα τμήματα επιλύονται ταυτόχρονα
+                με τη sections_calculation. Defaults to False.
+            solver (str, optional): 'fixed_point' ή 'bracketed' (βλ. sections_calculation). Defaults to 'fixed_point'.
+            columnar (bool, optional): αν True, τα αποτελέσματα των τμημάτων επιστρέφονται ως BEMResults
+                (μία στήλη ανά μέγεθος) αντί για λίστα λεξικών. Defaults to False.
+            config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας. Defaults to None (δηλ. self.config).
+
+        Returns:
+            (tuple): τα αποτελέσματα των τμημάτων, η συνολική ισχύς, ροπή και ώση του ρότορα
+        """
+        if vectorized:
+            results, total_power, total_torque, total_thrust = self._DTU_blade_calculation_vectorized(
+                wind_speed_V0, rotation_speed, solver=solver, config=config)
+            return (results if columnar else results.to_records()), total_power, total_torque, total_thrust
         results_list_for_DTU_airfoil = [] # η λίστα που θα αποθηκεύει τα αποτελέσματα για το κάθε τμήμα του πτερυγίου
         total_power = 0 # αρχικά η συνολική ισχύς είναι 0
         total_torque = 0 # αρχικά η συνολική ροπή είναι 0
@@ -307,23 +870,15 @@ class Hansen_Algorithm:
                 results_for_DTU_airfoil = self.segment_calculation(
                     wind_speed_V0=wind_speed_V0, 
                     omega_rad_sec=rotation_speed,
-                    r=r, chord=chord, pitch_angle_deg=pitch_angle, twist_deg=twist, tc_ratio=tc_ratio)
-                # Η εφαπτομενική συνιστώσα είναι αυτή που παράγει τη ροπή
+                    r=r, chord=chord, pitch_angle_deg=pitch_angle, twist_deg=twist, tc_ratio=tc_ratio, solver=solver, config=config)
                 dr = (self.r_is[i+1] - self.r_is[i]) if i < self.no_sections - 1 else (self.R - r)
                 flow_angle_rad, a, a_p = results_for_DTU_airfoil["flow_angle (rads)"], results_for_DTU_airfoil["a"], results_for_DTU_airfoil["a_p"]
                 Cn = results_for_DTU_airfoil["Cn"]
                 Ct = results_for_DTU_airfoil["Ct"]
 
-                dM = (
-                    0.5 * self.air_density * self.B *
-                    ((wind_speed_V0 * (1 - a) * rotation_speed * r * (1 + a_p)) /
-                     (np.sin(flow_angle_rad) * np.cos(flow_angle_rad))) *
-                    chord * Ct * r * dr
-                )
-                dT = ( 
-                    0.5 * self.air_density * self.B * 
-                ((wind_speed_V0**2 * (1 - a)**2) / (np.sin(flow_angle_rad)**2)) * chord * Cn * dr 
-                )
+                dM, dT = self.calculation_of_dM_and_dT(
+                    wind_speed_V0=wind_speed_V0, rotation_speed=rotation_speed, r=r, chord=chord,
+                    a=a, a_p=a_p, flow_angle_rad=flow_angle_rad, Cn=Cn, Ct=Ct, dr=dr)
                 power = rotation_speed * dM
                 total_power += power # Συνολική ισχύς όλου του ρότορα 
                 total_torque += dM # Συνολική ροπή του ρότορα
@@ -335,8 +890,384 @@ class Hansen_Algorithm:
                 results_list_for_DTU_airfoil.append(results_for_DTU_airfoil)
             except Exception as e:
                 print(f"Section {i} at radius {r}: {e}")
+        if columnar:
+            totals = {"power": total_power, "torque": total_torque, "thrust": total_thrust}
+            return BEMResults.from_records(results_list_for_DTU_airfoil, totals), total_power, total_torque, total_thrust
         return results_list_for_DTU_airfoil, total_power, total_torque, total_thrust
+
+    def _DTU_blade_calculation_vectorized(self, wind_speed_V0, rotation_speed, solver='fixed_point', config=None):
+        """ η DTU_blade_calculation με ταυτόχρονη επίλυση όλων των τμημάτων (βλ. sections_calculation), με αποτελέσματα BEMResults """
+        res = self.sections_calculation(
+            wind_speed_V0=wind_speed_V0, omega_rad_sec=rotation_speed,
+            r=self.r_is, chord=self.chords, pitch_angle_deg=self.pitch, twist_deg=0, tc_ratio=self.tc_ratios,
+            section_index=np.arange(self.no_sections), solver=solver, config=config)
+        dr = np.append(np.diff(self.r_is), self.R - self.r_is[-1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dM, dT = self.calculation_of_dM_and_dT(
+                wind_speed_V0=wind_speed_V0, rotation_speed=rotation_speed, r=self.r_is, chord=self.chords,
+                a=res["a"], a_p=res["a_p"], flow_angle_rad=res["flow_angle (rads)"], Cn=res["Cn"], Ct=res["Ct"], dr=dr)
+        power = rotation_speed * dM
+        failed = res.pop("failed")
+        for i in np.flatnonzero(failed):
+            print(f"Section {i} at radius {self.r_is[i]}: Διαίρεση με το 0")
+
+        columns = {key: value[~failed] for key, value in res.items()}
+        columns["t/c ratio"] = self.tc_ratios[~failed]
+        columns["dT (Ν)"] = dT[~failed] / 3 # Διαιρώ δια 3 καθώς η συγκεκριμένη τιμή αφορά και τα τρία πτερύγια
+        columns["dM (Nm)"] = dM[~failed] / 3
+        columns["Power (Watt)"] = power[~failed] / 3
+        total_power = np.sum(power[~failed]) # Συνολική ισχύς όλου του ρότορα 
+        total_torque = np.sum(dM[~failed]) # Συνολική ροπή του ρότορα
+        total_thrust = np.sum(dT[~failed]) # Συνολική ώση του ρότορα
+        results = BEMResults(columns, {"power": total_power, "torque": total_torque, "thrust": total_thrust})
+        return results, total_power, total_torque, total_thrust
     
+    def operating_grid(self, wind_speeds_V0, rotation_speeds, pitch_offsets_deg=None, per_section=False, solver='fixed_point',
+                       warm_start=False, sweep_axis='rotation_speed', compare_cold_start=False, result_cache=None, config=None):
+        """
+        υπολογισμός του ρότορα σε όλο το καρτεσιανό πλέγμα σημείων λειτουργίας
+        (ταχύτητα ανέμου x ταχύτητα περιστροφής x συλλογική γωνία βήματος) με μία κλήση της sections_calculation.
+        Με warm_start=True το πλέγμα υπολογίζεται διαδοχικά κατά μήκος του άξονα sweep_axis και κάθε σημείο
+        ξεκινά από τους συντελεστές επαγωγής του προηγούμενου (βλ. _continuation_solve).
+
+        Args:
+            wind_speeds_V0 (array_like): οι ταχύτητες του ανέμου σε m/sec
+            rotation_speeds (array_like): οι ταχύτητες περιστροφής του ρότορα σε rad/sec
+            pitch_offsets_deg (array_like, optional): συλλογικές μεταβολές της γωνίας βήματος σε μοίρες,
+                που προστίθενται στη γωνία βήματος κάθε τμήματος. Defaults to None (δηλ. [0]).
+            per_section (bool, optional): αν True επιστρέφονται και τα μεγέθη κάθε τμήματος. Defaults to False.
+            solver (str, optional): 'fixed_point' ή 'bracketed' (βλ. sections_calculation). Defaults to 'fixed_point'.
+            warm_start (bool, optional): συνεχής μετάβαση (continuation) κατά μήκος του sweep_axis. Defaults to False.
+            sweep_axis (str, optional): 'wind_speed', 'rotation_speed' ή 'pitch'. Defaults to 'rotation_speed'.
+            compare_cold_start (bool, optional): αν True (μαζί με warm_start) υπολογίζεται και το πλέγμα χωρίς
+                αρχικές τιμές, ώστε να αναφερθούν οι επαναλήψεις που εξοικονομήθηκαν. Defaults to False.
+            result_cache (RotorResultCache, optional): μόνιμη μνήμη αποτελεσμάτων: τα σημεία λειτουργίας που υπάρχουν
+                ήδη σε αυτή διαβάζονται από τον δίσκο και υπολογίζονται (και αποθηκεύονται) μόνο όσα λείπουν.
+                Δεν χρησιμοποιείται με warm_start. Defaults to None.
+            config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας. Defaults to None (δηλ. self.config).
+
+        Returns:
+            (dict): πίνακες "power", "torque", "thrust", "Cp", "CT" με δείκτες [V0, ω, pitch], το συνολικό πλήθος
+            επαναλήψεων "iterations" και, αν per_section=True, λεξικό "sections" με πίνακες με δείκτες [V0, ω, pitch, section]
+            (βλ. και BEMResults.from_operating_grid).
+            Με warm_start δίνεται και το πλήθος των τμημάτων που ξαναϋπολογίστηκαν από την αρχή ("cold_restarts") και,
+            με compare_cold_start, οι επαναλήψεις χωρίς αρχικές τιμές ("iterations_cold") και η διαφορά ("iterations_saved").
+            Με result_cache δίνεται και το πλήθος των σημείων που διαβάστηκαν από αυτή ("cached_points").
+        """
+        config = self._get_config(config)
+        V0 = np.atleast_1d(np.asarray(wind_speeds_V0, dtype=float))
+        w_rps = np.atleast_1d(np.asarray(rotation_speeds, dtype=float))
+        pitch_offsets = np.atleast_1d(np.asarray(0.0 if pitch_offsets_deg is None else pitch_offsets_deg, dtype=float))
+        V0_4d = V0[:, None, None, None]
+        w_4d = w_rps[None, :, None, None]
+
+        pitch_4d = self.pitch + pitch_offsets[None, None, :, None]
+
+        cold_restarts = None
+        if warm_start:
+            if solver != 'fixed_point':
+                raise ValueError("Η συνεχής μετάβαση (warm_start) υποστηρίζεται μόνο με solver='fixed_point'")
+            res, cold_restarts = self._continuation_solve(V0_4d, w_4d, pitch_4d, sweep_axis, config)
+        elif result_cache is not None:
+            res, cached_points = self._cached_grid_solve(result_cache, V0, w_rps, pitch_offsets, solver, config)
+        else:
+            res = self.sections_calculation(
+                wind_speed_V0=V0_4d, omega_rad_sec=w_4d,
+                r=self.r_is, chord=self.chords, pitch_angle_deg=pitch_4d,
+                twist_deg=0, tc_ratio=self.tc_ratios, section_index=np.arange(self.no_sections), solver=solver, config=config)
+        grid = self._grid_from_sections(V0, w_rps, pitch_offsets, res)
+        if result_cache is not None and not warm_start:
+            grid["cached_points"] = cached_points
+        if warm_start:
+            grid["cold_restarts"] = cold_restarts
+            if compare_cold_start:
+                cold = self.sections_calculation(
+                    wind_speed_V0=V0_4d, omega_rad_sec=w_4d,
+                    r=self.r_is, chord=self.chords, pitch_angle_deg=pitch_4d,
+                    twist_deg=0, tc_ratio=self.tc_ratios, section_index=np.arange(self.no_sections), config=config)
+                grid["iterations_cold"] = int(cold["counter"].sum())
+                grid["iterations_saved"] = grid["iterations_cold"] - grid["iterations"]
+        if not per_section:
+            del grid["sections"]
+        return grid
+
+    def _grid_from_sections(self, V0, w_rps, pitch_offsets, res):
+        """ 
+        τα συνολικά μεγέθη της operating_grid από τα μεγέθη των τμημάτων res (πίνακες με δείκτες [V0, ω, pitch, section]),
+        βλ. _totals_from_sections
+        """
+        grid = {"wind_speed_V0": V0, "rotation_speed": w_rps, "pitch_offset": pitch_offsets}
+        grid.update(self._totals_from_sections(V0[:, None, None, None], w_rps[None, :, None, None], res))
+        return grid
+
+    def _totals_from_sections(self, V0, w_rps, res):
+        """ 
+        η συνολική ισχύς, ροπή και ώση και οι Cp, CT από τα μεγέθη των τμημάτων res (πίνακες με τελευταίο δείκτη το τμήμα),
+        για ταχύτητες ανέμου V0 και περιστροφής w_rps με σχήμα που συμφωνεί με τα res (με 1 στη διάσταση των τμημάτων).
+        Στο res προστίθενται τα "dT (Ν)", "dM (Nm)" και "Power (Watt)" και επιστρέφεται ως "sections".
+        """
+        dr = np.append(np.diff(self.r_is), self.R - self.r_is[-1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dM, dT = self.calculation_of_dM_and_dT(
+                wind_speed_V0=V0, rotation_speed=w_rps, r=self.r_is, chord=self.chords,
+                a=res["a"], a_p=res["a_p"], flow_angle_rad=res["flow_angle (rads)"], Cn=res["Cn"], Ct=res["Ct"], dr=dr)
+            # τα τμήματα που απέτυχαν δεν συνεισφέρουν στα συνολικά μεγέθη (όπως στην DTU_blade_calculation)
+            dM = np.where(res["failed"], 0.0, dM)
+            dT = np.where(res["failed"], 0.0, dT)
+            total_torque = dM.sum(axis=-1)
+            total_thrust = dT.sum(axis=-1)
+            total_power = w_rps[..., 0] * total_torque
+            totals = {
+                "power": total_power,
+                "torque": total_torque,
+                "thrust": total_thrust,
+                "Cp": self.calculation_of_coefficient_of_power_cp_for_DTU(total_power, V0[..., 0]),
+                "CT": self.calculation_of_coefficient_of_thrust_CT_for_DTU(total_thrust, V0[..., 0]),
+                "iterations": int(res["counter"].sum()),
+            }
+        res["dT (Ν)"] = dT / 3 # τιμές ανά πτερύγιο, όπως στην DTU_blade_calculation
+        res["dM (Nm)"] = dM / 3
+        res["Power (Watt)"] = w_rps * dM / 3
+        totals["sections"] = res
+        return totals
+
+    def operating_points(self, wind_speeds_V0, rotation_speeds, pitch_offsets_deg=0.0, per_section=False, solver='fixed_point',
+                         config=None):
+        """
+        υπολογισμός του ρότορα σε μεμονωμένα σημεία λειτουργίας (V0[i], ω[i], pitch[i]) με μία κλήση της sections_calculation,
+        π.χ. για σημεία που δεν σχηματίζουν καρτεσιανό πλέγμα (βλ. operating_grid)
+
+        Args:
+            wind_speeds_V0 (array_like): οι ταχύτητες του ανέμου σε m/sec
+            rotation_speeds (array_like): οι ταχύτητες περιστροφής του ρότορα σε rad/sec
+            pitch_offsets_deg (array_like, optional): οι συλλογικές μεταβολές της γωνίας βήματος σε μοίρες. Defaults to 0.
+            per_section (bool, optional): αν True επιστρέφονται και τα μεγέθη κάθε τμήματος. Defaults to False.
+            solver (str, optional): 'fixed_point' ή 'bracketed' (βλ. sections_calculation). Defaults to 'fixed_point'.
+            config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας. Defaults to None (δηλ. self.config).
+
+        Returns:
+            (dict): μονοδιάστατοι πίνακες (ένα στοιχείο ανά σημείο, μετά το broadcasting των ορισμάτων) "wind_speed_V0",
+            "rotation_speed", "pitch_offset", "power", "torque", "thrust", "Cp", "CT", το πλήθος επαναλήψεων "iterations" και,
+            αν per_section=True, λεξικό "sections" με πίνακες με δείκτες [σημείο, section]
+        """
+        V0, w_rps, pitch_offsets = (np.ravel(x) for x in np.broadcast_arrays(
+            *[np.asarray(x, dtype=float) for x in (wind_speeds_V0, rotation_speeds, pitch_offsets_deg)]))
+        res = self.sections_calculation(
+            wind_speed_V0=V0[:, None], omega_rad_sec=w_rps[:, None],
+            r=self.r_is, chord=self.chords, pitch_angle_deg=self.pitch + pitch_offsets[:, None],
+            twist_deg=0, tc_ratio=self.tc_ratios, section_index=np.arange(self.no_sections), solver=solver, config=config)
+        points = {"wind_speed_V0": V0, "rotation_speed": w_rps, "pitch_offset": pitch_offsets}
+        points.update(self._totals_from_sections(V0[:, None], w_rps[:, None], res))
+        if not per_section:
+            del points["sections"]
+        return points
+
+    def _cached_grid_solve(self, result_cache, V0, w_rps, pitch_offsets, solver, config):
+        """
+        υπολογισμός του πλέγματος της operating_grid με τη μόνιμη μνήμη result_cache: τα σημεία λειτουργίας που λείπουν
+        υπολογίζονται μαζί με μία κλήση της sections_calculation και αποθηκεύονται
+
+        Returns:
+            (tuple): το λεξικό της sections_calculation για όλο το πλέγμα και το πλήθος των σημείων που διαβάστηκαν από τη μνήμη
+        """
+        grid_shape = (V0.size, w_rps.size, pitch_offsets.size)
+        if 0 in grid_shape: # κενό πλέγμα: δεν υπάρχει τίποτα για τη μνήμη, οι (κενοί) πίνακες προκύπτουν όπως χωρίς αυτήν
+            res = self.sections_calculation(
+                wind_speed_V0=V0[:, None, None, None], omega_rad_sec=w_rps[None, :, None, None],
+                r=self.r_is, chord=self.chords, pitch_angle_deg=self.pitch + pitch_offsets[None, None, :, None],
+                twist_deg=0, tc_ratio=self.tc_ratios, section_index=np.arange(self.no_sections), solver=solver, config=config)
+            return res, 0
+        rotor_key = self.result_cache_key(solver, config=config)
+        points = np.stack(np.meshgrid(V0, w_rps, pitch_offsets, indexing='ij'), axis=-1).reshape(-1, 3)
+        cached = result_cache.get_many(rotor_key, points)
+        missing = np.array([columns is None for columns in cached], dtype=bool)
+        if missing.any():
+            solved = self.sections_calculation(
+                wind_speed_V0=points[missing, 0, None], omega_rad_sec=points[missing, 1, None],
+                r=self.r_is, chord=self.chords, pitch_angle_deg=self.pitch + points[missing, 2, None],
+                twist_deg=0, tc_ratio=self.tc_ratios, section_index=np.arange(self.no_sections), solver=solver, config=config)
+            result_cache.put_many(rotor_key, points[missing], [{key: value[j] for key, value in solved.items()}
+                                                               for j in range(int(missing.sum()))])
+            for index, j in zip(np.flatnonzero(missing), range(int(missing.sum()))):
+                cached[index] = {key: value[j] for key, value in solved.items()}
+        res = {key: np.stack([columns[key] for columns in cached]).reshape(grid_shape + (self.no_sections,)) for key in cached[0]}
+        return res, int((~missing).sum())
+
+    def _continuation_solve(self, V0_4d, w_4d, pitch_4d, sweep_axis, config):
+        """
+        υπολογισμός του πλέγματος της operating_grid με συνεχή μετάβαση κατά μήκος του άξονα sweep_axis:
+        τα σημεία κάθε βήματος υπολογίζονται μαζί και κάθε τμήμα ξεκινά από τους συντελεστές επαγωγής
+        a, a' του ίδιου τμήματος στο προηγούμενο σημείο, εφόσον εκεί υπήρξε σύγκλιση σε λύση με a < 1. Όσα τμήματα δεν
+        συγκλίνουν με αυτές τις αρχικές τιμές ξαναϋπολογίζονται ξεκινώντας από a = a' = 0.
+
+        Returns:
+            (tuple): το λεξικό της sections_calculation για όλο το πλέγμα και το πλήθος των τμημάτων που ξαναϋπολογίστηκαν
+        """
+        axis = {'wind_speed': 0, 'rotation_speed': 1, 'pitch': 2}[sweep_axis]
+        section_index = np.arange(self.no_sections)
+        v0, w_rps, pitch, r, chord, tc_ratio, section_index = np.broadcast_arrays(
+            V0_4d, w_4d, pitch_4d, self.r_is, self.chords, self.tc_ratios, section_index)
+        res = None
+        a_seed = a_p_seed = None
+        cold_restarts = 0
+        for k in range(v0.shape[axis]):
+            step_slice = (slice(None),) * axis + (k,)
+            inputs = [x[step_slice] for x in (v0, w_rps, r, chord, pitch, tc_ratio, section_index)]
+            step = self.sections_calculation(*inputs[:5], twist_deg=0, tc_ratio=inputs[5], section_index=inputs[6],
+                                             a_init=a_seed, a_p_init=a_p_seed, config=config)
+            if a_seed is not None:
+                diverged = step["failed"] | (step["counter"] > config.max_iter) | ~np.isfinite(step["a"])
+                if diverged.any():
+                    cold_restarts += int(diverged.sum())
+                    cold = self.sections_calculation(*[x[diverged] for x in inputs[:5]], twist_deg=0,
+                                                     tc_ratio=inputs[5][diverged], section_index=inputs[6][diverged], config=config)
+                    counter = step["counter"][diverged] + cold["counter"]
+                    for key, value in cold.items():
+                        step[key][diverged] = value
+                    step["counter"][diverged] = counter
+            # για a -> 1 η αξονική ταχύτητα μηδενίζεται (φ = 0) και η επαναληπτική διαδικασία "κολλάει" εκεί,
+            # γι' αυτό τέτοιες λύσεις δεν χρησιμοποιούνται ως αρχικές τιμές στο επόμενο σημείο
+            converged = ~step["failed"] & (step["counter"] <= config.max_iter) & (step["a"] < 1 - config.tolerance)
+            a_seed = np.where(converged, step["a"], 0.0)
+            a_p_seed = np.where(converged, step["a_p"], 0.0)
+
+            if res is None:
+                res = {key: np.empty(v0.shape, dtype=value.dtype) for key, value in step.items()}
+            for key, value in step.items():
+                res[key][step_slice] = value
+        return res, cold_restarts
+
+    # μεγέθη των τμημάτων που (χωρίς την επίδραση του Re) είναι ανάλογα του V0² για σταθερό λόγο ταχύτητας ακροπτερυγίου λ
+    _tsr_scaled_keys = ("Lift (N/m)", "Drag (N/m)", "pn (N/m)", "pt (N/m)", "dT (Ν)", "dM (Nm)")
+
+    def tip_speed_ratio_curve(self, tip_speed_ratios, pitch_offsets_deg=None, per_section=False, solver='fixed_point', config=None):
+        """
+        υπολογισμός των αδιάστατων συντελεστών του ρότορα ως προς το λόγο ταχύτητας ακροπτερυγίου λ = ωR/V0.
+        Χωρίς την επίδραση του αριθμού Reynolds, οι συντελεστές επαγωγής κάθε τμήματος εξαρτώνται μόνο από το λr = ωr/V0
+        και τη γωνία βήματος, επομένως οι Cp, CT και CQ = M / (0.5 ρ A R V0²) εξαρτώνται μόνο από τα λ και pitch.
+        Ο υπολογισμός γίνεται με την operating_grid για V0 = 1 m/sec.
+
+        Raises:
+            ValueError: αν η αεροτομή έχει πίνακες για πολλούς αριθμούς Reynolds
+
+        Returns:
+            (dict): πίνακες "Cp", "CT", "CQ" με δείκτες [λ, pitch] και, αν per_section=True, λεξικό "sections"
+            με πίνακες [λ, pitch, section] (τα φορτία για V0 = 1 m/sec)
+        """
+        if self.uses_reynolds:
+            raise ValueError("Με πίνακες για πολλούς αριθμούς Reynolds οι λύσεις δεν εξαρτώνται μόνο από το λ")
+        tip_speed_ratios = np.atleast_1d(np.asarray(tip_speed_ratios, dtype=float))
+        grid = self.operating_grid(1.0, tip_speed_ratios / self.R, pitch_offsets_deg, per_section=per_section, solver=solver,
+                                   config=config)
+        dynamic_force = 0.5 * self.air_density * np.pi * self.R**2 # για V0 = 1 m/sec
+        curve = {
+            "tip_speed_ratio": tip_speed_ratios,
+            "pitch_offset": grid["pitch_offset"],
+            "Cp": grid["Cp"][0],
+            "CT": grid["CT"][0],
+            "CQ": grid["torque"][0] / (dynamic_force * self.R),
+            "iterations": grid["iterations"],
+        }
+        if per_section:
+            curve["sections"] = {key: value[0] for key, value in grid["sections"].items()}
+        return curve
+
+    def operating_grid_tsr(self, wind_speeds_V0, rotation_speeds, pitch_offsets_deg=None, tsr_points=101, per_section=False,
+                           solver='fixed_point', config=None):
+        """
+        η operating_grid με έναν μονοδιάστατο υπολογισμό ως προς το λ: οι συντελεστές CQ, CT (βλ. tip_speed_ratio_curve)
+        υπολογίζονται σε tsr_points ομοιόμορφα κατανεμημένα λ από το ελάχιστο ως το μέγιστο λ = ωR/V0 του πλέγματος και
+        παρεμβάλλονται γραμμικά στο λ κάθε σημείου λειτουργίας. Η ροπή και η ώση προκύπτουν πολλαπλασιάζοντας με
+        0.5 ρ A V0² (και R) και η ισχύς ως ω * ροπή. Τα μεγέθη των τμημάτων παρεμβάλλονται με τον ίδιο τρόπο
+        (τα φορτία πολλαπλασιάζονται με V0²), εκτός από το "counter".
+        Για την εκτίμηση του σφάλματος της παρεμβολής οι συντελεστές υπολογίζονται και στα μέσα των διαστημάτων του λ:
+        η μέγιστη διαφορά από τη γραμμική παρεμβολή εκεί είναι (για ομαλές καμπύλες) το μέγιστο σφάλμα της παρεμβολής.
+
+        Args:
+            wind_speeds_V0 (array_like): οι ταχύτητες του ανέμου σε m/sec (θετικές)
+            rotation_speeds (array_like): οι ταχύτητες περιστροφής του ρότορα σε rad/sec
+            pitch_offsets_deg (array_like, optional): συλλογικές μεταβολές της γωνίας βήματος σε μοίρες. Defaults to None (δηλ. [0]).
+            tsr_points (int, optional): το πλήθος των λ στα οποία επιλύεται ο ρότορας (τουλάχιστον 3 για να έχει νόημα το
+                "power_error_bound"). Defaults to 101.
+            per_section (bool, optional): αν True επιστρέφονται και τα μεγέθη κάθε τμήματος. Defaults to False.
+            solver (str, optional): 'fixed_point' ή 'bracketed'. Defaults to 'fixed_point'.
+            config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας. Defaults to None (δηλ. self.config).
+
+        Returns:
+            (dict): όπως η operating_grid, με επιπλέον τους πίνακες "tip_speed_ratio" [V0, ω] και "tsr_grid", το πλήθος των
+            λύσεων του ρότορα "rotor_evaluations", την εκτίμηση του σφάλματος "interpolation_error" ({"Cp", "CT", "CQ"})
+            και το αντίστοιχο σφάλμα ισχύος σε Watt "power_error_bound" [V0] (το μέγιστο, για τα ω του πλέγματος,
+            του λ επί το άνω φράγμα του σφάλματος του CQ στο διάστημα του λ, αφού η ισχύς προκύπτει από τον CQ)
+        """
+        V0 = np.atleast_1d(np.asarray(wind_speeds_V0, dtype=float))
+        w_rps = np.atleast_1d(np.asarray(rotation_speeds, dtype=float))
+        if np.any(V0 <= 0):
+            raise ValueError("Οι ταχύτητες του ανέμου πρέπει να είναι θετικές")
+        tip_speed_ratio = w_rps[None, :] * self.R / V0[:, None]
+        tsr_grid = np.linspace(tip_speed_ratio.min(), tip_speed_ratio.max(), max(int(tsr_points), 2))
+        curve = self.tip_speed_ratio_curve(tsr_grid, pitch_offsets_deg, per_section=per_section, solver=solver, config=config)
+        midpoints = self.tip_speed_ratio_curve((tsr_grid[1:] + tsr_grid[:-1]) / 2, pitch_offsets_deg, solver=solver, config=config)
+        midpoint_errors = {key: np.abs(midpoints[key] - (curve[key][1:] + curve[key][:-1]) / 2) for key in ("Cp", "CT", "CQ")}
+        interpolation_error = {key: float(np.nanmax(errors, initial=0.0)) for key, errors in midpoint_errors.items()}
+
+        # δείκτες και βάρη της γραμμικής παρεμβολής στο ομοιόμορφο πλέγμα του λ, με δείκτες [V0, ω, pitch]
+        step = tsr_grid[1] - tsr_grid[0]
+        position = (tip_speed_ratio - tsr_grid[0]) / step if step > 0 else np.zeros_like(tip_speed_ratio)
+        i = np.clip(np.floor(position).astype(int), 0, tsr_grid.size - 2)[..., None]
+        weight = (position[..., None] - i)
+
+        pitch_index = np.arange(curve["pitch_offset"].size)
+
+        def interpolate(values):
+            w = weight.reshape(weight.shape + (1,) * (values.ndim - 2)) # π.χ. για τη διάσταση των τμημάτων
+            return values[i, pitch_index] * (1 - w) + values[i + 1, pitch_index] * w
+
+        dynamic_force = 0.5 * self.air_density * np.pi * self.R**2 * V0[:, None, None]**2
+        torque = interpolate(curve["CQ"]) * dynamic_force * self.R
+        # η ισχύς είναι λ CQ 0.5 ρ A V0³: το σφάλμα της είναι λ επί το σφάλμα του CQ στο διάστημα του λ κάθε σημείου.
+        # Το σφάλμα της γραμμικής παρεμβολής είναι το πολύ h²/8 max|CQ''| = Δ²/2, όπου Δ² η δεύτερη διαφορά του CQ στα
+        # λ του πλέγματος μαζί με τα μέσα (βήμα h/2). Παίρνουμε το Δ² (και όχι το μισό του) στο διάστημα και στα γειτονικά
+        # του, ώστε η εκτίμηση να καλύπτει και τις γωνίες και τα άλματα της καμπύλης (π.χ. αλλαγή κλάδου της λύσης).
+        samples = np.empty((2 * tsr_grid.size - 1,) + curve["CQ"].shape[1:])
+        samples[::2], samples[1::2] = curve["CQ"], midpoints["CQ"]
+        second_differences = np.nan_to_num(np.abs(samples[2:] - 2 * samples[1:-1] + samples[:-2])).max(axis=1)
+        padded = np.pad(second_differences, 2) # δείκτης s + 1 για το δείγμα s, μηδέν στα άκρα
+        cq_error = np.lib.stride_tricks.sliding_window_view(padded, 5)[::2].max(axis=1) # δείγματα 2j-1 ... 2j+3
+        power_error = tip_speed_ratio * cq_error[i[..., 0]] * dynamic_force[..., 0] * V0[:, None]
+        thrust = interpolate(curve["CT"]) * dynamic_force
+        power = w_rps[None, :, None] * torque
+        grid = {
+            "wind_speed_V0": V0,
+            "rotation_speed": w_rps,
+            "pitch_offset": curve["pitch_offset"],
+            "power": power,
+            "torque": torque,
+            "thrust": thrust,
+            "Cp": self.calculation_of_coefficient_of_power_cp_for_DTU(power, V0[:, None, None]),
+            "CT": self.calculation_of_coefficient_of_thrust_CT_for_DTU(thrust, V0[:, None, None]),
+            "iterations": curve["iterations"] + midpoints["iterations"],
+            "tip_speed_ratio": tip_speed_ratio,
+            "tsr_grid": tsr_grid,
+            "rotor_evaluations": (2 * tsr_grid.size - 1) * curve["pitch_offset"].size,
+            "interpolation_error": interpolation_error,
+            "power_error_bound": power_error.max(axis=1),
+        }
+        if per_section:
+            sections = {}
+            V0_squared = V0[:, None, None, None]**2
+            for key, values in curve["sections"].items():
+                if key == "counter":
+                    continue
+                if values.dtype == bool: # π.χ. "failed": αν απέτυχε κάποιο από τα δύο γειτονικά λ
+                    sections[key] = values[i, pitch_index] | values[i + 1, pitch_index]
+                    continue
+                sections[key] = interpolate(values)
+                if key in self._tsr_scaled_keys:
+                    sections[key] = sections[key] * V0_squared
+            sections["Power (Watt)"] = w_rps[None, :, None, None] * sections["dM (Nm)"]
+            grid["sections"] = sections
+        return grid
+
     def calculation_of_coefficient_of_power_cp_for_DTU(self, total_power, wind_speed_V0):
         swept_area = np.pi * self.R**2 # επιφάνεια σάρωσης
         wind_power = 0.5 * self.air_density * swept_area * wind_speed_V0**3
@@ -354,6 +1285,7 @@ class Hansen_Algorithm:
 #     # print(f"Συνολική Ισχύς της Ανεμογεννήτριας: {3*total_power:.2f} Watt")
 #%%
 if __name__ == "__main__":
+    import pandas as pd
     blade_geom_DTU = "blade_geom_DTU.json"
     hansen = Hansen_Algorithm(
         blade_geom_DTU=blade_geom_DTU,
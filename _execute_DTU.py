@@ -30,36 +30,39 @@
 
 # _execute_DTU_10_sections.py
 # -------------------------------------------------
+import argparse
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from _algorithmos_DTU import Hansen_Algorithm
+from solve_cache import SectionSolveCache
+from rotor_cache import DEFAULT_CACHE_DIR, RotorResultCache
+from aep import optimal_power_curve
 
 #%%
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Διαγράμματα Cp - λ και ισχύος - rpm για τη γεωμετρία DTU")
+    parser.add_argument("--no-cache", action="store_true", help="υπολογισμός όλων των σημείων χωρίς τη μόνιμη μνήμη αποτελεσμάτων")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="ο φάκελος της μόνιμης μνήμης αποτελεσμάτων")
+    parser.add_argument("--tsr-points", type=int, default=0,
+                        help="υπολογισμός του διαγράμματος ισχύος - rpm με παρεμβολή σε τόσα λ (0: επίλυση κάθε σημείου)")
+    args, _ = parser.parse_known_args() # (αγνοούνται τα ορίσματα του IPython όταν εκτελείται ανά κελί)
+    result_cache = None if args.no_cache else RotorResultCache(args.cache_dir)
+
     blade_geom_file = "blade_geom_DTU.json"
     hansen_DTU = Hansen_Algorithm(
         blade_geom_DTU=blade_geom_file,
         B=3,
         air_density=1.225,
-        csv_data_file="csv_data_file_DTU.csv"
+        csv_data_file="csv_data_file_DTU.csv",
+        solve_cache=SectionSolveCache() # τα τμήματα που επαναλαμβάνονται στα διαγράμματα επιλύονται μία φορά
     )
 
     # ΔΙΑΓΡΑΜΜΑ Power Coefficient Cp - Tip Speed Ratio λ for DTU geometry
     wind_speed_V0 = 10                 
     rotation_speed_values = np.linspace(0, 1.3, 50) 
-    lamda_values, cp_values = [], []
-
-    for w_rps in rotation_speed_values:
-        lamda = w_rps * hansen_DTU.R / wind_speed_V0
-        lamda_values.append(lamda)
-
-        results_list_for_DTU_geometry, total_power, total_torque, total_thrust = hansen_DTU.DTU_blade_calculation(
-            wind_speed_V0=wind_speed_V0,
-            rotation_speed=w_rps
-        )
-        cp = hansen_DTU.calculation_of_coefficient_of_power_cp_for_DTU(total_power, wind_speed_V0)
-        cp_values.append(cp)
+    lamda_values = rotation_speed_values * hansen_DTU.R / wind_speed_V0
+    cp_values = hansen_DTU.operating_grid(wind_speed_V0, rotation_speed_values, result_cache=result_cache)["Cp"][0, :, 0]
 
     plt.figure(figsize=(10, 8))
     plt.plot(lamda_values, cp_values, 'o-', label="$C_p$ vs $λ$")
@@ -74,15 +77,18 @@ if __name__ == "__main__":
     rpm_values = np.linspace(0, 25, 50) # τιμές rpm
     wind_speed_values = [5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18] # τιμές ταχύτητας ανέμου
 
-    plt.figure(figsize=(10, 6))
-    for V0 in wind_speed_values:
-        power_values = []
-        for n_rpm in rpm_values:
-            w_rps = 2 * np.pi * n_rpm / 60 # Γωνιακή ταχύτητα σε rad/s
-            hansen_DTU.rotation_speed = w_rps 
-            results_for_DTU_geometry, total_power, total_torque, total_thrust = hansen_DTU.DTU_blade_calculation(wind_speed_V0=V0, rotation_speed=w_rps)
-            power_values.append(total_power * 1e-3) # ισχύς σε kW
+    w_rps_values = 2 * np.pi * rpm_values / 60 # Γωνιακή ταχύτητα σε rad/s
+    if args.tsr_points:
+        tsr_grid = hansen_DTU.operating_grid_tsr(wind_speed_values, w_rps_values, tsr_points=args.tsr_points)
+        power_grid = tsr_grid["power"][:, :, 0]
+        print(f"{tsr_grid['rotor_evaluations']} επιλύσεις του ρότορα αντί για {power_grid.size}, "
+              f"μέγιστο σφάλμα Cp λόγω παρεμβολής ≈ {tsr_grid['interpolation_error']['Cp']:.2e}")
+    else:
+        power_grid = hansen_DTU.operating_grid(wind_speed_values, w_rps_values, result_cache=result_cache)["power"][:, :, 0]
 
+    plt.figure(figsize=(10, 6))
+    for i, V0 in enumerate(wind_speed_values):
+        power_values = power_grid[i] * 1e-3 # ισχύς σε kW
         plt.plot(rpm_values, power_values, "o-", label=f"{V0} m/s")
 
     plt.xlabel("Rotational Speed (RPM)", fontsize=12)
@@ -92,12 +98,31 @@ if __name__ == "__main__":
     plt.grid(True)
     plt.show()
 
-    df_DTU_results = pd.DataFrame(results_list_for_DTU_geometry)
+    # ΚΑΜΠΥΛΗ ΙΣΧΥΟΣ με τη βέλτιστη ταχύτητα περιστροφής (6 - 9.6 rpm) για κάθε ταχύτητα ανέμου
+    optimal_curve = optimal_power_curve(hansen_DTU, wind_speed_values)
+    df_power_curve = pd.DataFrame({
+        "V0 (m/s)": optimal_curve.wind_speeds,
+        "n (rpm)": optimal_curve.rotation_speed * 60 / (2 * np.pi),
+        "Power (kW)": optimal_curve.power * 1e-3,
+        "Thrust (kN)": optimal_curve.thrust * 1e-3,
+    })
+    print(df_power_curve)
+    grid_evaluations = len(wind_speed_values) * rpm_values.size
+    print(f"{optimal_curve.rotor_evaluations} επιλύσεις του ρότορα για τη βέλτιστη ταχύτητα περιστροφής (αντί για "
+          f"{grid_evaluations} του πλέγματος των {rpm_values.size} ταχυτήτων περιστροφής, "
+          f"{grid_evaluations / optimal_curve.rotor_evaluations:.1f} φορές λιγότερες)")
+
+    results_for_DTU_geometry, total_power, total_torque, total_thrust = hansen_DTU.DTU_blade_calculation(
+        wind_speed_V0=wind_speed_values[-1], rotation_speed=w_rps_values[-1], vectorized=True, columnar=True)
+    df_DTU_results = results_for_DTU_geometry.to_dataframe()
     print(df_DTU_results)
 
     print(f"Η συνολική ισχύς της ανεμογεννήτριας είναι {total_power:.2f} Watt")
     print(f"H συνολική ροπή της ανεμογεννήτριας είναι {total_torque:.2f} Nm")
     print(f"H συνολική ώση της ανεμογεννήτριας είναι {total_thrust:.2f} N")
+    print(f"solve_cache: {hansen_DTU.solve_cache.stats()}")
+    if result_cache is not None:
+        print(f"result_cache: {result_cache.stats()}")
     
 #%%
 if __name__ == "__main__":
@@ -0,0 +1,354 @@
+#%%
+"""
+Ετήσια παραγωγή ενέργειας (AEP) ενός ρότορα σε πολλές υποψήφιες θέσεις, καθεμία με τη δική της κατανομή Weibull (k, A)
+της ταχύτητας του ανέμου και πυκνότητα του αέρα. Η καμπύλη ισχύος υπολογίζεται μία φορά με τον διανυσματικό αλγόριθμο,
+σε πλέγμα ταχυτήτων περιστροφής (power_curve) ή με αναζήτηση της βέλτιστης ταχύτητας περιστροφής για κάθε ταχύτητα
+ανέμου (optimal_power_curve), και ολοκληρώνεται για όλες τις θέσεις μαζί με πράξεις πινάκων.
+
+Στον αλγόριθμο οι συντελεστές επαγωγής δεν εξαρτώνται από την πυκνότητα του αέρα (ο αριθμός Reynolds εξαρτάται μόνο από
+το κινηματικό ιξώδες), επομένως η αεροδυναμική ισχύς είναι ανάλογη της πυκνότητας: η καμπύλη κάθε πυκνότητας προκύπτει
+ακριβώς από την καμπύλη υπολογισμού με αναλογία και στη συνέχεια περιορίζεται στην ονομαστική ισχύ.
+"""
+import argparse
+import csv
+import math
+from collections import namedtuple
+import numpy as np
+from polar_io import iter_csv_rows
+
+HOURS_PER_YEAR = 8766.0 # 365.25 ημέρες
+
+# τα όρια του DTU 10 MW Reference Wind Turbine
+DEFAULT_RATED_POWER = 10e6 # W
+DEFAULT_CUT_IN = 4.0 # m/sec
+DEFAULT_CUT_OUT = 25.0 # m/sec
+DEFAULT_MIN_ROTATION_SPEED = 6.0 * 2 * np.pi / 60 # rad/sec
+DEFAULT_MAX_ROTATION_SPEED = 9.6 * 2 * np.pi / 60 # rad/sec
+DEFAULT_WIND_SPEEDS = np.arange(3.0, 25.5, 0.5)
+GOLDEN_SECTION = 0.5 * (3 - 5**0.5) # το κλάσμα του διαστήματος στο οποίο τοποθετείται το νέο σημείο στη χρυσή τομή
+
+PowerCurve = namedtuple('PowerCurve', ['wind_speeds', 'power', 'thrust', 'rotation_speed', 'air_density', 'rotor_evaluations'],
+                        defaults=(None,))
+"""
+η καμπύλη ισχύος του ρότορα: για κάθε ταχύτητα ανέμου wind_speeds (m/sec) η αεροδυναμική ισχύς power (W) και η ώση
+thrust (N) στην ταχύτητα περιστροφής rotation_speed (rad/sec), για πυκνότητα αέρα air_density (kg/m^3), και το πλήθος
+των σημείων λειτουργίας που επιλύθηκαν για τον υπολογισμό της (rotor_evaluations).
+Η ισχύς δεν περιορίζεται στην ονομαστική (αυτό γίνεται στην annual_energy_production) και η γωνία βήματος είναι
+αυτή της γεωμετρίας (χωρίς ρύθμιση βήματος πάνω από την ονομαστική ταχύτητα).
+"""
+
+Sites = namedtuple('Sites', ['names', 'k', 'A', 'air_density'])
+""" οι θέσεις: ονόματα και πίνακες (n_sites) με τις παραμέτρους Weibull k, A (m/sec) και την πυκνότητα του αέρα (kg/m^3) """
+
+# τα ονόματα (με μικρά γράμματα) που αναγνωρίζονται για κάθε στήλη του αρχείου θέσεων
+SITE_COLUMN_NAMES = {
+    "name": ("site", "name", "id"),
+    "k": ("k", "weibull_k", "shape"),
+    "A": ("a", "weibull_a", "scale", "c"),
+    "air_density": ("air_density", "rho", "density"),
+}
+
+def power_curve(hansen, wind_speeds=DEFAULT_WIND_SPEEDS, rotation_speeds=None, min_rotation_speed=DEFAULT_MIN_ROTATION_SPEED,
+                max_rotation_speed=DEFAULT_MAX_ROTATION_SPEED, solver='fixed_point', config=None):
+    """
+    καμπύλη ισχύος ρότορα μεταβλητών στροφών: για κάθε ταχύτητα ανέμου η ταχύτητα περιστροφής με τη μέγιστη ισχύ από τις
+    rotation_speeds, με μία κλήση της operating_grid
+
+    Args:
+        hansen (Hansen_Algorithm): ο ρότορας
+        wind_speeds (array_like, optional): οι ταχύτητες του ανέμου σε m/sec. Defaults to 3 έως 25 m/sec ανά 0.5 m/sec.
+        rotation_speeds (array_like, optional): οι υποψήφιες ταχύτητες περιστροφής σε rad/sec.
+            Defaults to None (δηλ. 25 ισαπέχουσες τιμές από min_rotation_speed έως max_rotation_speed).
+        min_rotation_speed (float, optional): η ελάχιστη ταχύτητα περιστροφής σε rad/sec. Defaults to 6 rpm.
+        max_rotation_speed (float, optional): η μέγιστη ταχύτητα περιστροφής σε rad/sec. Defaults to 9.6 rpm.
+        solver (str, optional): 'fixed_point' ή 'bracketed' (βλ. sections_calculation). Defaults to 'fixed_point'.
+        config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας. Defaults to None (δηλ. hansen.config).
+
+    Returns:
+        (PowerCurve): η καμπύλη ισχύος για την πυκνότητα hansen.air_density
+    """
+    V0 = np.atleast_1d(np.asarray(wind_speeds, dtype=float))
+    if rotation_speeds is None:
+        rotation_speeds = np.linspace(min_rotation_speed, max_rotation_speed, 25)
+    w_rps = np.atleast_1d(np.asarray(rotation_speeds, dtype=float))
+    grid = hansen.operating_grid(V0, w_rps, solver=solver, config=config)
+    power = np.nan_to_num(grid["power"][:, :, 0], nan=-np.inf)
+    best = np.argmax(power, axis=1)
+    rows = np.arange(V0.size)
+    return PowerCurve(V0, grid["power"][rows, best, 0], grid["thrust"][rows, best, 0], w_rps[best], float(hansen.air_density),
+                      V0.size * w_rps.size)
+
+def optimal_power_curve(hansen, wind_speeds=DEFAULT_WIND_SPEEDS, min_rotation_speed=DEFAULT_MIN_ROTATION_SPEED,
+                        max_rotation_speed=DEFAULT_MAX_ROTATION_SPEED, xtol=1e-4, max_evaluations=12, solver='fixed_point',
+                        config=None):
+    """
+    καμπύλη ισχύος ρότορα μεταβλητών στροφών με αναζήτηση του μεγίστου της ισχύος ως προς την ταχύτητα περιστροφής στο
+    διάστημα [min_rotation_speed, max_rotation_speed].
+    Χωρίς πίνακες για πολλούς αριθμούς Reynolds ο Cp εξαρτάται μόνο από το λ = ωR/V0 (βλ. tip_speed_ratio_curve), επομένως
+    το μέγιστο για κάθε ταχύτητα ανέμου βρίσκεται στο ίδιο λ, περιορισμένο στα όρια των στροφών: η αναζήτηση γίνεται μία
+    φορά για V0 = 1 m/sec στο εύρος των λ όλων των ταχυτήτων ανέμου (με ανοχή xtol / max V0) και ακολουθεί μία επίλυση ανά
+    ταχύτητα ανέμου. Αλλιώς η αναζήτηση γίνεται για κάθε ταχύτητα ανέμου, για όλες μαζί (μία κλήση της operating_points
+    ανά βήμα). Η αναζήτηση ξεκινά από τα άκρα και το μέσο του διαστήματος και σε κάθε βήμα προσθέτει για κάθε ταχύτητα
+    ανέμου ένα σημείο: την κορυφή της παραβολής από το καλύτερο σημείο και τους δύο γείτονές του (που περικλείουν
+    το μέγιστο) ή, αν η παραβολή δεν είναι κοίλη ή η κορυφή της απέχει λιγότερο από xtol από υπολογισμένο σημείο,
+    ένα σημείο χρυσής τομής στο μεγαλύτερο από τα δύο υποδιαστήματα γύρω από το καλύτερο σημείο.
+    Η αναζήτηση σταματά για κάθε ταχύτητα ανέμου όταν οι γείτονες του καλύτερου σημείου απέχουν λιγότερο από 2 xtol
+    (ή, αν το καλύτερο σημείο είναι όριο των στροφών, ο μοναδικός γείτονάς του απέχει λιγότερο από 2 xtol).
+
+    Args:
+        hansen (Hansen_Algorithm): ο ρότορας
+        wind_speeds (array_like, optional): οι ταχύτητες του ανέμου σε m/sec. Defaults to 3 έως 25 m/sec ανά 0.5 m/sec.
+        min_rotation_speed (float, optional): η ελάχιστη ταχύτητα περιστροφής σε rad/sec. Defaults to 6 rpm.
+        max_rotation_speed (float, optional): η μέγιστη ταχύτητα περιστροφής σε rad/sec. Defaults to 9.6 rpm.
+        xtol (float, optional): η ανοχή της ταχύτητας περιστροφής σε rad/sec. Defaults to 1e-4.
+        max_evaluations (int, optional): το μέγιστο πλήθος επιλύσεων της αναζήτησης (ανά ταχύτητα ανέμου με πίνακες για
+            πολλούς αριθμούς Reynolds), τουλάχιστον 3. Defaults to 12.
+        solver (str, optional): 'fixed_point' ή 'bracketed' (βλ. sections_calculation). Defaults to 'fixed_point'.
+        config (SolverConfig, optional): οι ρυθμίσεις της επαναληπτικής διαδικασίας. Defaults to None (δηλ. hansen.config).
+
+    Raises:
+        ValueError: αν max_evaluations < 3 ή min_rotation_speed > max_rotation_speed
+
+    Returns:
+        (PowerCurve): η καμπύλη ισχύος για την πυκνότητα hansen.air_density
+    """
+    if max_evaluations < 3:
+        raise ValueError(f"Απαιτούνται τουλάχιστον 3 επιλύσεις ανά ταχύτητα ανέμου (δόθηκαν {max_evaluations})")
+    if min_rotation_speed > max_rotation_speed:
+        raise ValueError(f"Η ελάχιστη ταχύτητα περιστροφής ({min_rotation_speed}) είναι μεγαλύτερη από τη μέγιστη ({max_rotation_speed})")
+    V0 = np.atleast_1d(np.asarray(wind_speeds, dtype=float))
+    if hansen.uses_reynolds or V0.size == 0 or not np.all(V0 > 0): # (το λ ορίζεται μόνο για θετικές ταχύτητες ανέμου)
+        w_best, best_power, best_thrust, evaluations = _maximize_power(
+            hansen, V0, min_rotation_speed, max_rotation_speed, xtol, max_evaluations, solver, config)
+    else:
+        # ο Cp εξαρτάται μόνο από το λ = ωR/V0: η αναζήτηση γίνεται μία φορά για V0 = 1 m/sec (ω1 = λ/R) στο εύρος των λ
+        # όλων των ταχυτήτων ανέμου και η βέλτιστη ω κάθε ταχύτητας είναι ω1 V0, περιορισμένη στα όρια των στροφών
+        w_unit, _, _, evaluations = _maximize_power(
+            hansen, np.ones(1), min_rotation_speed / V0.max(), max_rotation_speed / V0.min(), xtol / V0.max(),
+            max_evaluations, solver, config)
+        w_best = np.clip(w_unit[0] * V0, min_rotation_speed, max_rotation_speed)
+        points = hansen.operating_points(V0, w_best, solver=solver, config=config)
+        best_power, best_thrust = points["power"], points["thrust"]
+        evaluations += V0.size
+    return PowerCurve(V0, best_power, best_thrust, w_best, float(hansen.air_density), evaluations)
+
+def _maximize_power(hansen, V0, min_rotation_speed, max_rotation_speed, xtol, max_evaluations, solver, config):
+    """
+    η αναζήτηση της optimal_power_curve για κάθε ταχύτητα ανέμου V0[i] χωριστά (όλες μαζί σε κάθε βήμα)
+
+    Returns:
+        (tuple): οι βέλτιστες ταχύτητες περιστροφής, η ισχύς (nan αν δεν υπάρχει λύση) και η ώση σε αυτές, και το πλήθος των επιλύσεων
+    """
+    rows = np.arange(V0.size)
+    # τα υπολογισμένα σημεία κάθε ταχύτητας ανέμου (οι ταχύτητες που σταμάτησαν επαναλαμβάνουν το καλύτερο σημείο τους)
+    w_rps = np.empty((V0.size, max_evaluations))
+    power = np.full((V0.size, max_evaluations), -np.inf)
+    thrust = np.full((V0.size, max_evaluations), np.nan)
+    w_rps[:, :3] = [min_rotation_speed, 0.5 * (min_rotation_speed + max_rotation_speed), max_rotation_speed]
+    points = hansen.operating_points(np.repeat(V0, 3), w_rps[:, :3].ravel(), solver=solver, config=config)
+    power[:, :3] = np.nan_to_num(points["power"].reshape(-1, 3), nan=-np.inf)
+    thrust[:, :3] = points["thrust"].reshape(-1, 3)
+    evaluations = 3 * V0.size
+    active = np.ones(V0.size, dtype=bool)
+    for count in range(3, max_evaluations):
+        order = np.argsort(w_rps[:, :count], axis=1)
+        w_sorted = np.take_along_axis(w_rps[:, :count], order, axis=1)
+        power_sorted = np.take_along_axis(power[:, :count], order, axis=1)
+        best = np.argmax(power_sorted, axis=1)
+        middle = np.clip(best, 1, count - 2)
+        x0, x1, x2 = (w_sorted[rows, middle + shift] for shift in (-1, 0, 1))
+        f0, f1, f2 = (power_sorted[rows, middle + shift] for shift in (-1, 0, 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = (f1 - f0) / (x1 - x0)
+            curvature = ((f2 - f1) / (x2 - x1) - slope) / (x2 - x0)
+            vertex = 0.5 * (x0 + x1) - slope / (2 * curvature)
+        x_best = w_sorted[rows, best]
+        lower = w_sorted[rows, np.maximum(best - 1, 0)]
+        upper = w_sorted[rows, np.minimum(best + 1, count - 1)]
+        far = np.where(upper - x_best > x_best - lower, upper, lower)
+        golden = x_best + GOLDEN_SECTION * (far - x_best)
+        candidate = np.where(np.isfinite(vertex) & (curvature < 0), np.clip(vertex, lower, upper), golden)
+        # σημείο πολύ κοντά σε υπολογισμένο: δοκιμή σε απόσταση xtol από το καλύτερο σημείο, πρώτα προς την κορυφή και
+        # μετά προς την άλλη πλευρά, ή, αν υπάρχουν ήδη και οι δύο, βήμα χρυσής τομής (όπως στη μέθοδο Brent)
+        direction = np.sign(candidate - x_best)
+        direction = np.where(direction == 0, np.sign(far - x_best), direction)
+        too_close = _distance(w_sorted, candidate) < xtol
+        for probe in (x_best + direction * xtol, x_best - direction * xtol):
+            probe = np.clip(probe, min_rotation_speed, max_rotation_speed)
+            use_probe = too_close & (_distance(w_sorted, probe) >= 0.5 * xtol)
+            candidate = np.where(use_probe, probe, candidate)
+            too_close &= ~use_probe
+        candidate = np.where(too_close, golden, candidate)
+        active &= upper - lower >= 2 * xtol
+        if not active.any():
+            break
+        # οι ταχύτητες που σταμάτησαν κρατούν το καλύτερο σημείο τους και στις επόμενες στήλες
+        previous_best = np.argmax(power[:, :count], axis=1)
+        w_rps[:, count] = w_rps[rows, previous_best]
+        power[:, count] = power[rows, previous_best]
+        thrust[:, count] = thrust[rows, previous_best]
+        points = hansen.operating_points(V0[active], candidate[active], solver=solver, config=config)
+        w_rps[active, count] = candidate[active]
+        power[active, count] = np.nan_to_num(points["power"], nan=-np.inf)
+        thrust[active, count] = points["thrust"]
+        evaluations += int(active.sum())
+    best = np.argmax(power, axis=1)
+    best_power = np.where(np.isfinite(power[rows, best]), power[rows, best], np.nan)
+    return w_rps[rows, best], best_power, thrust[rows, best], evaluations
+
+
+def _distance(points, x):
+    """ η απόσταση κάθε x[i] από το πλησιέστερο από τα points[i, :] """
+    return np.min(np.abs(points - x[:, None]), axis=1)
+
+def scale_power_curve(curve, air_density):
+    """ η καμπύλη curve για πυκνότητα αέρα air_density (η ισχύς και η ώση είναι ανάλογες της πυκνότητας) """
+    ratio = air_density / curve.air_density
+    return curve._replace(power=curve.power * ratio, thrust=curve.thrust * ratio, air_density=float(air_density))
+
+def weibull_bin_probabilities(k, A, edges):
+    """
+    οι πιθανότητες της ταχύτητας του ανέμου να βρίσκεται σε κάθε διάστημα [edges[j], edges[j+1]) για κάθε θέση,
+    από τη συνάρτηση κατανομής F(V) = 1 - exp(-(V/A)^k)
+
+    Args:
+        k (array_like): οι παράμετροι σχήματος (n_sites)
+        A (array_like): οι παράμετροι κλίμακας σε m/sec (n_sites)
+        edges (array_like): τα όρια των διαστημάτων σε m/sec (n_bins + 1)
+
+    Returns:
+        (np.ndarray): πίνακας (n_sites, n_bins)
+    """
+    k = np.asarray(k, dtype=float)[:, None]
+    A = np.asarray(A, dtype=float)[:, None]
+    survival = np.exp(-(np.asarray(edges, dtype=float)[None, :] / A)**k)
+    return survival[:, :-1] - survival[:, 1:]
+
+def read_sites(path, default_air_density=1.225):
+    """
+    ανάγνωση των θέσεων από αρχείο CSV (με διαχωριστικό ',' ή ';') με στήλες k, A και προαιρετικά όνομα και πυκνότητα αέρα
+    (βλ. SITE_COLUMN_NAMES)
+
+    Args:
+        path (str): το αρχείο
+        default_air_density (float, optional): η πυκνότητα για θέσεις χωρίς τιμή. Defaults to 1.225.
+
+    Raises:
+        ValueError: αν λείπει κάποια από τις στήλες k, A, κάποια γραμμή δεν έχει όλες τις στήλες της επικεφαλίδας ή
+            μη αριθμητική τιμή, ή κάποια τιμή των k, A, πυκνότητας δεν είναι θετική
+
+    Returns:
+        (Sites): οι θέσεις
+    """
+    rows = iter_csv_rows(path)
+    header = [name.strip().lower() for name in next(rows)]
+    indices = {column: next((header.index(alias) for alias in aliases if alias in header), None)
+               for column, aliases in SITE_COLUMN_NAMES.items()}
+    missing = [column for column in ("k", "A") if indices[column] is None]
+    if missing:
+        raise ValueError(f"Δεν βρέθηκαν οι στήλες {missing} στην επικεφαλίδα {header}")
+    columns = 1 + max(index for index in indices.values() if index is not None)
+    names, k, A, air_density = [], [], [], []
+    for line, row in enumerate(rows, start=2): # η επικεφαλίδα είναι η γραμμή 1
+        if not any(value.strip() for value in row):
+            continue
+        if len(row) < columns:
+            raise ValueError(f"{path}, γραμμή {line}: {len(row)} τιμές αντί για τουλάχιστον {columns} ({row})")
+        try:
+            names.append(row[indices["name"]].strip() if indices["name"] is not None else str(len(names)))
+            k.append(float(row[indices["k"]]))
+            A.append(float(row[indices["A"]]))
+            density = row[indices["air_density"]].strip() if indices["air_density"] is not None else ""
+            air_density.append(float(density) if density else default_air_density)
+        except ValueError as error:
+            raise ValueError(f"{path}, γραμμή {line}: {error}") from None
+    sites = Sites(names, np.array(k), np.array(A), np.array(air_density))
+    for column in ("k", "A", "air_density"):
+        values = getattr(sites, column)
+        if not np.all(values > 0):
+            raise ValueError(f"Οι τιμές της στήλης {column} πρέπει να είναι θετικές")
+    return sites
+
+def annual_energy_production(curve, sites, rated_power=DEFAULT_RATED_POWER, cut_in=DEFAULT_CUT_IN, cut_out=DEFAULT_CUT_OUT,
+                             wind_step=0.05, availability=1.0):
+    """
+    η ετήσια παραγωγή ενέργειας κάθε θέσης: η καμπύλη curve μετατρέπεται σε κάθε διαφορετική πυκνότητα αέρα
+    (βλ. scale_power_curve), περιορίζεται στην ονομαστική ισχύ και στο διάστημα [cut_in, cut_out] και ολοκληρώνεται
+    με τον κανόνα του μέσου σημείου σε διαστήματα πλάτους wind_step, ως προς την κατανομή Weibull κάθε θέσης
+
+    Args:
+        curve (PowerCurve): η καμπύλη ισχύος (βλ. power_curve, optimal_power_curve). Μεταξύ των σημείων της η ισχύς παρεμβάλλεται γραμμικά.
+        sites (Sites): οι θέσεις (βλ. read_sites)
+        rated_power (float, optional): η ονομαστική ισχύς σε W. Defaults to 10 MW.
+        cut_in (float, optional): η ταχύτητα έναρξης λειτουργίας σε m/sec. Defaults to 4.
+        cut_out (float, optional): η ταχύτητα διακοπής λειτουργίας σε m/sec. Defaults to 25.
+        wind_step (float, optional): το πλάτος των διαστημάτων ολοκλήρωσης σε m/sec. Defaults to 0.05.
+        availability (float, optional): το ποσοστό του χρόνου που η ανεμογεννήτρια είναι διαθέσιμη. Defaults to 1.
+
+    Raises:
+        ValueError: αν η καμπύλη δεν καλύπτει το διάστημα [cut_in, cut_out]
+
+    Returns:
+        (dict): πίνακες (n_sites) "aep" σε MWh, "capacity_factor", "mean_power" σε W, "mean_wind_speed" σε m/sec και
+        "air_density", τα ονόματα "names" και για κάθε διαφορετική πυκνότητα ("air_densities") η ισχύς στα μέσα των
+        διαστημάτων "bin_centers" ("power", με δείκτες [πυκνότητα, διάστημα])
+    """
+    if curve.wind_speeds[0] > cut_in or curve.wind_speeds[-1] < cut_out:
+        raise ValueError(f"Η καμπύλη ισχύος ({curve.wind_speeds[0]} έως {curve.wind_speeds[-1]} m/sec) "
+                         f"δεν καλύπτει το διάστημα λειτουργίας {cut_in} έως {cut_out} m/sec")
+    edges = np.arange(0.0, cut_out + wind_step / 2, wind_step)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    in_operation = centers >= cut_in
+    aerodynamic_power = np.where(in_operation, np.interp(centers, curve.wind_speeds, np.nan_to_num(curve.power)), 0.0)
+
+    air_densities, density_index = np.unique(sites.air_density, return_inverse=True)
+    ratios = air_densities / curve.air_density
+    power = np.clip(ratios[:, None] * aerodynamic_power[None, :], 0.0, rated_power) # [πυκνότητα, διάστημα]
+
+    probabilities = weibull_bin_probabilities(sites.k, sites.A, edges) # [θέση, διάστημα]
+    mean_power = availability * np.einsum('sb,sb->s', probabilities, power[density_index.ravel()])
+    aep = mean_power * HOURS_PER_YEAR / 1e6
+    return {
+        "names": list(sites.names),
+        "aep": aep,
+        "capacity_factor": mean_power / rated_power,
+        "mean_power": mean_power,
+        "mean_wind_speed": sites.A * np.array([math.gamma(1 + 1 / k) for k in sites.k]),
+        "air_density": sites.air_density,
+        "air_densities": air_densities,
+        "bin_centers": centers,
+        "power": power,
+    }
+
+def write_results(path, results):
+    """ εγγραφή των αποτελεσμάτων της annual_energy_production (μία γραμμή ανά θέση) σε αρχείο CSV """
+    with open(path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["site", "air_density", "mean_wind_speed", "mean_power (W)", "aep (MWh)", "capacity_factor"])
+        for row in zip(results["names"], results["air_density"], results["mean_wind_speed"], results["mean_power"],
+                       results["aep"], results["capacity_factor"]):
+            writer.writerow([row[0]] + [f"{value:.6g}" for value in row[1:]])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ετήσια παραγωγή ενέργειας του ρότορα σε πολλές θέσεις")
+    parser.add_argument("sites", help="αρχείο CSV με στήλες site, k, A, air_density")
+    parser.add_argument("--geometry", default="blade_geom_DTU.json")
+    parser.add_argument("--polars", default="csv_data_file_DTU.csv")
+    parser.add_argument("--rated-power", type=float, default=DEFAULT_RATED_POWER, help="η ονομαστική ισχύς σε W")
+    parser.add_argument("--cut-in", type=float, default=DEFAULT_CUT_IN)
+    parser.add_argument("--cut-out", type=float, default=DEFAULT_CUT_OUT)
+    parser.add_argument("--output", default=None, help="αρχείο CSV για τα αποτελέσματα")
+    args = parser.parse_args(argv)
+
+    from _algorithmos_DTU import Hansen_Algorithm
+    hansen = Hansen_Algorithm(args.geometry, csv_data_file=args.polars)
+    results = annual_energy_production(optimal_power_curve(hansen), read_sites(args.sites), rated_power=args.rated_power,
+                                       cut_in=args.cut_in, cut_out=args.cut_out)
+    if args.output:
+        write_results(args.output, results)
+    for name, aep, capacity_factor in zip(results["names"], results["aep"], results["capacity_factor"]):
+        print(f"{name}: AEP = {aep:.1f} MWh, συντελεστής χρησιμοποίησης = {capacity_factor:.3f}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#%%
+"""
+Μεταγλωττισμένος (JIT) πυρήνας της επαναληπτικής διαδικασίας του αλγορίθμου BEM για πολλά τμήματα πτερυγίου.
+Αν είναι εγκατεστημένο το numba, οι συναρτήσεις μεταγλωττίζονται με το numba.njit την πρώτη φορά που χρειάζονται
+(βλ. compile_kernels), ώστε η εισαγωγή της ενότητας να μη φορτώνει το numba. Διαφορετικά εκτελούνται ως απλός
+κώδικας Python (πολύ πιο αργά), ώστε τα αποτελέσματα να μπορούν να ελεγχθούν και χωρίς το numba.
+Ο πυρήνας κάνει ακριβώς τα ίδια βήματα με την Hansen_Algorithm._fixed_point_iteration, με τους πίνακες της
+SectionPolars για την αναζήτηση των Cl, Cd.
+"""
+import importlib.util
+import math
+import numpy as np
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+_compiled = False
+
+backends = ('auto', 'numpy', 'numba') # οι διαθέσιμες επιλογές για την επαναληπτική διαδικασία
+
+# κωδικοί κατάστασης του πυρήνα για κάθε τμήμα
+STATUS_OK = 0
+STATUS_SINGULAR = 1 # a΄ = -1, η εφαπτομενική ταχύτητα μηδενίζεται
+STATUS_OUT_OF_RANGE = 2 # η γωνία προσβολής είναι εκτός του εύρους του πίνακα της αεροτομής
+
+
+def resolve_backend(backend):
+    """
+    επιστρέφει 'numba' ή 'numpy' για την επιλογή backend ('auto' σημαίνει 'numba' όταν είναι διαθέσιμο)
+
+    Raises:
+        ValueError: για άγνωστη επιλογή
+        ImportError: αν ζητηθεί ρητά το 'numba' και δεν είναι εγκατεστημένο
+    """
+    if backend not in backends:
+        raise ValueError(f"Άγνωστο backend {backend!r} (επιτρεπτά: {backends})")
+    if backend == 'auto':
+        return 'numba' if HAS_NUMBA else 'numpy'
+    if backend == 'numba' and not HAS_NUMBA:
+        raise ImportError("Το backend 'numba' απαιτεί το πακέτο numba")
+    return backend
+
+
+def compile_kernels():
+    """ 
+    μεταγλώττιση των _divide, polar_lookup και fixed_point_sections με το numba.njit (μία φορά). Τα ονόματα της ενότητας
+    δείχνουν στη συνέχεια στις μεταγλωττισμένες συναρτήσεις, ώστε η fixed_point_sections να καλεί τις μεταγλωττισμένες
+    _divide και polar_lookup.
+
+    Returns:
+        (function): η μεταγλωττισμένη fixed_point_sections
+    """
+    global _divide, polar_lookup, fixed_point_sections, _compiled
+    if not _compiled:
+        from numba import njit
+        _divide = njit(cache=True, error_model='numpy')(_divide)
+        polar_lookup = njit(cache=True, error_model='numpy')(polar_lookup)
+        fixed_point_sections = njit(cache=True, error_model='numpy')(fixed_point_sections)
+        _compiled = True
+    return fixed_point_sections
+
+
+def _divide(x, y):
+    """ 
+    x / y με τη σημασία των float του NumPy (±inf ή nan αντί για ZeroDivisionError), ώστε ο κώδικας Python να δίνει
+    τα ίδια αποτελέσματα με τον μεταγλωττισμένο (error_model='numpy') και με την υλοποίηση NumPy, π.χ. φ = π/2 για ω = 0
+    """
+    if y == 0.0:
+        if x == 0.0 or x != x:
+            return math.nan
+        return math.copysign(math.inf, x) * math.copysign(1.0, y)
+    return x / y
+
+
+def polar_lookup(angles, coefs, section, angle_of_attack_deg, angle_step):
+    """
+    γραμμική παρεμβολή των Cl, Cd του τμήματος section στη γωνία angle_of_attack_deg (όπως η SectionPolars.coefficients).
+    Για angle_step > 0 ο δείκτης υπολογίζεται αριθμητικά, αλλιώς με δυαδική αναζήτηση.
+
+    Returns:
+        (tuple): Cl, Cd και True αν η γωνία είναι μέσα στο εύρος του πίνακα
+    """
+    n = angles.shape[0]
+    if not (angles[0] <= angle_of_attack_deg <= angles[n - 1]): # και για NaN
+        return math.nan, math.nan, False
+    if angle_step > 0:
+        i = int(math.floor((angle_of_attack_deg - angles[0]) / angle_step))
+    else: # ο μεγαλύτερος δείκτης με angles[i] < angle_of_attack_deg
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if angles[mid] < angle_of_attack_deg:
+                lo = mid + 1
+            else:
+                hi = mid
+        i = lo - 1
+    i = min(max(i, 0), n - 2)
+    weight = (angle_of_attack_deg - angles[i]) / (angles[i + 1] - angles[i])
+    Cl = coefs[section, i, 0] + (coefs[section, i + 1, 0] - coefs[section, i, 0]) * weight
+    Cd = coefs[section, i, 1] + (coefs[section, i + 1, 1] - coefs[section, i, 1]) * weight
+    return Cl, Cd, True
+
+
+def fixed_point_sections(v0, w_rps, r, chord, pitch_angle_deg, twist_deg, section_index, a, a_p,
+                         angles, coefs, angle_step, B, f, tolerance, max_iter):
+    """
+    η επαναληπτική διαδικασία (ΒΗΜΑΤΑ 2 έως 7) για κάθε τμήμα. Τα a, a_p περιέχουν τις αρχικές τιμές και
+    ενημερώνονται επιτόπου.
+
+    Returns:
+        (tuple): πίνακες flow_angle (rads), angle_of_attack (rads), Cl, Cd, Cn, Ct, a_new, a_p_new, counter και status
+    """
+    n = r.shape[0]
+    flow_angle = np.full(n, np.nan)
+    angle_of_attack = np.full(n, np.nan)
+    Cl_out = np.full(n, np.nan)
+    Cd_out = np.full(n, np.nan)
+    Cn_out = np.full(n, np.nan)
+    Ct_out = np.full(n, np.nan)
+    a_new_out = np.full(n, np.nan)
+    a_p_new_out = np.full(n, np.nan)
+    counter = np.zeros(n, dtype=np.int64)
+    status = np.zeros(n, dtype=np.int64)
+    for j in range(n):
+        solidity_factor = (B * chord[j]) / (2 * math.pi * r[j])
+        blade_angle = math.radians(pitch_angle_deg[j]) + math.radians(twist_deg[j])
+        while True:
+            phi = math.atan(_divide(v0[j] * (1 - a[j]), w_rps[j] * r[j] * (1 + a_p[j])))
+            alpha = phi - blade_angle
+            Cl, Cd, inside = polar_lookup(angles, coefs, section_index[j], math.degrees(alpha), angle_step)
+            if not inside:
+                status[j] = STATUS_OUT_OF_RANGE
+                angle_of_attack[j] = alpha
+                break
+            Cn = Cl * math.cos(phi) + Cd * math.sin(phi)
+            Ct = Cl * math.sin(phi) - Cd * math.cos(phi)
+            a_new = _divide(1.0, _divide(4 * math.sin(phi)**2, solidity_factor * Cn) + 1)
+            a_p_new = _divide(1.0, _divide(4 * math.sin(phi) * math.cos(phi), solidity_factor * Ct) - 1)
+            flow_angle[j], angle_of_attack[j] = phi, alpha
+            Cl_out[j], Cd_out[j], Cn_out[j], Ct_out[j] = Cl, Cd, Cn, Ct
+            a_new_out[j], a_p_new_out[j] = a_new, a_p_new
+
+            converged = abs(a[j] - a_new) < tolerance and abs(a_p[j] - a_p_new) < tolerance
+            if not converged:
+                a[j] = a[j] * (1 - f) + f * a_new
+                a_p[j] = a_p[j] * (1 - f) + f * a_p_new
+            counter[j] += 1
+            if a_p[j] == -1:
+                status[j] = STATUS_SINGULAR
+                break
+            if converged or counter[j] > max_iter:
+                break
+    return flow_angle, angle_of_attack, Cl_out, Cd_out, Cn_out, Ct_out, a_new_out, a_p_new_out, counter, status
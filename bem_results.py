@@ -0,0 +1,108 @@
+#%%
+"""
+Αποτελέσματα του αλγορίθμου BEM σε μορφή στηλών (struct of arrays): κάθε μέγεθος, π.χ. "pn (N/m)", αποθηκεύεται
+σε έναν συνεχή μονοδιάστατο πίνακα NumPy με μία τιμή ανά τμήμα του πτερυγίου (ή ανά τμήμα και σημείο λειτουργίας),
+αντί για μία λίστα με ένα λεξικό ανά τμήμα. Το pandas και το pyarrow φορτώνονται μόνο όταν ζητηθεί μετατροπή σε αυτά.
+"""
+import warnings
+import numpy as np
+
+class BEMResults:
+    """
+    Πίνακας αποτελεσμάτων με σταθερές στήλες. Οι στήλες διαβάζονται με results["pn (N/m)"] και τα συνολικά μεγέθη
+    του ρότορα (π.χ. "power", "torque", "thrust") βρίσκονται στο λεξικό results.totals.
+    """
+    def __init__(self, columns, totals=None):
+        """
+        Args:
+            columns (dict): όνομα στήλης -> πίνακας (όλοι με το ίδιο πλήθος στοιχείων). Οι πολυδιάστατοι πίνακες
+                γίνονται μονοδιάστατοι χωρίς αντιγραφή όταν είναι συνεχείς στη μνήμη.
+            totals (dict, optional): τα συνολικά μεγέθη του ρότορα. Defaults to None.
+        """
+        self._columns = {}
+        for name, values in columns.items():
+            values = np.ravel(values)
+            if self._columns and values.size != len(self):
+                raise ValueError(f'Η στήλη "{name}" έχει {values.size} τιμές αντί για {len(self)}')
+            self._columns[name] = values
+        self.totals = dict(totals or {})
+
+    @classmethod
+    def from_records(cls, records, totals=None):
+        """ δημιουργία από λίστα λεξικών με τα ίδια κλειδιά (π.χ. τη λίστα της DTU_blade_calculation) """
+        names = list(records[0]) if records else []
+        return cls({name: np.array([record[name] for record in records]) for name in names}, totals)
+
+    @classmethod
+    def from_operating_grid(cls, grid):
+        """
+        δημιουργία από το αποτέλεσμα της Hansen_Algorithm.operating_grid(..., per_section=True): μία γραμμή ανά τμήμα
+        και σημείο λειτουργίας, με επιπλέον στήλες τους δείκτες "wind_speed_V0", "rotation_speed", "pitch_offset" και "section".
+        Τα συνολικά μεγέθη κάθε σημείου λειτουργίας ("power", "torque", "thrust", "Cp", "CT") βρίσκονται στο totals.
+        """
+        sections = grid["sections"]
+        shape = sections["a"].shape
+        index = np.meshgrid(grid["wind_speed_V0"], grid["rotation_speed"], grid["pitch_offset"], np.arange(shape[-1]), indexing='ij')
+        columns = dict(zip(("wind_speed_V0", "rotation_speed", "pitch_offset", "section"), index))
+        columns.update(sections)
+        return cls(columns, {key: grid[key] for key in ("power", "torque", "thrust", "Cp", "CT")})
+
+    @property
+    def columns(self):
+        """ τα ονόματα των στηλών """
+        return tuple(self._columns)
+
+    def __len__(self):
+        return next(iter(self._columns.values())).size if self._columns else 0
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def to_records(self):
+        """
+        Returns:
+            (list): ένα λεξικό ανά γραμμή, όπως η λίστα που επιστρέφει η DTU_blade_calculation
+        """
+        return [dict(zip(self._columns, row)) for row in zip(*self._columns.values())]
+
+    def to_dataframe(self):
+        """ μετατροπή σε pandas.DataFrame χωρίς αντιγραφή των πινάκων (όπου το επιτρέπει το pandas) """
+        import pandas as pd
+        return pd.DataFrame(self._columns, copy=False)
+
+    def to_structured_array(self):
+        """
+        Returns:
+            (np.ndarray): δομημένος πίνακας NumPy με ένα πεδίο ανά στήλη
+        """
+        array = np.empty(len(self), dtype=[(name, values.dtype) for name, values in self._columns.items()])
+        for name, values in self._columns.items():
+            array[name] = values
+        return array
+
+    def save_npy(self, path):
+        """ 
+        αποθήκευση των στηλών ως δομημένος πίνακας σε αρχείο .npy (βλ. load_npy). Τα ονόματα στηλών με μη-ASCII
+        χαρακτήρες (π.χ. "dT (Ν)") απαιτούν την έκδοση 3.0 της μορφής .npy (NumPy >= 1.17).
+        """
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="Stored array in format 3.0", category=UserWarning)
+            np.save(path, self.to_structured_array())
+
+    @classmethod
+    def load_npy(cls, path):
+        array = np.load(path)
+        return cls({name: array[name] for name in array.dtype.names})
+
+    def to_arrow(self):
+        """ μετατροπή σε pyarrow.Table (απαιτεί το pyarrow) """
+        import pyarrow as pa
+        return pa.table(self._columns)
+
+    def to_parquet(self, path):
+        """ αποθήκευση σε αρχείο Parquet (απαιτεί το pyarrow) """
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
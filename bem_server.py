@@ -0,0 +1,368 @@
+#%%
+"""
+Τοπικός διακομιστής (asyncio, HTTP/JSON σε TCP του localhost ή σε UNIX socket) που κρατά φορτωμένους τους ρότορες
+(Hansen_Algorithm με τους πίνακες της αεροτομής ήδη υπολογισμένους), ώστε τα εργαλεία που τον χρησιμοποιούν να μην
+ξαναδιαβάζουν τα αρχεία. Οι αιτήσεις για τον ίδιο ρότορα που φτάνουν μέσα σε ένα μικρό χρονικό παράθυρο συγκεντρώνονται
+σε μία παρτίδα (micro-batching) και επιλύονται με μία κλήση της Hansen_Algorithm.operating_points. Δεν χρησιμοποιείται
+τίποτα εκτός της τοπικής μηχανής.
+
+    python bem_server.py --port 8765
+    python bem_server.py --unix /tmp/bem.sock --rotor DTU=blade_geom_DTU.json:csv_data_file_DTU.csv
+
+Αιτήσεις:
+    POST /evaluate   {"rotor": "DTU", "wind_speed": [8, 10], "rotation_speed": 1.0, "pitch_offset": 0, "per_section": false}
+    GET  /stats      χρόνοι απόκρισης (εκατοστημόρια) και μεγέθη παρτίδων
+    GET  /rotors     οι διαθέσιμοι ρότορες
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+DEFAULT_PORT = 8765
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+_OUTPUT_KEYS = ("power", "torque", "thrust", "Cp", "CT")
+
+class RequestError(ValueError):
+    """ σφάλμα στα δεδομένα μιας αίτησης (απάντηση 400) """
+
+def _to_json(value):
+    """ πίνακες NumPy σε λίστες, με None στη θέση των nan/inf (που δεν υπάρχουν στο JSON) """
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    array = np.asarray(value)
+    if array.dtype.kind == 'f':
+        return np.where(np.isfinite(array), array, None).tolist()
+    return array.tolist()
+
+
+class ServerStats:
+    """ οι χρόνοι απόκρισης των αιτήσεων και τα μεγέθη των παρτίδων (τα τελευταία history) """
+    def __init__(self, history=10000):
+        self.latencies = deque(maxlen=history) # s
+        self.batch_requests = deque(maxlen=history)
+        self.batch_points = deque(maxlen=history)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+
+    def record_request(self, latency, failed=False):
+        self.latencies.append(latency)
+        self.requests += 1
+        self.errors += bool(failed)
+
+    def record_batch(self, requests, points):
+        self.batch_requests.append(requests)
+        self.batch_points.append(points)
+        self.batches += 1
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        Returns:
+            (dict): το πλήθος αιτήσεων, σφαλμάτων και παρτίδων, τα εκατοστημόρια του χρόνου απόκρισης σε ms
+            και το μέσο/μέγιστο πλήθος αιτήσεων και σημείων λειτουργίας ανά παρτίδα
+        """
+        summary = {"requests": self.requests, "errors": self.errors, "batches": self.batches}
+        if self.latencies:
+            values = np.percentile(np.array(self.latencies) * 1e3, percentiles)
+            summary["latency_ms"] = {f"p{p}": float(value) for p, value in zip(percentiles, values)}
+            summary["latency_ms"]["max"] = float(max(self.latencies) * 1e3)
+        if self.batch_requests:
+            summary["batch_requests"] = {"mean": float(np.mean(self.batch_requests)), "max": int(max(self.batch_requests))}
+            summary["batch_points"] = {"mean": float(np.mean(self.batch_points)), "max": int(max(self.batch_points))}
+        return summary
+
+
+class MicroBatcher:
+    """
+    Συγκέντρωση των αιτήσεων ενός ρότορα: η πρώτη αίτηση μιας παρτίδας ξεκινά ένα παράθυρο window δευτερολέπτων και
+    όσες αιτήσεις (με τον ίδιο solver) φτάσουν μέσα σε αυτό επιλύονται μαζί, σε νήμα του executor ώστε ο βρόχος του asyncio
+    να δέχεται στο μεταξύ νέες αιτήσεις. Η παρτίδα επιλύεται νωρίτερα αν ξεπεράσει τα max_points σημεία λειτουργίας.
+    """
+    def __init__(self, hansen, executor, stats, window=0.002, max_points=4096):
+        self.hansen = hansen
+        self.executor = executor
+        self.stats = stats
+        self.window = window
+        self.max_points = max_points
+        self._pending = {} # solver -> λίστα με (σημεία λειτουργίας, future)
+        self._timers = {}
+        self._tasks = set() # οι παρτίδες που επιλύονται (ο βρόχος κρατά μόνο ασθενείς αναφορές στα tasks)
+
+    async def evaluate(self, points, solver='fixed_point'):
+        """
+        Args:
+            points (np.ndarray): σημεία λειτουργίας (n, 3): V0, ω, μεταβολή της γωνίας βήματος
+
+        Returns:
+            (dict): τα αποτελέσματα της operating_points για τα σημεία της αίτησης
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(solver, [])
+        pending.append((points, future))
+        if sum(len(request_points) for request_points, _ in pending) >= self.max_points:
+            self._flush(solver)
+        elif solver not in self._timers:
+            self._timers[solver] = loop.call_later(self.window, self._flush, solver)
+        return await future
+
+    def _flush(self, solver):
+        timer = self._timers.pop(solver, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(solver, [])
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch, solver))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self):
+        """
+        τερματισμός: οι αιτήσεις που περιμένουν ακόμη το παράθυρο ακυρώνονται και οι παρτίδες που επιλύονται ήδη
+        ολοκληρώνονται, ώστε να μην εκτελούνται στον executor μετά τον τερματισμό του
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for batch in self._pending.values():
+            for _, future in batch:
+                future.cancel()
+        self._pending.clear()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, batch, solver):
+        loop = asyncio.get_running_loop()
+        sizes = [len(points) for points, _ in batch]
+        self.stats.record_batch(len(batch), sum(sizes))
+        try:
+            results = await loop.run_in_executor(self.executor, self._solve_batch, [points for points, _ in batch], solver)
+        except Exception as error: # (π.χ. γωνία προσβολής εκτός του πίνακα της αεροτομής)
+            if len(batch) == 1:
+                results = [error]
+            else: # κάθε αίτηση επιλύεται χωριστά, ώστε μια λανθασμένη αίτηση να μην επηρεάζει τις υπόλοιπες
+                results = await asyncio.gather(*(loop.run_in_executor(self.executor, self._solve_batch, [points], solver)
+                                                 for points, _ in batch), return_exceptions=True)
+                results = [result if isinstance(result, Exception) else result[0] for result in results]
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _solve_batch(self, batch_points, solver):
+        """ επίλυση όλων των σημείων της παρτίδας με μία κλήση και διαχωρισμός των αποτελεσμάτων ανά αίτηση """
+        points = np.concatenate(batch_points)
+        res = self.hansen.operating_points(points[:, 0], points[:, 1], points[:, 2], per_section=True, solver=solver)
+        results = []
+        start = 0
+        for request_points in batch_points:
+            rows = slice(start, start + len(request_points))
+            result = {key: res[key][rows] for key in _OUTPUT_KEYS}
+            result["iterations"] = int(res["sections"]["counter"][rows].sum())
+            result["sections"] = {key: value[rows] for key, value in res["sections"].items()}
+            results.append(result)
+            start += len(request_points)
+        return results
+
+
+class BEMServer:
+    """
+    Ο διακομιστής: ένας MicroBatcher για κάθε ρότορα και ένας απλός αναλυτής HTTP/1.1 (με keep-alive) πάνω στα streams του asyncio
+    """
+    def __init__(self, rotors, window=0.002, max_points=4096, workers=1):
+        """
+        Args:
+            rotors (dict): όνομα -> Hansen_Algorithm
+            window (float, optional): το παράθυρο συγκέντρωσης των αιτήσεων σε s. Defaults to 0.002.
+            max_points (int, optional): το μέγιστο πλήθος σημείων λειτουργίας ανά παρτίδα. Defaults to 4096.
+            workers (int, optional): τα νήματα επίλυσης (κοινά για όλους τους ρότορες). Defaults to 1.
+        """
+        self.rotors = dict(rotors)
+        self.stats = ServerStats()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bem-solve")
+        self.batchers = {name: MicroBatcher(hansen, self.executor, self.stats, window, max_points)
+                         for name, hansen in self.rotors.items()}
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        """ 
+        εκκίνηση σε TCP (host, port) ή, αν δοθεί το unix_path, σε UNIX socket. Με port=0 επιλέγεται ελεύθερη θύρα.
+        Πριν από την εκκίνηση κάθε ρότορας επιλύεται μία φορά, ώστε η πρώτη αίτηση να μην περιμένει τη μεταγλώττιση του πυρήνα.
+        """
+        for hansen in self.rotors.values():
+            hansen.operating_points(10.0, 1.0)
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.close()
+        self.executor.shutdown()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, payload = await self._dispatch(method, path, body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass # (η σύνδεση έκλεισε ή η αίτηση δεν ήταν έγκυρη HTTP)
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if path == '/stats' and method == 'GET':
+            return 200, self.stats.summary()
+        if path == '/rotors' and method == 'GET':
+            return 200, {name: {"R": float(hansen.R), "B": hansen.B, "no_sections": hansen.no_sections,
+                                "uses_reynolds": hansen.uses_reynolds} for name, hansen in self.rotors.items()}
+        if path == '/evaluate':
+            if method != 'POST':
+                return 405, {"error": "Η /evaluate δέχεται μόνο POST"}
+            start = time.perf_counter()
+            try:
+                result = await self.evaluate(json.loads(body or b'{}'))
+                status = 200
+            except (RequestError, json.JSONDecodeError) as error:
+                result, status = {"error": str(error)}, 400
+            except Exception as error: # (σφάλμα του αλγορίθμου για τα σημεία της αίτησης)
+                result, status = {"error": f"{type(error).__name__}: {error}"}, 500
+            self.stats.record_request(time.perf_counter() - start, failed=status != 200)
+            return status, result
+        return 404, {"error": f"Άγνωστη διαδρομή {path}"}
+
+    async def evaluate(self, request):
+        """
+        υπολογισμός μιας αίτησης (λεξικό της μορφής του σώματος της POST /evaluate) μέσω του MicroBatcher του ρότορα
+
+        Raises:
+            RequestError: για άγνωστο ρότορα ή solver ή για σημεία λειτουργίας που δεν είναι έγκυρα
+
+        Returns:
+            (dict): λίστες "power", "torque", "thrust", "Cp", "CT" (ένα στοιχείο ανά σημείο), το "iterations" και,
+            με "per_section": true, λεξικό "sections" με λίστες [σημείο][τμήμα]
+        """
+        if not isinstance(request, dict):
+            raise RequestError("Η αίτηση πρέπει να είναι αντικείμενο JSON")
+        name = request.get("rotor", next(iter(self.rotors)))
+        if name not in self.batchers:
+            raise RequestError(f"Άγνωστος ρότορας {name!r} (διαθέσιμοι: {list(self.rotors)})")
+        solver = request.get("solver", 'fixed_point')
+        if solver not in ('fixed_point', 'bracketed'):
+            raise RequestError(f"Άγνωστη μέθοδος επίλυσης {solver!r}")
+        try:
+            columns = np.broadcast_arrays(*[np.asarray(request.get(key, default), dtype=float) for key, default in (
+                ("wind_speed", None), ("rotation_speed", None), ("pitch_offset", 0.0))])
+        except (TypeError, ValueError) as error:
+            raise RequestError(f"Μη έγκυρα σημεία λειτουργίας: {error}") from None
+        points = np.stack([np.ravel(column) for column in columns], axis=-1)
+        if not points.size or not np.all(np.isfinite(points)) or np.any(points[:, 0] <= 0):
+            raise RequestError("Τα σημεία λειτουργίας πρέπει να είναι πεπερασμένα, με θετικές ταχύτητες ανέμου")
+        result = await self.batchers[name].evaluate(points, solver)
+        if not request.get("per_section", False):
+            result = {key: value for key, value in result.items() if key != "sections"}
+        return _to_json(result)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self._unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._unix_path)
+
+def request(path, payload=None, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, timeout=30):
+    """
+    απλός (συγχρονισμένος) πελάτης για scripts και notebooks, π.χ. request("/evaluate", {"wind_speed": 10, "rotation_speed": 1})
+
+    Raises:
+        RuntimeError: αν ο διακομιστής απαντήσει με σφάλμα
+
+    Returns:
+        (dict): η απάντηση του διακομιστή
+    """
+    connection = _UnixHTTPConnection(unix_path, timeout) if unix_path else http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        if payload is None:
+            connection.request("GET", path)
+        else:
+            connection.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        data = json.loads(response.read() or b'{}')
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{response.status}: {data.get('error')}")
+    return data
+
+
+def _parse_rotor(spec):
+    """ 'όνομα=γεωμετρία.json[:αεροτομή.csv]' -> (όνομα, αρχείο γεωμετρίας, αρχείο αεροτομής) """
+    name, _, files = spec.partition('=')
+    geometry_file, _, polar_file = files.partition(':')
+    if not name or not geometry_file:
+        raise argparse.ArgumentTypeError(f"Μη έγκυρος ρότορας {spec!r} (αναμενόταν όνομα=γεωμετρία.json[:αεροτομή.csv])")
+    return name, geometry_file, polar_file or 'csv_data_file_DTU.csv'
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Τοπικός διακομιστής υπολογισμών BEM με συγκέντρωση αιτήσεων")
+    parser.add_argument("--host", default="127.0.0.1", help="η διεύθυνση (μόνο τοπική, εκτός αν δοθεί ρητά άλλη)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="UNIX socket αντί για TCP")
+    parser.add_argument("--rotor", type=_parse_rotor, action="append",
+                        help="όνομα=γεωμετρία.json[:αεροτομή.csv] (μπορεί να δοθεί πολλές φορές)")
+    parser.add_argument("--window-ms", type=float, default=2.0, help="το παράθυρο συγκέντρωσης των αιτήσεων σε ms")
+    parser.add_argument("--max-points", type=int, default=4096, help="το μέγιστο πλήθος σημείων λειτουργίας ανά παρτίδα")
+    args = parser.parse_args(argv)
+
+    from _algorithmos_DTU import Hansen_Algorithm
+    rotors = {name: Hansen_Algorithm(geometry_file, csv_data_file=polar_file)
+              for name, geometry_file, polar_file in args.rotor or [("DTU", "blade_geom_DTU.json", "csv_data_file_DTU.csv")]}
+    server = await BEMServer(rotors, window=args.window_ms * 1e-3, max_points=args.max_points).start(args.host, args.port, args.unix)
+    print(f"Ο διακομιστής ακούει στο {args.unix or server.address} με τους ρότορες {list(rotors)}")
+    await server.serve_forever()
+
+if __name__ == "__main__":
+    asyncio.run(main())
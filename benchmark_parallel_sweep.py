@@ -0,0 +1,37 @@
+#%%
+"""
+Χρόνος υπολογισμού ενός μεγάλου πλέγματος σημείων λειτουργίας με την operating_grid (μία διεργασία) και με τον
+ParallelSweep για διάφορα πλήθη διεργασιών, και η επιτάχυνση σε σχέση με τη μία διεργασία.
+
+    python benchmark_parallel_sweep.py
+"""
+import os
+import time
+import numpy as np
+from _algorithmos_DTU import Hansen_Algorithm
+from parallel_sweep import ParallelSweep
+
+def run(n_wind_speeds=40, n_rotation_speeds=100, pitch_offsets_deg=(0, 2, 4, 6), processes=None):
+    hansen = Hansen_Algorithm("blade_geom_DTU.json")
+    wind_speeds = np.linspace(4, 25, n_wind_speeds)
+    rotation_speeds = 2 * np.pi * np.linspace(1, 25, n_rotation_speeds) / 60
+    hansen.operating_grid(wind_speeds[:2], rotation_speeds[:2]) # (μεταγλώττιση του πυρήνα numba)
+    start = time.perf_counter()
+    expected = hansen.operating_grid(wind_speeds, rotation_speeds, pitch_offsets_deg)
+    serial = time.perf_counter() - start
+    print(f"{expected['power'].size} σημεία λειτουργίας, operating_grid: {serial:.2f} s")
+
+    rows = []
+    for n in processes or sorted({1, 2, 4, os.cpu_count() or 1}):
+        with ParallelSweep(hansen, processes=n) as sweep:
+            sweep.operating_grid(wind_speeds[:2], rotation_speeds[:2]) # (εκκίνηση των διεργασιών)
+            start = time.perf_counter()
+            grid = sweep.operating_grid(wind_speeds, rotation_speeds, pitch_offsets_deg)
+            elapsed = time.perf_counter() - start
+        assert np.array_equal(grid["power"], expected["power"], equal_nan=True)
+        rows.append((n, elapsed, serial / elapsed))
+        print(f"{n:3d} διεργασίες: {elapsed:6.2f} s, επιτάχυνση {serial / elapsed:5.2f}")
+    return rows
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,61 @@
+#%%
+"""
+Σύγκριση του κόστους ανά αναζήτηση των συντελεστών Cl, Cd, Cm: πίνακας (γωνία, t/c) όπως μέχρι σήμερα και
+πίνακας (γωνία, t/c, Re) με την επιπλέον παρεμβολή ως προς log(Re). Οι πίνακες για τα διάφορα Re δημιουργούνται
+από το csv_data_file_DTU.csv (με τον Cl πολλαπλασιασμένο με έναν συντελεστή ανά Re) σε προσωρινό φάκελο.
+
+    python benchmark_polar_lookup.py
+"""
+import os
+import tempfile
+import timeit
+import numpy as np
+from Dtu_table import DTU_calc
+
+REYNOLDS_FACTORS = {1e6: 0.9, 3e6: 1.0, 1e7: 1.05, 3e7: 1.1} # Re: συντελεστής του Cl
+
+def write_reynolds_csv(dtu, path):
+    with open(path, mode='w') as file:
+        file.write('Re,t/c ratio,alpha,cl,cd,cm\n')
+        for re, factor in REYNOLDS_FACTORS.items():
+            for tc, family in zip(dtu.tc_values.tolist(), dtu.coefs.tolist()):
+                for angle, (cl, cd, cm) in zip(dtu.angles.tolist(), family):
+                    file.write(f"{re!r},{tc!r},{angle!r},{cl * factor!r},{cd!r},{cm!r}\n")
+
+def per_call_us(function, number):
+    """ ο καλύτερος χρόνος ανά κλήση σε μs """
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+def run(n=1000, angle_step=0.5):
+    rng = np.random.default_rng(0)
+    dtu = DTU_calc('csv_data_file_DTU.csv', angle_step=angle_step, use_cache=False)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_file = os.path.join(temp_dir, 'polars_re.csv')
+        write_reynolds_csv(DTU_calc('csv_data_file_DTU.csv', use_cache=False), csv_file)
+        dtu_re = DTU_calc(csv_file, angle_step=angle_step, use_cache=False)
+
+    angles = rng.uniform(-10, 20, n)
+    tc_ratios = rng.uniform(dtu.tc_values[0], dtu.tc_values[-1], n)
+    reynolds = 10**rng.uniform(6, 7.5, n)
+    section_index = rng.integers(0, 10, n)
+    polars = dtu.blend(np.linspace(dtu.tc_values[0], dtu.tc_values[-1], 10))
+    polars_re = dtu_re.blend(np.linspace(dtu.tc_values[0], dtu.tc_values[-1], 10))
+
+    rows = [
+        ("DTU_calc, μία τιμή", 1,
+         per_call_us(lambda: dtu.coefficients(7.5, 40.0), 2000),
+         per_call_us(lambda: dtu_re.coefficients(7.5, 40.0, reynolds=2e6), 2000)),
+        (f"DTU_calc, πίνακας {n} τιμών", n,
+         per_call_us(lambda: dtu.coefficients(angles, tc_ratios), 50),
+         per_call_us(lambda: dtu_re.coefficients(angles, tc_ratios, reynolds), 50)),
+        (f"SectionPolars, πίνακας {n} τιμών", n,
+         per_call_us(lambda: polars.coefficients(angles, section_index), 200),
+         per_call_us(lambda: polars_re.coefficients(angles, section_index, reynolds), 200)),
+    ]
+    print(f"{'αναζήτηση':36s} {'(α, t/c) ns':>12s} {'(α, t/c, Re) ns':>16s} {'λόγος':>7s}")
+    for name, size, time_2d, time_3d in rows:
+        print(f"{name:36s} {time_2d / size * 1e3:12.1f} {time_3d / size * 1e3:16.1f} {time_3d / time_2d:7.2f}")
+    return rows
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,143 @@
+#%%
+"""
+Γεωμετρία του πτερυγίου (ακτινικές θέσεις, χορδές, γωνίες βήματος και λόγοι t/c των τμημάτων) σε πίνακες NumPy
+μόνο για ανάγνωση, με ανάγνωση/αποθήκευση σε αρχείο json (όπως το blade_geom_DTU.json) και επαναδειγματοληψία
+σε οποιοδήποτε πλήθος τμημάτων. Κάθε επαναδειγματοληψία υπολογίζεται μία φορά για κάθε (n, spacing) και
+επαναχρησιμοποιείται, ώστε η δημιουργία πολλών αλγορίθμων για την ίδια γεωμετρία να μην επαναλαμβάνει την παρεμβολή.
+"""
+import json
+import math
+import numpy as np
+
+class BladeGeometry:
+    """
+    Αμετάβλητη γεωμετρία πτερυγίου: μετά τη δημιουργία δεν αλλάζουν ούτε τα πεδία ούτε οι πίνακες
+    (οι πίνακες είναι μόνο για ανάγνωση), επομένως το ίδιο αντικείμενο μπορεί να χρησιμοποιείται από πολλούς αλγορίθμους.
+    """
+    __slots__ = ('R', 'r_is', 'chords', 'pitch', 'tc_ratios', '_resampled')
+    version = "1.0" # η έκδοση της μορφής του αρχείου json ("blade_geom_version")
+    spacings = ('linear', 'cosine') # οι διαθέσιμες κατανομές των τμημάτων της resample
+
+    def __init__(self, r_is, chords, pitch, tc_ratios=None, R=None):
+        """
+        Args:
+            r_is (array_like): οι ακτινικές θέσεις των τμημάτων σε m, με αύξουσα σειρά
+            chords (array_like): τα μήκη χορδής των τμημάτων σε m
+            pitch (array_like or float): οι γωνίες βήματος των τμημάτων σε μοίρες (ή μία για όλα τα τμήματα)
+            tc_ratios (array_like, optional): οι λόγοι t/c των τμημάτων. Defaults to None.
+            R (float, optional): η ακτίνα του ρότορα σε m. Defaults to None (δηλ. η τελευταία ακτινική θέση).
+
+        Raises:
+            ValueError: αν οι πίνακες δεν έχουν το ίδιο μήκος, οι ακτινικές θέσεις δεν είναι γνησίως αύξουσες,
+                υπάρχουν μη πεπερασμένες τιμές ή μη θετικές χορδές ή η ακτίνα R είναι μικρότερη από την τελευταία θέση
+        """
+        r_is = self._read_only(r_is, "r_is")
+        if r_is.size < 2 or np.any(np.diff(r_is) <= 0):
+            raise ValueError("Οι ακτινικές θέσεις r_is πρέπει να είναι τουλάχιστον δύο και γνησίως αύξουσες")
+        chords = self._read_only(chords, "chords", r_is.size)
+        if np.any(chords <= 0):
+            raise ValueError("Τα μήκη χορδής πρέπει να είναι θετικά")
+        pitch = self._read_only(np.broadcast_to(np.asarray(pitch, dtype=float), r_is.shape), "pitch", r_is.size)
+        if tc_ratios is not None:
+            tc_ratios = self._read_only(tc_ratios, "tc_ratios", r_is.size)
+        R = float(r_is[-1] if R is None else R)
+        if not R >= r_is[-1]:
+            raise ValueError(f"Η ακτίνα R = {R} είναι μικρότερη από την τελευταία ακτινική θέση {r_is[-1]}")
+        for name, value in (('r_is', r_is), ('chords', chords), ('pitch', pitch), ('tc_ratios', tc_ratios), ('R', R)):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_resampled', {})
+
+    @staticmethod
+    def _read_only(values, name, size=None):
+        array = np.array(values, dtype=float) # πάντα αντίγραφο, ώστε να μην αλλάζει από τον πίνακα του χρήστη
+        if array.ndim != 1 or (size is not None and array.size != size):
+            raise ValueError(f"Ο πίνακας {name} πρέπει να είναι μονοδιάστατος με {size} τιμές (έχει σχήμα {array.shape})")
+        if not np.all(np.isfinite(array)):
+            raise ValueError(f"Ο πίνακας {name} περιέχει μη πεπερασμένες τιμές")
+        array.setflags(write=False)
+        return array
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Η BladeGeometry είναι αμετάβλητη (δεν αλλάζει το {name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Η BladeGeometry είναι αμετάβλητη (δεν διαγράφεται το {name})")
+
+    def __reduce__(self):
+        # (pickle: δημιουργία από τους πίνακες, αφού η __setattr__ δεν επιτρέπει την αντιγραφή των πεδίων)
+        return type(self), (self.r_is, self.chords, self.pitch, self.tc_ratios, self.R)
+
+    def __repr__(self):
+        return f"BladeGeometry(no_sections={self.no_sections}, R={self.R})"
+
+    @property
+    def no_sections(self):
+        return self.r_is.size
+
+    def resample(self, n=10, spacing='linear'):
+        """
+        η γεωμετρία σε n τμήματα από την πρώτη ως την τελευταία ακτινική θέση, με γραμμική παρεμβολή
+        των χορδών, των γωνιών βήματος και των λόγων t/c (όπως η blade_geometry_seperation).
+        Το αποτέλεσμα αποθηκεύεται και επιστρέφεται το ίδιο αντικείμενο στις επόμενες κλήσεις με τα ίδια ορίσματα.
+
+        Args:
+            n (int, optional): το πλήθος των τμημάτων. Defaults to 10.
+            spacing (str, optional): 'linear' για ίσες αποστάσεις ή 'cosine' για πυκνότερα τμήματα κοντά
+                στη ρίζα και στο ακροπτερύγιο. Defaults to 'linear'.
+
+        Returns:
+            (BladeGeometry): η νέα γεωμετρία
+        """
+        if spacing not in self.spacings:
+            raise ValueError(f"Άγνωστη κατανομή {spacing!r} (επιτρεπτές: {self.spacings})")
+        if n < 2:
+            raise ValueError("Το πλήθος των τμημάτων πρέπει να είναι τουλάχιστον 2")
+        key = (int(n), spacing)
+        resampled = self._resampled.get(key)
+        if resampled is None:
+            r_first, r_last = self.r_is[0], self.r_is[-1]
+            if spacing == 'linear':
+                r_new = np.linspace(r_first, r_last, key[0])
+            else:
+                r_new = r_first + (r_last - r_first) * (1 - np.cos(np.linspace(0, math.pi, key[0]))) / 2
+                r_new[[0, -1]] = r_first, r_last
+            resampled = BladeGeometry(
+                r_new, np.interp(r_new, self.r_is, self.chords), np.interp(r_new, self.r_is, self.pitch),
+                None if self.tc_ratios is None else np.interp(r_new, self.r_is, self.tc_ratios), self.R)
+            self._resampled[key] = resampled
+        return resampled
+
+    def to_dict(self):
+        data = {
+            "blade_geom_version": self.version,
+            "R": self.R,
+            "r_is": self.r_is.tolist(),
+            "chords": self.chords.tolist(),
+            "pitch": self.pitch.tolist(),
+        }
+        if self.tc_ratios is not None:
+            data["tc_ratios"] = self.tc_ratios.tolist()
+        data["no_sections"] = self.no_sections
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        δημιουργία από λεξικό της μορφής του blade_geom_DTU.json
+
+        Raises:
+            ValueError: αν το "no_sections" δεν συμφωνεί με το μήκος των πινάκων
+        """
+        no_sections = data.get("no_sections")
+        if no_sections is not None and no_sections != len(data["r_is"]):
+            raise ValueError(f'Το "no_sections" = {no_sections} δεν συμφωνεί με τις {len(data["r_is"])} ακτινικές θέσεις')
+        return cls(data["r_is"], data["chords"], data["pitch"], data.get("tc_ratios"), data.get("R"))
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls.from_dict(json.load(file))
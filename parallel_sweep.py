@@ -0,0 +1,221 @@
+#%%
+"""
+Παράλληλος υπολογισμός πλεγμάτων σημείων λειτουργίας (όπως η Hansen_Algorithm.operating_grid) σε πολλές διεργασίες.
+Οι πίνακες της αεροτομής και της γεωμετρίας δημοσιεύονται μία φορά σε κοινόχρηστη μνήμη (multiprocessing.shared_memory)
+και κάθε διεργασία δημιουργεί από αυτούς τον δικό της αλγόριθμο μία φορά, αντί να λαμβάνει με pickle ολόκληρο το DTU_calc
+σε κάθε εργασία. Τα σημεία λειτουργίας μοιράζονται σε τμήματα (chunks) και κάθε διεργασία γράφει τα αποτελέσματα
+του τμήματός της στις γραμμές του σε έναν προκαθορισμένο πίνακα αποτελεσμάτων, επίσης σε κοινόχρηστη μνήμη,
+επομένως η σειρά των αποτελεσμάτων δεν εξαρτάται από τη σειρά με την οποία τελειώνουν οι εργασίες.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from blade_geometry import BladeGeometry
+from Dtu_table import DTU_calc
+
+_ALIGNMENT = 64 # bytes, η στοίχιση κάθε πίνακα μέσα στο μπλοκ κοινόχρηστης μνήμης
+
+class SharedArrays:
+    """
+    Πίνακες NumPy σε ένα μπλοκ κοινόχρηστης μνήμης. Η διεργασία που τους δημιουργεί (owner) διαγράφει το μπλοκ στην close,
+    ενώ οι διεργασίες που συνδέονται με την attach απλώς το κλείνουν.
+    """
+    def __init__(self, shm, layout, owner):
+        self._shm = shm
+        self.layout = layout # όνομα -> (dtype, σχήμα, θέση σε bytes)
+        self.owner = owner
+        self.arrays = {name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+                       for name, (dtype, shape, offset) in layout.items()}
+
+    @classmethod
+    def create(cls, arrays):
+        """
+        αντιγραφή των πινάκων arrays (λεξικό όνομα -> πίνακας ή (dtype, σχήμα) για πίνακα χωρίς αρχικές τιμές) σε νέο μπλοκ
+
+        Returns:
+            (SharedArrays): οι πίνακες στο νέο μπλοκ
+        """
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            dtype, shape = (array.dtype, array.shape) if isinstance(array, np.ndarray) else (np.dtype(array[0]), tuple(array[1]))
+            offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+            layout[name] = (dtype.str, shape, offset)
+            offset += dtype.itemsize * int(np.prod(shape))
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        shared = cls(shm, layout, owner=True)
+        for name, array in arrays.items():
+            if isinstance(array, np.ndarray):
+                shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor, writable=False):
+        """ σύνδεση με το μπλοκ του descriptor (βλ. descriptor). Με writable=False οι πίνακες είναι μόνο για ανάγνωση. """
+        name, layout = descriptor
+        shared = cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+        if not writable:
+            for array in shared.arrays.values():
+                array.setflags(write=False)
+        return shared
+
+    @property
+    def descriptor(self):
+        """ το όνομα του μπλοκ και η διάταξη των πινάκων (μικρή πλειάδα που στέλνεται με pickle στις διεργασίες) """
+        return self._shm.name, self.layout
+
+    def close(self):
+        self.arrays = {} # οι πίνακες δείχνουν στη μνήμη του μπλοκ και πρέπει να απελευθερωθούν πριν κλείσει
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# η κατάσταση κάθε διεργασίας: οι πίνακες εισόδου και ο αλγόριθμος που δημιουργήθηκε από αυτούς (βλ. _init_worker)
+_worker = {}
+
+def _rotor_arrays(hansen):
+    """ οι πίνακες της γεωμετρίας και της αεροτομής του αλγορίθμου hansen που δημοσιεύονται στην κοινόχρηστη μνήμη """
+    geometry = hansen.geometry
+    tables = hansen.airfoil_calc.tables # (όλοι οι πίνακες από την ίδια ανάγνωση του αρχείου)
+    arrays = {"r_is": geometry.r_is, "chords": geometry.chords, "pitch": geometry.pitch}
+    if geometry.tc_ratios is not None:
+        arrays["tc_ratios"] = geometry.tc_ratios
+    arrays["tc_values"] = tables.tc_values
+    arrays["angles"] = tables.original_angles
+    if tables.re_values is None:
+        arrays["coefs"] = tables.original_coefs
+    else:
+        arrays["coefs"] = tables.original_re_coefs
+        arrays["re_values"] = tables.re_values
+    return {name: np.ascontiguousarray(array, dtype=float) for name, array in arrays.items()}
+
+def _rotor_settings(hansen):
+    """ οι (λίγες) ρυθμίσεις που χρειάζονται για να δημιουργηθεί ο ίδιος αλγόριθμος σε άλλη διεργασία """
+    return {
+        "R": float(hansen.geometry.R), "B": hansen.B, "air_density": hansen.air_density,
+        "kinematic_viscosity": hansen.kinematic_viscosity, "backend": hansen.backend, "config": hansen.config,
+        "angle_step": hansen.airfoil_calc.angle_step, "reynolds": hansen.airfoil_calc.reynolds,
+    }
+
+def _build_rotor(arrays, settings):
+    """ ο αλγόριθμος από τους πίνακες της _rotor_arrays (χωρίς αντιγραφή των πινάκων της αεροτομής) """
+    from _algorithmos_DTU import Hansen_Algorithm
+    geometry = BladeGeometry(arrays["r_is"], arrays["chords"], arrays["pitch"], arrays.get("tc_ratios"), settings["R"])
+    airfoil = DTU_calc.from_arrays(arrays["tc_values"], arrays["angles"], arrays["coefs"], arrays.get("re_values"),
+                                   angle_step=settings["angle_step"], reynolds=settings["reynolds"])
+    hansen = Hansen_Algorithm(geometry, B=settings["B"], air_density=settings["air_density"], csv_data_file=airfoil,
+                              backend=settings["backend"], kinematic_viscosity=settings["kinematic_viscosity"], num_sections=None,
+                              config=settings["config"])
+    return hansen
+
+def _init_worker(descriptor, settings):
+    shared = SharedArrays.attach(descriptor)
+    _worker["shared"] = shared # κρατείται ανοιχτό όσο ζει η διεργασία, αφού οι πίνακες της αεροτομής δείχνουν σε αυτό
+    _worker["hansen"] = _build_rotor(shared.arrays, settings)
+
+def _solve_chunk(result_descriptor, start, points, solver, config):
+    """
+    επίλυση των σημείων λειτουργίας points (n, 3) και εγγραφή των μεγεθών των τμημάτων στις γραμμές start:start+n
+    του πίνακα αποτελεσμάτων result_descriptor
+
+    Returns:
+        (int): το πλήθος των επαναλήψεων
+    """
+    hansen = _worker["hansen"]
+    res = hansen.sections_calculation(
+        wind_speed_V0=points[:, 0, None], omega_rad_sec=points[:, 1, None],
+        r=hansen.r_is, chord=hansen.chords, pitch_angle_deg=hansen.pitch + points[:, 2, None],
+        twist_deg=0, tc_ratio=hansen.tc_ratios, section_index=np.arange(hansen.no_sections), solver=solver,
+        config=config)
+    with SharedArrays.attach(result_descriptor, writable=True) as results:
+        for key, array in results.arrays.items():
+            array[start:start + len(points)] = res[key]
+    return int(res["counter"].sum())
+
+
+class ParallelSweep:
+    """
+    Εκτελεστής πλεγμάτων σημείων λειτουργίας σε μια δεξαμενή διεργασιών (ProcessPoolExecutor) για έναν αλγόριθμο.
+    Οι πίνακες του αλγορίθμου αντιγράφονται στην κοινόχρηστη μνήμη κατά τη δημιουργία, επομένως αλλαγές
+    στο αρχείο της αεροτομής μετά από αυτή δεν επηρεάζουν τον εκτελεστή. Χρησιμοποιείται ως context manager:
+
+        with ParallelSweep(hansen) as sweep:
+            grid = sweep.operating_grid(wind_speeds, rotation_speeds)
+    """
+    def __init__(self, hansen, processes=None, chunk_size=None, start_method=None):
+        """
+        Args:
+            hansen (Hansen_Algorithm): ο αλγόριθμος (τα αποτελέσματα είναι ίδια με της hansen.operating_grid)
+            processes (int, optional): το πλήθος των διεργασιών. Defaults to None (δηλ. os.cpu_count()).
+            chunk_size (int, optional): το πλήθος των σημείων λειτουργίας ανά εργασία. Defaults to None
+                (δηλ. περίπου 4 εργασίες ανά διεργασία).
+            start_method (str, optional): 'fork', 'spawn' ή 'forkserver'. Defaults to None (η προεπιλογή της πλατφόρμας).
+        """
+        self.hansen = hansen
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._shared = SharedArrays.create(_rotor_arrays(hansen))
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker, initargs=(self._shared.descriptor, _rotor_settings(hansen)))
+        self._result_fields = {}
+
+    def _get_result_fields(self, solver):
+        """ τα ονόματα και οι τύποι των μεγεθών της sections_calculation, από την επίλυση ενός σημείου """
+        if solver not in self._result_fields:
+            hansen = self.hansen
+            res = hansen.sections_calculation(
+                wind_speed_V0=10.0, omega_rad_sec=1.0, r=hansen.r_is, chord=hansen.chords, pitch_angle_deg=hansen.pitch,
+                twist_deg=0, tc_ratio=hansen.tc_ratios, section_index=np.arange(hansen.no_sections), solver=solver)
+            self._result_fields[solver] = {key: value.dtype for key, value in res.items()}
+        return self._result_fields[solver]
+
+    def operating_grid(self, wind_speeds_V0, rotation_speeds, pitch_offsets_deg=None, per_section=False, solver='fixed_point',
+                       config=None):
+        """
+        η Hansen_Algorithm.operating_grid (χωρίς warm_start και result_cache) με τα σημεία λειτουργίας μοιρασμένα στις διεργασίες
+
+        Returns:
+            (dict): όπως η operating_grid, με επιπλέον το πλήθος των εργασιών "chunks"
+        """
+        hansen = self.hansen
+        config = hansen._get_config(config)
+        V0 = np.atleast_1d(np.asarray(wind_speeds_V0, dtype=float))
+        w_rps = np.atleast_1d(np.asarray(rotation_speeds, dtype=float))
+        pitch_offsets = np.atleast_1d(np.asarray(0.0 if pitch_offsets_deg is None else pitch_offsets_deg, dtype=float))
+        grid_shape = (V0.size, w_rps.size, pitch_offsets.size)
+        points = np.stack(np.meshgrid(V0, w_rps, pitch_offsets, indexing='ij'), axis=-1).reshape(-1, 3)
+        chunk_size = self.chunk_size or max(-(-len(points) // (4 * self.processes)), 1)
+        starts = range(0, len(points), chunk_size)
+
+        fields = self._get_result_fields(solver)
+        with SharedArrays.create({key: (dtype, (len(points), hansen.no_sections)) for key, dtype in fields.items()}) as results:
+            futures = [self._pool.submit(_solve_chunk, results.descriptor, start, points[start:start + chunk_size], solver, config)
+                       for start in starts]
+            for future in futures:
+                future.result() # (οι εξαιρέσεις των διεργασιών εμφανίζονται εδώ)
+            res = {key: array.reshape(grid_shape + (hansen.no_sections,)).copy() for key, array in results.arrays.items()}
+        grid = hansen._grid_from_sections(V0, w_rps, pitch_offsets, res)
+        grid["chunks"] = len(futures)
+        if not per_section:
+            del grid["sections"]
+        return grid
+
+    def close(self):
+        self._pool.shutdown()
+        self._shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
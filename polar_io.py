@@ -0,0 +1,227 @@
+#%%
+"""
+Ενιαία ανάγνωση πινάκων αεροτομών (γωνία προσβολής, Cl, Cd, Cm και προαιρετικά λόγος t/c και αριθμός Reynolds) από αρχεία CSV
+(με διαχωριστικό ',' ή ';') και XLSX. Η μορφή και οι στήλες αναγνωρίζονται αυτόματα από την επέκταση και τις
+επικεφαλίδες, διαβάζονται μόνο οι στήλες που χρειάζονται και οι γραμμές επεξεργάζονται σε τμήματα (chunks): κάθε
+τμήμα μοιράζεται αμέσως στις οικογένειες (Re, t/c) και οι διπλές γραμμές αφαιρούνται, ώστε η μνήμη να εξαρτάται από το
+πλήθος των διαφορετικών σημείων των πινάκων και όχι από το μέγεθος του αρχείου.
+Περιέχει και την κοινή cache των πινάκων σε αρχεία .npz (get_polar_cache_path, load_polar_cache, save_polar_cache),
+που χρησιμοποιούν οι DTU_calc και Naca_calc.
+"""
+import csv
+import hashlib
+import math
+import os
+import re
+import tempfile
+from collections import namedtuple
+import numpy as np
+
+Polars = namedtuple('Polars', ['tc_values', 'angles', 'coefs', 're_values'], defaults=(None,))
+"""
+οι πίνακες μιας ή περισσότερων αεροτομών: tc_values (n_tc), angles (n_angles) σε μοίρες και coefs (n_tc, n_angles, 3)
+με τους συντελεστές Cl, Cd, Cm. Αν το αρχείο δεν έχει στήλη t/c, tc_values = [nan]. Αν το αρχείο έχει στήλη Reynolds,
+re_values (n_re) είναι οι αριθμοί Reynolds και coefs (n_re, n_tc, n_angles, 3), αλλιώς re_values = None.
+"""
+
+# τα ονόματα (με μικρά γράμματα) που αναγνωρίζονται για κάθε στήλη
+COLUMN_NAMES = {
+    "angle": ("angle_of_attack", "aoa_deg", "aoa", "alpha"),
+    "Cl": ("cl", "c_l"),
+    "Cd": ("cd", "c_d"),
+    "Cm": ("cm", "c_m"),
+    "tc": ("t/c ratio", "tcratio", "tc_ratio", "t/c"),
+    "Re": ("re", "reynolds", "reynolds_number"),
+}
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+POLAR_CACHE_VERSION = 2 # αυξάνεται όταν αλλάζει η μορφή των αρχείων της cache
+
+def get_polar_cache_path(csv_data_file, cache_dir=None):
+    """ 
+    η διαδρομή του αρχείου .npz της cache για το αρχείο csv_data_file. Το όνομα περιέχει το hash (sha256) του περιεχομένου
+    του αρχείου, επομένως κάθε αλλαγή στο αρχείο csv οδηγεί σε νέο αρχείο cache. Αν δεν δοθεί το cache_dir,
+    η cache βρίσκεται στον φάκελο .polar_cache δίπλα στο αρχείο csv.
+    """
+    with open(csv_data_file, mode='rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_data_file)), '.polar_cache')
+    name = os.path.splitext(os.path.basename(csv_data_file))[0]
+    return os.path.join(cache_dir, f"{name}-v{POLAR_CACHE_VERSION}-{digest}.npz")
+
+def load_polar_cache(cache_path):
+    """ 
+    ανάγνωση των πινάκων από το αρχείο cache_path
+
+    Returns:
+        (dict): οι πίνακες ή None αν το αρχείο δεν υπάρχει ή δεν διαβάζεται
+    """
+    try:
+        with np.load(cache_path) as arrays:
+            return {key: arrays[key] for key in arrays.files}
+    except (OSError, ValueError):
+        return None
+
+def save_polar_cache(cache_path, **arrays):
+    """ 
+    αποθήκευση των πινάκων στο αρχείο cache_path (μέσω προσωρινού αρχείου, ώστε να μη διαβαστεί ποτέ μισογραμμένο αρχείο).
+    Τα παλαιότερα αρχεία cache του ίδιου αρχείου csv διαγράφονται. Αν ο φάκελος δεν είναι εγγράψιμος, η cache απλώς δεν αποθηκεύεται.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    name = os.path.basename(cache_path).rsplit('-', 2)[0]
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(file, **arrays)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        # μόνο τα αρχεία {name}-v<έκδοση>-<hash>.npz, όχι π.χ. η cache του αρχείου {name}-variant.csv
+        old_cache = re.compile(re.escape(name) + r'-v\d+-[0-9a-f]{16}\.npz')
+        for old_name in os.listdir(cache_dir):
+            old_path = os.path.join(cache_dir, old_name)
+            if old_cache.fullmatch(old_name) and old_path != cache_path:
+                os.remove(old_path)
+    except OSError:
+        pass
+
+def detect_format(path):
+    """ 'xlsx' ή 'csv' ανάλογα με την επέκταση του αρχείου """
+    return 'xlsx' if os.path.splitext(path)[1].lower() in EXCEL_EXTENSIONS else 'csv'
+
+def find_columns(header):
+    """
+    οι θέσεις των στηλών γωνία, Cl, Cd, Cm, t/c, Re στην επικεφαλίδα header (None για όσες δεν υπάρχουν)
+
+    Raises:
+        ValueError: αν λείπει κάποια από τις στήλες γωνία, Cl, Cd
+    """
+    names = [str(name).strip().lower() if name is not None else "" for name in header]
+    indices = {}
+    for column, aliases in COLUMN_NAMES.items():
+        indices[column] = next((names.index(alias) for alias in aliases if alias in names), None)
+    missing = [column for column in ("angle", "Cl", "Cd") if indices[column] is None]
+    if missing:
+        raise ValueError(f"Δεν βρέθηκαν οι στήλες {missing} στην επικεφαλίδα {list(header)}")
+    return tuple(indices.values())
+
+def iter_csv_rows(path):
+    """
+    ανάγνωση ενός αρχείου CSV γραμμή προς γραμμή. Το διαχωριστικό (',' ή ';') αναγνωρίζεται από την επικεφαλίδα
+    και το BOM της κωδικοποίησης UTF-8 αγνοείται.
+
+    Args:
+        path (str): το αρχείο CSV
+
+    Yields:
+        (list): οι τιμές (str) κάθε γραμμής, πρώτα της επικεφαλίδας
+    """
+    with open(path, mode='r', newline='', encoding='utf-8-sig') as file:
+        header_line = file.readline()
+        delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+        yield next(csv.reader([header_line], delimiter=delimiter))
+        yield from csv.reader(file, delimiter=delimiter)
+
+def _iter_xlsx_rows(path, sheet=0):
+    import openpyxl # φορτώνεται μόνο για αρχεία Excel
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[sheet].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def iter_polar_chunks(path, chunk_size=65536, sheet=0):
+    """
+    ανάγνωση του αρχείου σε τμήματα
+
+    Args:
+        path (str): αρχείο CSV ή XLSX με επικεφαλίδες στην πρώτη γραμμή
+        chunk_size (int, optional): το μέγιστο πλήθος γραμμών κάθε τμήματος. Defaults to 65536.
+        sheet (int, optional): το φύλλο του αρχείου Excel. Defaults to 0.
+
+    Yields:
+        (np.ndarray): πίνακες (n, 6) με στήλες γωνία, Cl, Cd, Cm, t/c, Re (nan για τις στήλες που δεν υπάρχουν)
+    """
+    rows = _iter_xlsx_rows(path, sheet) if detect_format(path) == 'xlsx' else iter_csv_rows(path)
+    indices = find_columns(next(rows))
+    chunk = np.empty((chunk_size, len(indices)))
+    n = 0
+    for row in rows:
+        if not row or all(value is None or value == '' for value in row): # κενές γραμμές
+            continue
+        chunk[n] = [math.nan if i is None else float(row[i]) for i in indices]
+        n += 1
+        if n == chunk_size:
+            yield chunk.copy()
+            n = 0
+    if n:
+        yield chunk[:n].copy()
+
+def _merge_family(angle, values, previous=None):
+    """ 
+    οι γραμμές μιας οικογένειας (Re, t/c) ταξινομημένες ως προς τη γωνία, με μία γραμμή ανά γωνία: για διπλές γωνίες
+    κρατείται η τελευταία, και οι γραμμές previous (από προηγούμενα τμήματα) θεωρούνται παλαιότερες
+
+    Returns:
+        (tuple): οι γωνίες (n) και οι συντελεστές (n, 3)
+    """
+    if previous is not None:
+        angle, values = np.concatenate((previous[0], angle)), np.concatenate((previous[1], values))
+    order = np.lexsort((np.arange(angle.size), angle))
+    angle, values = angle[order], values[order]
+    last = np.append(angle[:-1] != angle[1:], True)
+    return angle[last], values[last]
+
+def read_polars(path, chunk_size=65536, sheet=0, angle_unit='deg'):
+    """
+    ανάγνωση όλων των αεροτομών του αρχείου. Οι γωνίες στρογγυλοποιούνται σε 3 δεκαδικά ψηφία, οι αριθμοί Reynolds, οι λόγοι t/c
+    και οι γωνίες ταξινομούνται με αύξουσα σειρά και, για διπλές γραμμές, κρατείται η τελευταία. Αν οι οικογένειες (Re, t/c) δεν έχουν
+    τις ίδιες γωνίες, κάθε οικογένεια παρεμβάλλεται γραμμικά στην ένωση των γωνιών.
+    Κάθε τμήμα της iter_polar_chunks ενσωματώνεται αμέσως στις γραμμές της οικογένειάς του, επομένως κρατούνται στη
+    μνήμη ένα τμήμα και οι διαφορετικές (Re, t/c, γωνία) του αρχείου, όχι όλες οι γραμμές του.
+
+    Args:
+        angle_unit (str, optional): 'deg' ή 'rad', η μονάδα των γωνιών στο αρχείο. Defaults to 'deg'.
+
+    Raises:
+        ValueError: αν η μονάδα των γωνιών είναι άγνωστη, αν το αρχείο δεν έχει γραμμές με δεδομένα ή αν το αρχείο έχει
+            στήλη Reynolds και δεν υπάρχει πίνακας για κάθε συνδυασμό Re και t/c
+
+    Returns:
+        (Polars): οι πίνακες των αεροτομών, με γωνίες σε μοίρες
+    """
+    if angle_unit not in ('deg', 'rad'):
+        raise ValueError(f"Άγνωστη μονάδα γωνίας {angle_unit!r}")
+    families = {} # (Re, t/c) -> (γωνίες, συντελεστές), οι στήλες που λείπουν (nan) αντιστοιχούν σε μία μόνο οικογένεια (-inf)
+    for chunk in iter_polar_chunks(path, chunk_size, sheet):
+        angle = np.round(np.degrees(chunk[:, 0]) if angle_unit == 'rad' else chunk[:, 0], 3)
+        keys = np.nan_to_num(chunk[:, [5, 4]], nan=-np.inf)
+        family_keys, family = np.unique(keys, axis=0, return_inverse=True)
+        family = family.ravel()
+        order = np.argsort(family, kind='stable') # οι γραμμές κάθε οικογένειας με τη σειρά του αρχείου
+        bounds = np.cumsum(np.bincount(family, minlength=len(family_keys)))
+        for (re_value, tc_value), rows in zip(family_keys.tolist(), np.split(order, bounds[:-1])):
+            key = (re_value, tc_value)
+            families[key] = _merge_family(angle[rows], chunk[rows, 1:4], families.get(key))
+    if not families:
+        raise ValueError(f"Το αρχείο {path} δεν έχει γραμμές με δεδομένα")
+
+    re_values = np.unique([re_value for re_value, _ in families])
+    tc_values = np.unique([tc_value for _, tc_value in families])
+    angles = np.unique(np.concatenate([angle for angle, _ in families.values()]))
+    coefs = np.empty((re_values.size, tc_values.size, angles.size, 3))
+    for i, re_value in enumerate(re_values):
+        for j, tc_value in enumerate(tc_values):
+            if (re_value, tc_value) not in families:
+                raise ValueError(f"Δεν υπάρχει πίνακας για Re = {re_value} και t/c = {tc_value}")
+            angle, values = families[(re_value, tc_value)]
+            for k in range(3):
+                coefs[i, j, :, k] = np.interp(angles, angle, values[:, k])
+    tc_values[np.isneginf(tc_values)] = math.nan
+    if np.isneginf(re_values[0]):
+        return Polars(tc_values, angles, coefs[0])
+    return Polars(tc_values, angles, coefs, re_values)
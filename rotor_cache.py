@@ -0,0 +1,127 @@
+#%%
+"""
+Μόνιμη (στον δίσκο) μνήμη των αποτελεσμάτων του ρότορα ανά σημείο λειτουργίας, σε βάση SQLite. Κάθε εγγραφή περιέχει
+τα μεγέθη όλων των τμημάτων (το λεξικό της sections_calculation για ένα σημείο λειτουργίας) και αντιστοιχεί σε ένα
+κλειδί ρότορα (hash της γεωμετρίας, του αρχείου της αεροτομής, των ρυθμίσεων και της έκδοσης του αλγορίθμου, βλ.
+Hansen_Algorithm.result_cache_key) και σε ένα σημείο λειτουργίας (V0, ω, μεταβολή της γωνίας βήματος).
+Έτσι ένα διάγραμμα ή μια σειρά υπολογισμών που ξανατρέχει υπολογίζει μόνο τα σημεία που λείπουν.
+"""
+import io
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from bem_results import BEMResults
+
+RESULT_CACHE_VERSION = 1 # αυξάνεται όταν αλλάζει η μορφή της βάσης
+DEFAULT_CACHE_DIR = ".rotor_cache"
+
+class RotorResultCache:
+    """
+    Μνήμη αποτελεσμάτων στο αρχείο rotor_results-v<έκδοση>.sqlite του φακέλου cache_dir, με όριο στο μέγεθος:
+    όταν το συνολικό μέγεθος των εγγραφών ξεπεράσει το max_bytes, διαγράφονται όσες χρησιμοποιήθηκαν λιγότερο πρόσφατα.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=256 * 2**20, decimals=9):
+        """
+        Args:
+            cache_dir (str, optional): ο φάκελος της βάσης. Defaults to ".rotor_cache".
+            max_bytes (int, optional): το μέγιστο συνολικό μέγεθος των αποτελεσμάτων σε bytes. Defaults to 256 MiB.
+            decimals (int, optional): τα δεκαδικά ψηφία στα οποία στρογγυλοποιούνται οι συντεταγμένες των σημείων λειτουργίας. Defaults to 9.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"rotor_results-v{RESULT_CACHE_VERSION}.sqlite")
+        self.max_bytes = max_bytes
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS points ("
+                " rotor_key TEXT, wind_speed REAL, rotation_speed REAL, pitch_offset REAL,"
+                " sections BLOB, size INTEGER, last_used REAL,"
+                " PRIMARY KEY (rotor_key, wind_speed, rotation_speed, pitch_offset))")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS points_last_used ON points (last_used)")
+
+    def _points(self, points):
+        return [tuple(np.round(np.asarray(point, dtype=float), self.decimals).tolist()) for point in points]
+
+    def get_many(self, rotor_key, points):
+        """
+        Args:
+            rotor_key (str): το κλειδί του ρότορα
+            points (list): σημεία λειτουργίας (V0, ω, μεταβολή της γωνίας βήματος)
+
+        Returns:
+            (list): για κάθε σημείο ένα λεξικό με τους πίνακες των τμημάτων ή None αν το σημείο δεν υπάρχει στη βάση
+        """
+        points = self._points(points)
+        results = []
+        with self._lock:
+            for point in points:
+                row = self._connection.execute(
+                    "SELECT sections FROM points WHERE rotor_key = ? AND wind_speed = ? AND rotation_speed = ? AND pitch_offset = ?",
+                    (rotor_key,) + point).fetchone()
+                if row is None:
+                    results.append(None)
+                    continue
+                array = np.load(io.BytesIO(row[0]), allow_pickle=False)
+                results.append({name: array[name] for name in array.dtype.names})
+            found = [(time.time(), rotor_key) + point for point, result in zip(points, results) if result is not None]
+            with self._connection:
+                self._connection.executemany(
+                    "UPDATE points SET last_used = ? WHERE rotor_key = ? AND wind_speed = ? AND rotation_speed = ? AND pitch_offset = ?",
+                    found)
+            self.hits += len(found)
+            self.misses += len(points) - len(found)
+        return results
+
+    def put_many(self, rotor_key, points, sections):
+        """ αποθήκευση των λεξικών sections (πίνακες με μία τιμή ανά τμήμα) για τα σημεία λειτουργίας points """
+        rows = []
+        now = time.time()
+        for point, columns in zip(self._points(points), sections):
+            buffer = io.BytesIO()
+            np.save(buffer, BEMResults(columns).to_structured_array(), allow_pickle=False)
+            blob = buffer.getvalue()
+            rows.append((rotor_key,) + point + (blob, len(blob), now))
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._evict()
+
+    def _evict(self):
+        """ διαγραφή των λιγότερο πρόσφατα χρησιμοποιημένων εγγραφών μέχρι το συνολικό μέγεθος να μην ξεπερνά το max_bytes """
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM points").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        removed = 0
+        for rowid, size in self._connection.execute("SELECT rowid, size FROM points ORDER BY last_used").fetchall():
+            self._connection.execute("DELETE FROM points WHERE rowid = ?", (rowid,))
+            removed += size
+            if removed >= excess:
+                break
+
+    def stats(self):
+        """
+        Returns:
+            (dict): το πλήθος των αποθηκευμένων σημείων, το συνολικό τους μέγεθος και οι επιτυχίες/αποτυχίες αναζήτησης
+        """
+        with self._lock:
+            entries, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM points").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM points")
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,98 @@
+#%%
+"""
+Μνήμη (cache) LRU με τα αποτελέσματα της επίλυσης μεμονωμένων τμημάτων πτερυγίου, ώστε τα ίδια τμήματα στα ίδια σημεία
+λειτουργίας να μην επιλύονται ξανά (π.χ. σε διαδοχικά διαγράμματα ή σε κελιά που ξανατρέχουν). Το κλειδί περιέχει τις
+ρυθμίσεις του αλγορίθμου και τα κβαντισμένα μεγέθη εισόδου του τμήματος. Τα αποθηκευμένα αποτελέσματα είναι
+πλειάδες (tuples) αριθμών, επομένως είναι αμετάβλητα και μπορούν να μοιράζονται με ασφάλεια.
+"""
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+CachedSolve = namedtuple('CachedSolve', ['names', 'values'])
+""" τα ονόματα και οι τιμές (αριθμοί Python ή NumPy) των μεγεθών ενός τμήματος """
+
+class SectionSolveCache:
+    """
+    Μνήμη LRU με όριο στο (εκτιμώμενο) μέγεθός της: όταν το ξεπεράσει, διαγράφονται τα αποτελέσματα που χρησιμοποιήθηκαν
+    λιγότερο πρόσφατα. Μπορεί να χρησιμοποιείται από πολλούς αλγορίθμους (Hansen_Algorithm(..., solve_cache=cache)) και νήματα.
+    """
+    def __init__(self, max_bytes=64 * 2**20, decimals=9):
+        """
+        Args:
+            max_bytes (int, optional): το μέγιστο μέγεθος της μνήμης σε bytes. Defaults to 64 MiB.
+            decimals (int, optional): τα δεκαδικά ψηφία στα οποία στρογγυλοποιούνται τα μεγέθη εισόδου του κλειδιού. Defaults to 9.
+        """
+        self.max_bytes = max_bytes
+        self.decimals = decimals
+        self._entries = OrderedDict() # κλειδί -> (CachedSolve, μέγεθος σε bytes)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def keys(self, settings, *inputs):
+        """
+        τα κλειδιά για κάθε τμήμα: οι ρυθμίσεις settings (πλειάδα) και τα μεγέθη εισόδου inputs (πίνακες ίδιου σχήματος),
+        στρογγυλοποιημένα σε self.decimals δεκαδικά ψηφία
+
+        Returns:
+            (list): ένα κλειδί για κάθε τμήμα
+        """
+        columns = [np.round(np.asarray(x, dtype=float).ravel(), self.decimals).tolist() for x in inputs]
+        return [(settings,) + row for row in zip(*columns)]
+
+    def get(self, key):
+        """ το αποτέλεσμα (CachedSolve) για το key ή None """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, names, values):
+        """ αποθήκευση του αποτελέσματος ενός τμήματος (ονόματα και τιμές των μεγεθών) """
+        entry = CachedSolve(tuple(names), tuple(values))
+        size = sys.getsizeof(key) + sys.getsizeof(entry.values) + sum(sys.getsizeof(value) for value in entry.values)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (entry, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Returns:
+            (dict): το πλήθος των επιτυχιών ("hits"), αποτυχιών ("misses") και διαγραφών ("evictions"), το ποσοστό επιτυχίας,
+            το πλήθος των αποθηκευμένων τμημάτων και το μέγεθος της μνήμης
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
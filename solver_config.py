@@ -0,0 +1,41 @@
+#%%
+"""
+Ρυθμίσεις της επαναληπτικής διαδικασίας του αλγορίθμου BEM (ανοχή σύγκλισης, μέγιστος αριθμός επαναλήψεων,
+συντελεστής χαλάρωσης) σε αμετάβλητο αντικείμενο. Δίνονται ανά αλγόριθμο (Hansen_Algorithm(..., config=...))
+ή ανά κλήση (π.χ. operating_grid(..., config=...)), ώστε η αλλαγή τους να μην επηρεάζει άλλους αλγορίθμους ή νήματα
+που χρησιμοποιούν τον ίδιο αλγόριθμο.
+"""
+import math
+from collections import namedtuple
+
+class SolverConfig(namedtuple('SolverConfig', ['tolerance', 'max_iter', 'relaxation'], defaults=(1e-4, 100, 0.3))):
+    """
+    Αμετάβλητες ρυθμίσεις του αλγορίθμου (πλειάδα με ονόματα). Νέες ρυθμίσεις από υπάρχουσες δίνει η replace:
+
+        config = SolverConfig().replace(tolerance=1e-6)
+
+    Fields:
+        tolerance (float): η ανοχή σύγκλισης των συντελεστών επαγωγής a και a'. Defaults to 1e-4.
+        max_iter (int): ο μέγιστος αριθμός επαναλήψεων. Defaults to 100.
+        relaxation (float): ο συντελεστής χαλάρωσης f, όταν δεν δίνεται στην κλήση. Defaults to 0.3.
+    """
+    __slots__ = ()
+
+    def __new__(cls, tolerance=1e-4, max_iter=100, relaxation=0.3):
+        """
+        Raises:
+            ValueError: αν η ανοχή δεν είναι θετική, ο αριθμός επαναλήψεων δεν είναι θετικός ακέραιος
+                ή ο συντελεστής χαλάρωσης δεν είναι στο (0, 1]
+        """
+        tolerance, relaxation = float(tolerance), float(relaxation)
+        if not (tolerance > 0 and math.isfinite(tolerance)):
+            raise ValueError(f"Η ανοχή σύγκλισης πρέπει να είναι θετική (δόθηκε {tolerance})")
+        if int(max_iter) != max_iter or max_iter < 1:
+            raise ValueError(f"Ο μέγιστος αριθμός επαναλήψεων πρέπει να είναι θετικός ακέραιος (δόθηκε {max_iter})")
+        if not 0 < relaxation <= 1:
+            raise ValueError(f"Ο συντελεστής χαλάρωσης πρέπει να είναι στο (0, 1] (δόθηκε {relaxation})")
+        return super().__new__(cls, tolerance, int(max_iter), relaxation)
+
+    def replace(self, **changes):
+        """ νέες ρυθμίσεις με τις αλλαγές changes (με έλεγχο των τιμών) """
+        return SolverConfig(**{**self._asdict(), **changes})
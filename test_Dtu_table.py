@@ -0,0 +1,177 @@
+import os
+import numpy as np
+import pytest
+
+from Dtu_table import DTU_calc
+
+@pytest.fixture
+def dtu():
+    return DTU_calc('csv_data_file_DTU.csv')
+
+def test_tables_are_sorted_arrays(dtu):
+    assert dtu.tc_values.tolist() == [24.1, 30.1, 36.0, 48.0, 60.0, 100.0]
+    assert np.all(np.diff(dtu.angles) > 0)
+    assert dtu.coefs.shape == (dtu.tc_values.size, dtu.angles.size, 3)
+
+def test_get_nearest_value(dtu):
+    assert dtu.get_nearest_value(dtu.tc_values, 30.1) == (24.1, 30.1)
+    assert dtu.get_nearest_value(dtu.tc_values, 40) == (36.0, 48.0)
+    with pytest.raises(ValueError):
+        dtu.get_nearest_value(dtu.tc_values, 120)
+
+def test_array_lookup_matches_scalar_lookup(dtu):
+    angles = np.array([-180, -37.5, 0, 3.3, 12.0, 67.53, 180])
+    tc_ratios = np.array([24.1, 27.0, 30.1, 42.0, 55.5, 100, 80.0])
+    Cl, Cd, Cm = dtu.get_interpolated_values(angles, tc_ratios)
+    for i in range(angles.size):
+        assert Cl[i] == dtu.cl(angles[i], tc_ratios[i])
+        assert Cd[i] == dtu.cd(angles[i], tc_ratios[i])
+        assert Cm[i] == dtu.cm(angles[i], tc_ratios[i])
+    assert dtu.cd(67.53, 100) == pytest.approx(0.6)
+
+def test_coefficients(dtu):
+    coefs = dtu.coefficients(12.0, 42.0)
+    assert coefs.Cl == dtu.cl(12.0, 42.0)
+    assert coefs.Cd == dtu.cd(12.0, 42.0)
+    assert coefs.Cm == dtu.cm(12.0, 42.0)
+    coefs = dtu.coefficients(np.array([0.0, 12.0]), np.array([24.1, 42.0]))
+    assert coefs.Cl.shape == (2,)
+    assert coefs.Cd[1] == dtu.cd(12.0, 42.0)
+
+def test_resample_uniform_grid(dtu):
+    resampled = dtu.resample(1.0)
+    assert resampled.angle_step == pytest.approx(1.0)
+    assert np.allclose(np.diff(resampled.angles), 1.0)
+    # όλες οι γωνίες του αρχείου είναι ακέραιες μοίρες, οπότε το βήμα 1° δεν εισάγει σφάλμα
+    assert resampled.max_interpolation_error() == pytest.approx({'Cl': 0, 'Cd': 0, 'Cm': 0}, abs=1e-12)
+    angles = np.array([-37.5, 3.3, 12.0, 67.53])
+    tc_ratios = np.array([27.0, 42.0, 55.5, 100])
+    assert resampled.coefficients(angles, tc_ratios).Cl == pytest.approx(dtu.coefficients(angles, tc_ratios).Cl)
+    assert resampled.coefficients(3.3, 42.0).Cd == pytest.approx(dtu.cd(3.3, 42.0))
+    with pytest.raises(ValueError):
+        resampled.coefficients(181.0, 42.0)
+
+def test_resampling_report(dtu):
+    report = dtu.resampling_report(angle_steps=(1.0, 5.0))
+    assert [row["no_angles"] for row in report] == [361, 73]
+    assert report[1]["max error Cl"] > report[0]["max error Cl"]
+
+def test_polar_cache(tmp_path):
+    csv_file = tmp_path / 'polars.csv'
+    csv_file.write_text(open('csv_data_file_DTU.csv').read())
+    parsed = DTU_calc(str(csv_file), use_cache=False)
+    first = DTU_calc(str(csv_file))
+    assert os.path.exists(first.cache_path)
+    cached = DTU_calc(str(csv_file))
+    assert cached.cache_path == first.cache_path
+    assert np.array_equal(cached.coefs, parsed.coefs)
+    assert np.array_equal(cached.angles, parsed.angles)
+    assert cached.cl(7.5, 40) == parsed.cl(7.5, 40)
+    # αλλαγή στο περιεχόμενο του αρχείου: νέα cache, η παλιά διαγράφεται
+    lines = csv_file.read_text().splitlines()
+    lines[1] = lines[1].replace(lines[1].split(';')[1], '9.0', 1)
+    csv_file.write_text('\n'.join(lines) + '\n')
+    changed = DTU_calc(str(csv_file))
+    assert changed.cache_path != first.cache_path
+    assert not os.path.exists(first.cache_path)
+    assert np.array_equal(changed.coefs, DTU_calc(str(csv_file), use_cache=False).coefs)
+    # η cache άλλου αρχείου με όνομα που αρχίζει από το ίδιο πρόθεμα δεν διαγράφεται
+    variant = tmp_path / 'polars-variant.csv'
+    variant.write_text(open('csv_data_file_DTU.csv').read())
+    variant_cache = DTU_calc(str(variant)).cache_path
+    csv_file.write_text(open('csv_data_file_DTU.csv').read())
+    assert DTU_calc(str(csv_file)).cache_path != changed.cache_path
+    assert os.path.exists(variant_cache)
+    assert not os.path.exists(changed.cache_path)
+
+def test_read_polars_formats(dtu, tmp_path):
+    from polar_io import read_polars
+    xlsx = read_polars('FFA-W3-CL_CD_CM_long.xlsx')
+    assert np.array_equal(xlsx.tc_values, dtu.tc_values)
+    assert np.array_equal(xlsx.coefs, dtu.coefs)
+    # αρχείο με ',' , άλλη σειρά στηλών, επιπλέον στήλες και γωνίες σε rad
+    csv_file = tmp_path / 'polars.csv'
+    rows = [",".join(repr(float(value)) for value in (tc, 0, np.radians(angle), cd, cl, cm))
+            for i, tc in enumerate(dtu.tc_values) for j, angle in enumerate(dtu.angles) for cl, cd, cm in [dtu.coefs[i, j]]]
+    csv_file.write_text('\n'.join(['t/c ratio,extra,alpha,cd,cl,cm'] + rows[::-1]) + '\n')
+    polars = read_polars(str(csv_file), chunk_size=100, angle_unit='rad')
+    assert np.array_equal(polars.tc_values, dtu.tc_values)
+    assert np.allclose(polars.angles, dtu.angles)
+    assert np.array_equal(polars.coefs, dtu.coefs)
+
+def test_read_polars_memory(tmp_path):
+    import tracemalloc
+    from polar_io import read_polars
+    # οι διπλές γραμμές ενσωματώνονται ανά τμήμα: κρατείται η τελευταία και η μνήμη δεν αυξάνεται με το μέγεθος του αρχείου
+    csv_file = tmp_path / 'repeated.csv'
+    angles = np.arange(-10, 20, 0.5)
+    with open(csv_file, 'w') as file:
+        file.write('alpha,cl,cd,cm\n')
+        for repeat in range(500):
+            file.writelines(f'{angle},{repeat},0.01,0\n' for angle in angles)
+    tracemalloc.start()
+    try:
+        polars = read_polars(str(csv_file), chunk_size=500)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert np.array_equal(polars.angles, angles)
+    assert np.all(polars.coefs[0, :, 0] == 499)
+    assert peak < 500 * angles.size * 6 * 8 / 4 # πολύ λιγότερο από τον αριθμητικό πίνακα όλων των γραμμών
+    csv_file.write_text('alpha,cl,cd\n\n')
+    with pytest.raises(ValueError, match='δεν έχει γραμμές'):
+        read_polars(str(csv_file))
+
+def test_iter_csv_rows(tmp_path):
+    from polar_io import iter_csv_rows
+    csv_file = tmp_path / 'sites.csv'
+    csv_file.write_text('name;k;A\nsite, 1;2.0;8.5\n', encoding='utf-8-sig')
+    assert list(iter_csv_rows(str(csv_file))) == [['name', 'k', 'A'], ['site, 1', '2.0', '8.5']]
+
+def test_dtu_calc_reads_xlsx(dtu):
+    xlsx = DTU_calc('FFA-W3-CL_CD_CM_long.xlsx', use_cache=False)
+    assert xlsx.cl(7.5, 40) == dtu.cl(7.5, 40)
+
+def write_reynolds_csv(dtu, path, cl_factors):
+    """ αρχείο με πίνακες για κάθε Re του cl_factors ({Re: συντελεστής}), με τον Cl του dtu πολλαπλασιασμένο με τον συντελεστή """
+    rows = [",".join(repr(float(value)) for value in (re, tc, angle, cl * factor, cd, cm))
+            for re, factor in cl_factors.items() for i, tc in enumerate(dtu.tc_values)
+            for j, angle in enumerate(dtu.angles) for cl, cd, cm in [dtu.coefs[i, j]]]
+    path.write_text('\n'.join(['Re,t/c ratio,alpha,cl,cd,cm'] + rows) + '\n')
+    return str(path)
+
+def test_reynolds_interpolation(dtu, tmp_path):
+    csv_file = write_reynolds_csv(dtu, tmp_path / 'polars_re.csv', {1e6: 1.0, 4e6: 1.2})
+    dtu_re = DTU_calc(csv_file, cache_dir=str(tmp_path / 'cache'))
+    assert np.array_equal(dtu_re.re_values, [1e6, 4e6])
+    assert dtu_re.re_coefs.shape == (2,) + dtu.coefs.shape
+    # χωρίς Re χρησιμοποιείται ο πίνακας αναφοράς (ο μικρότερος αριθμός Reynolds)
+    assert dtu_re.cl(7.5, 40) == pytest.approx(dtu.cl(7.5, 40))
+    # γραμμική παρεμβολή ως προς log(Re): το 2e6 βρίσκεται στη μέση των 1e6 και 4e6
+    Cl, Cd, _ = dtu_re.coefficients(7.5, 40, reynolds=2e6)
+    assert Cl == pytest.approx(1.1 * dtu.cl(7.5, 40))
+    assert Cd == pytest.approx(dtu.cd(7.5, 40))
+    # εκτός εύρους χρησιμοποιείται ο πλησιέστερος πίνακας
+    assert dtu_re.cl(7.5, 40, reynolds=1e5) == pytest.approx(dtu.cl(7.5, 40))
+    assert dtu_re.cl(7.5, 40, reynolds=1e8) == pytest.approx(1.2 * dtu.cl(7.5, 40))
+
+    angles = np.array([-5.0, 0.0, 7.5, 12.3])
+    reynolds = np.array([1e6, 2e6, 3e6, 5e6])
+    Cl_array = dtu_re.cl(angles, 40, reynolds=reynolds)
+    assert np.allclose(Cl_array, [dtu_re.cl(angle, 40, reynolds=re) for angle, re in zip(angles, reynolds)])
+    section_polars = dtu_re.blend([40, 40, 40, 40])
+    assert np.allclose(section_polars.coefficients(angles, np.arange(4), reynolds).Cl, Cl_array)
+
+    # οι πίνακες του Re διαβάζονται και από την cache και επαναδειγματοληπτούνται μαζί με τον πίνακα αναφοράς
+    cached = DTU_calc(csv_file, angle_step=0.5, cache_dir=str(tmp_path / 'cache'))
+    assert np.array_equal(cached.re_values, dtu_re.re_values)
+    assert cached.re_coefs.shape == (2, cached.tc_values.size, cached.angles.size, 3)
+    assert np.allclose(cached.re_coefs[0], cached.coefs)
+
+def test_reynolds_missing_table(dtu, tmp_path):
+    csv_file = write_reynolds_csv(dtu, tmp_path / 'polars_re.csv', {1e6: 1.0, 4e6: 1.2})
+    lines = open(csv_file).read().splitlines()
+    # δεν υπάρχει πίνακας για Re = 4e6 και t/c = 36
+    (tmp_path / 'incomplete.csv').write_text('\n'.join(line for line in lines if not line.startswith('4000000.0,36.0,')) + '\n')
+    with pytest.raises(ValueError):
+        DTU_calc(str(tmp_path / 'incomplete.csv'), use_cache=False)
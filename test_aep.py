@@ -0,0 +1,117 @@
+import time
+import numpy as np
+import pytest
+
+import _algorithmos_DTU as d10
+import aep
+from solver_config import SolverConfig
+
+@pytest.fixture(scope="module")
+def curve():
+    return aep.power_curve(d10.Hansen_Algorithm("blade_geom_DTU.json"))
+
+def test_weibull_bin_probabilities():
+    edges = np.linspace(0, 60, 1201)
+    probabilities = aep.weibull_bin_probabilities([1.5, 2.0, 3.0], [6.0, 8.0, 10.0], edges)
+    assert probabilities.shape == (3, 1200)
+    assert np.allclose(probabilities.sum(axis=1), 1.0)
+    # η μέση ταχύτητα είναι A Γ(1 + 1/k)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    assert np.isclose(probabilities[1] @ centers, 8.0 * 0.886227, rtol=1e-3)
+
+def test_scaled_power_curve_matches_rotor_at_density(curve):
+    # η ισχύς είναι ανάλογη της πυκνότητας του αέρα: ίδια με τον ρότορα που υπολογίζεται σε άλλη πυκνότητα
+    rotor = d10.Hansen_Algorithm("blade_geom_DTU.json", air_density=1.1)
+    points = rotor.operating_points(curve.wind_speeds, curve.rotation_speed)
+    scaled = aep.scale_power_curve(curve, 1.1)
+    assert np.allclose(points["power"], scaled.power, rtol=1e-9, atol=1e-3)
+    assert np.allclose(points["thrust"], scaled.thrust, rtol=1e-9, atol=1e-3)
+
+def test_aep_matches_direct_integration(curve):
+    sites = aep.Sites(["a", "b"], np.array([2.0, 2.4]), np.array([8.0, 9.5]), np.array([1.225, 1.15]))
+    results = aep.annual_energy_production(curve, sites)
+    # ολοκλήρωση της πυκνότητας πιθανότητας Weibull για κάθε θέση χωριστά (τραπεζοειδής κανόνας σε πυκνό πλέγμα)
+    V = np.linspace(aep.DEFAULT_CUT_IN, aep.DEFAULT_CUT_OUT, 20001)
+    for i, (k, A, rho) in enumerate(zip(sites.k, sites.A, sites.air_density)):
+        power = np.minimum(np.interp(V, curve.wind_speeds, curve.power) * rho / curve.air_density, aep.DEFAULT_RATED_POWER)
+        pdf = k / A * (V / A)**(k - 1) * np.exp(-(V / A)**k)
+        integrand = power * pdf
+        expected = np.sum(0.5 * (integrand[1:] + integrand[:-1]) * np.diff(V)) * aep.HOURS_PER_YEAR / 1e6
+        assert np.isclose(results["aep"][i], expected, rtol=2e-3)
+    assert np.allclose(results["capacity_factor"], results["mean_power"] / aep.DEFAULT_RATED_POWER)
+    assert results["capacity_factor"][1] > results["capacity_factor"][0]
+    assert np.all(results["power"] <= aep.DEFAULT_RATED_POWER)
+
+def test_read_sites(tmp_path):
+    path = tmp_path / "sites.csv"
+    path.write_text("Site;Weibull_k;Weibull_A;rho\nnorth;2.1;9.3;1.20\nsouth;1.8;7.4;\n", encoding="utf-8")
+    sites = aep.read_sites(str(path))
+    assert sites.names == ["north", "south"]
+    assert np.allclose(sites.k, [2.1, 1.8])
+    assert np.allclose(sites.air_density, [1.20, 1.225])
+    path.write_text("site,k\nx,2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        aep.read_sites(str(path))
+    # κομμένη γραμμή ή μη αριθμητική τιμή: ValueError με το αρχείο και τη γραμμή
+    path.write_text("site,k,A\nx,2,8\n\ny,2\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="sites.csv, γραμμή 4"):
+        aep.read_sites(str(path))
+    path.write_text("site,k,A\nx,2,eight\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="sites.csv, γραμμή 2"):
+        aep.read_sites(str(path))
+
+def test_thousand_sites(curve, tmp_path):
+    rng = np.random.default_rng(0)
+    n = 1000
+    path = tmp_path / "sites.csv"
+    rows = [f"s{i},{k:.3f},{A:.3f},{rho:.3f}" for i, (k, A, rho) in
+            enumerate(zip(rng.uniform(1.5, 3.0, n), rng.uniform(6, 11, n), rng.uniform(1.1, 1.3, n)))]
+    path.write_text("site,k,A,air_density\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    start = time.perf_counter()
+    results = aep.annual_energy_production(curve, aep.read_sites(str(path)))
+    assert time.perf_counter() - start < 2.0
+    assert results["aep"].shape == (n,)
+    assert np.all((results["capacity_factor"] > 0) & (results["capacity_factor"] < 1))
+    aep.write_results(str(tmp_path / "results.csv"), results)
+    assert len((tmp_path / "results.csv").read_text(encoding="utf-8").splitlines()) == n + 1
+
+def test_optimal_power_curve():
+    # αυστηρή ανοχή, ώστε οι διαφορές ισχύος να μην οφείλονται στη σύγκλιση των συντελεστών επαγωγής
+    hansen = d10.Hansen_Algorithm("blade_geom_DTU.json", config=SolverConfig(tolerance=1e-8, max_iter=1000))
+    wind_speeds = np.arange(4.0, 16.0, 1.0)
+    curve = aep.optimal_power_curve(hansen, wind_speeds)
+    assert np.all((curve.rotation_speed >= aep.DEFAULT_MIN_ROTATION_SPEED) & (curve.rotation_speed <= aep.DEFAULT_MAX_ROTATION_SPEED))
+    # τα αποτελέσματα αντιστοιχούν στα σημεία λειτουργίας που επιστρέφονται
+    points = hansen.operating_points(wind_speeds, curve.rotation_speed)
+    assert np.allclose(points["power"], curve.power)
+    assert np.allclose(points["thrust"], curve.thrust)
+    # ακριβέστερη από πλέγμα 50 σημείων στα όρια των στροφών, με πολύ λιγότερες επιλύσεις
+    dense = aep.power_curve(hansen, wind_speeds, rotation_speeds=np.linspace(
+        aep.DEFAULT_MIN_ROTATION_SPEED, aep.DEFAULT_MAX_ROTATION_SPEED, 50))
+    assert np.all(curve.power >= dense.power * (1 - 1e-8))
+    assert np.any(curve.power > dense.power * (1 + 1e-6))
+    # μία αναζήτηση του λ και μία επίλυση ανά ταχύτητα ανέμου: πάνω από 10 φορές λιγότερες επιλύσεις από το πλέγμα
+    assert curve.rotor_evaluations <= 12 + wind_speeds.size # max_evaluations=12
+    assert curve.rotor_evaluations * 10 <= dense.rotor_evaluations
+    # χαμηλοί άνεμοι στην ελάχιστη και υψηλοί στη μέγιστη ταχύτητα περιστροφής, ενδιάμεσοι με σταθερό λ
+    assert np.isclose(curve.rotation_speed[0], aep.DEFAULT_MIN_ROTATION_SPEED)
+    assert np.isclose(curve.rotation_speed[-1], aep.DEFAULT_MAX_ROTATION_SPEED)
+    inner = (curve.rotation_speed > aep.DEFAULT_MIN_ROTATION_SPEED + 1e-3) & (curve.rotation_speed < aep.DEFAULT_MAX_ROTATION_SPEED - 1e-3)
+    tsr = curve.rotation_speed[inner] * hansen.R / wind_speeds[inner]
+    assert inner.sum() >= 2 and np.ptp(tsr) < 0.05
+    with pytest.raises(ValueError):
+        aep.optimal_power_curve(hansen, wind_speeds, max_evaluations=2)
+
+def test_optimal_power_curve_reynolds(tmp_path):
+    from test_Dtu_table import write_reynolds_csv
+    # με πίνακες για πολλούς αριθμούς Reynolds ο Cp δεν εξαρτάται μόνο από το λ: αναζήτηση για κάθε ταχύτητα ανέμου
+    reference = d10.Hansen_Algorithm("blade_geom_DTU.json")
+    csv_file = write_reynolds_csv(reference.airfoil_calc, tmp_path / 'polars_re.csv', {1e6: 1.0, 1e8: 1.1})
+    hansen = d10.Hansen_Algorithm("blade_geom_DTU.json", csv_data_file=csv_file, config=SolverConfig(tolerance=1e-8, max_iter=1000))
+    wind_speeds = np.array([5.0, 8.0, 11.0])
+    curve = aep.optimal_power_curve(hansen, wind_speeds)
+    assert curve.rotor_evaluations > 12 + wind_speeds.size # max_evaluations=12
+    assert np.allclose(hansen.operating_points(wind_speeds, curve.rotation_speed)["power"], curve.power)
+    dense = aep.power_curve(hansen, wind_speeds, rotation_speeds=np.linspace(
+        aep.DEFAULT_MIN_ROTATION_SPEED, aep.DEFAULT_MAX_ROTATION_SPEED, 20))
+    assert np.all(curve.power >= dense.power * (1 - 1e-8))
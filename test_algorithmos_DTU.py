@@ -1,6 +1,9 @@
+import os
+import numpy as np
 import pytest
 
 import _algorithmos_DTU as d10
+from solver_config import SolverConfig
 
 @pytest.fixture
 def bl_cl():
@@ -16,6 +19,15 @@ def test_object_creation(bl_cl):
     assert bl_cl.B == 3
     assert bl_cl.R  == pytest.approx(89.17, abs=0.010)
 
+def test_rotor_radius_from_geometry(bl_cl):
+    # η ακτίνα του ρότορα είναι το R της γεωμετρίας, που μπορεί να είναι μεγαλύτερο από την τελευταία ακτινική θέση
+    geometry = bl_cl.geometry
+    longer = d10.BladeGeometry(geometry.r_is, geometry.chords, geometry.pitch, geometry.tc_ratios, R=geometry.R + 2.0)
+    hansen = d10.Hansen_Algorithm(longer, csv_data_file=bl_cl.airfoil_calc)
+    assert hansen.R == longer.R
+    assert hansen.result_cache_key() != bl_cl.result_cache_key()
+    assert hansen.operating_points(10.0, 1.0)["power"] > bl_cl.operating_points(10.0, 1.0)["power"]
+
 def test_calculation_of_flow_angle(bl_cl):
     v0=10
     omega_rps=0.5
@@ -86,4 +98,233 @@ def test_calculation_of_local_loads(bl_cl):
     assert pt_actual == pytest.approx(expected_pt, rel=1e-2)
 
     
-    
\ No newline at end of file
+    
+def test_sections_calculation_matches_segment_calculation(bl_cl):
+    v0 = 10
+    omega_rps = 0.5
+    res = bl_cl.sections_calculation(
+        wind_speed_V0=v0, omega_rad_sec=omega_rps, r=bl_cl.r_is, chord=bl_cl.chords,
+        pitch_angle_deg=bl_cl.pitch, twist_deg=0, tc_ratio=bl_cl.tc_ratios)
+    for i in range(bl_cl.no_sections):
+        expected = bl_cl.segment_calculation(
+            wind_speed_V0=v0, omega_rad_sec=omega_rps, r=bl_cl.r_is[i], chord=bl_cl.chords[i],
+            pitch_angle_deg=bl_cl.pitch[i], twist_deg=0, tc_ratio=bl_cl.tc_ratios[i])
+        assert res["counter"][i] == expected["counter"]
+        assert res["a"][i] == pytest.approx(expected["a"], rel=1e-12)
+        assert res["a_p"][i] == pytest.approx(expected["a_p"], rel=1e-12)
+        assert res["Cl"][i] == pytest.approx(expected["Cl"], rel=1e-12)
+        assert res["pt (N/m)"][i] == pytest.approx(expected["pt (N/m)"], rel=1e-12)
+
+def test_segment_calculation_trace(bl_cl):
+    kwargs = dict(wind_speed_V0=10, omega_rad_sec=0.5, r=bl_cl.r_is[3], chord=bl_cl.chords[3],
+                  pitch_angle_deg=bl_cl.pitch[3], twist_deg=0, tc_ratio=bl_cl.tc_ratios[3])
+    res = bl_cl.segment_calculation(**kwargs)
+    assert "trace" not in res and "converged" not in res
+    summary = bl_cl.segment_calculation(trace='summary', **kwargs)
+    assert summary["converged"]
+    assert summary["residual a"] < bl_cl.tolerance
+    full = bl_cl.segment_calculation(trace='full', **kwargs)
+    history = full["trace"]
+    assert history.dtype == bl_cl.trace_dtype
+    assert len(history) == res["counter"]
+    assert list(history["counter"]) == list(range(1, res["counter"] + 1))
+    assert history["a_new"][-1] == pytest.approx(res["a_new"], rel=1e-12)
+    assert full["pt (N/m)"] == res["pt (N/m)"]
+    with pytest.raises(ValueError):
+        bl_cl.segment_calculation(trace='verbose', **kwargs)
+
+def test_DTU_blade_calculation_vectorized(bl_cl):
+    for omega_rps in (0.5, 1.0):
+        results, power, torque, thrust = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=omega_rps)
+        results_vec, power_vec, torque_vec, thrust_vec = bl_cl.DTU_blade_calculation(
+            wind_speed_V0=10, rotation_speed=omega_rps, vectorized=True)
+        assert len(results_vec) == len(results)
+        assert power_vec == pytest.approx(power, rel=1e-9)
+        assert torque_vec == pytest.approx(torque, rel=1e-9)
+        assert thrust_vec == pytest.approx(thrust, rel=1e-9)
+
+def test_operating_grid(bl_cl):
+    wind_speeds = [8, 10]
+    rotation_speeds = [0.5, 1.0]
+    grid = bl_cl.operating_grid(wind_speeds, rotation_speeds, pitch_offsets_deg=[0, 2], per_section=True)
+    assert grid["power"].shape == (2, 2, 2)
+    assert grid["sections"]["a"].shape == (2, 2, 2, bl_cl.no_sections)
+    for i, v0 in enumerate(wind_speeds):
+        for j, omega_rps in enumerate(rotation_speeds):
+            _, power, torque, thrust = bl_cl.DTU_blade_calculation(wind_speed_V0=v0, rotation_speed=omega_rps)
+            assert grid["power"][i, j, 0] == pytest.approx(power, rel=1e-9)
+            assert grid["torque"][i, j, 0] == pytest.approx(torque, rel=1e-9)
+            assert grid["thrust"][i, j, 0] == pytest.approx(thrust, rel=1e-9)
+            assert grid["Cp"][i, j, 0] == pytest.approx(bl_cl.calculation_of_coefficient_of_power_cp_for_DTU(power, v0))
+
+def test_operating_grid_warm_start(bl_cl):
+    wind_speeds = [8, 10, 12]
+    rotation_speeds = 2 * np.pi * np.linspace(6, 12, 13) / 60
+    cold = bl_cl.operating_grid(wind_speeds, rotation_speeds)
+    warm = bl_cl.operating_grid(wind_speeds, rotation_speeds, warm_start=True, compare_cold_start=True)
+    assert warm["Cp"] == pytest.approx(cold["Cp"], abs=1e-3)
+    assert warm["iterations_cold"] == cold["iterations"]
+    assert warm["iterations_saved"] > 0
+    with pytest.raises(ValueError):
+        bl_cl.operating_grid(wind_speeds, rotation_speeds, warm_start=True, solver='bracketed')
+
+def test_operating_grid_tsr(bl_cl):
+    wind_speeds = np.array([6.0, 8.0, 11.0])
+    rotation_speeds = 2 * np.pi * np.linspace(4, 12, 9) / 60
+    tsr = bl_cl.operating_grid_tsr(wind_speeds, rotation_speeds, tsr_points=201, per_section=True)
+    exact = bl_cl.operating_grid(wind_speeds, rotation_speeds, per_section=True)
+    assert tsr["tip_speed_ratio"] == pytest.approx(rotation_speeds[None, :] * bl_cl.R / wind_speeds[:, None])
+    assert tsr["rotor_evaluations"] == 2 * 201 - 1
+    # το σφάλμα της ισχύος δεν ξεπερνά το φράγμα (εκτός από την ανοχή της σύγκλισης)
+    bound = tsr["power_error_bound"][:, None, None]
+    assert np.all(np.abs(tsr["power"] - exact["power"]) <= bound + 1e-6 * np.abs(exact["power"]))
+    assert tsr["power"] == pytest.approx(exact["power"], rel=2e-2)
+    assert tsr["thrust"] == pytest.approx(exact["thrust"], rel=2e-2)
+    assert tsr["sections"]["pn (N/m)"] == pytest.approx(exact["sections"]["pn (N/m)"], rel=3e-2, abs=10)
+    assert tsr["sections"]["Power (Watt)"].sum(axis=-1) * bl_cl.B == pytest.approx(tsr["power"], rel=1e-9)
+    assert "counter" not in tsr["sections"]
+
+def test_operating_grid_tsr_power_error_bound(bl_cl):
+    # σε λ εκτός πλέγματος (τυχαία ω) και με αραιό πλέγμα, το πραγματικό σφάλμα της ισχύος μένει κάτω από το φράγμα
+    config = SolverConfig(tolerance=1e-9, max_iter=2000)
+    wind_speeds = np.array([4.0, 8.0, 11.0, 14.0])
+    rotation_speeds = np.sort(np.random.default_rng(7).uniform(0.2, 1.3, 40))
+    for tsr_points in (3, 11, 21):
+        tsr = bl_cl.operating_grid_tsr(wind_speeds, rotation_speeds, tsr_points=tsr_points, config=config)
+        exact = bl_cl.operating_grid(wind_speeds, rotation_speeds, config=config)
+        error = np.abs(tsr["power"] - exact["power"])[..., 0].max(axis=1)
+        assert np.all(error > 0)
+        assert np.all(error <= tsr["power_error_bound"])
+
+def test_tip_speed_ratio_curve(bl_cl):
+    # στα λ του πλέγματος η λύση για V0 = 1 m/sec ταυτίζεται (εκτός από την ανοχή της σύγκλισης) με τη λύση για κάθε V0
+    curve = bl_cl.tip_speed_ratio_curve([4.0, 7.0])
+    grid = bl_cl.operating_grid([9.0], 7.0 * 9.0 / bl_cl.R)
+    assert curve["Cp"][1, 0] == pytest.approx(grid["Cp"][0, 0, 0], rel=1e-6)
+    assert curve["CT"][1, 0] == pytest.approx(grid["CT"][0, 0, 0], rel=1e-6)
+    with pytest.raises(ValueError):
+        bl_cl.operating_grid_tsr([0.0, 8.0], [1.0])
+
+def test_section_polars_match_2d_lookup(bl_cl):
+    angles = np.array([-10.0, 0.0, 7.5, 20.0])
+    for i in range(bl_cl.no_sections):
+        Cl, Cd, _ = bl_cl.section_polars.coefficients(angles, i)
+        Cl_expected, Cd_expected = bl_cl.calculation_of_Cl_and_Cd(angles, bl_cl.tc_ratios[i])
+        assert Cl == pytest.approx(Cl_expected, rel=1e-12, abs=1e-15)
+        assert Cd == pytest.approx(Cd_expected, rel=1e-12, abs=1e-15)
+
+def test_section_polars_are_rebuilt(bl_cl, tmp_path):
+    polars = bl_cl.section_polars
+    assert bl_cl.section_polars is polars
+    # η κατάσταση του ρότορα δεν αλλάζει μετά τη δημιουργία: άλλοι λόγοι t/c σημαίνουν νέα γεωμετρία
+    with pytest.raises(AttributeError):
+        bl_cl.tc_ratios = np.full(bl_cl.no_sections, 36.0)
+    geometry = bl_cl.geometry
+    thick = d10.Hansen_Algorithm(d10.BladeGeometry(geometry.r_is, geometry.chords, geometry.pitch, np.full(bl_cl.no_sections, 36.0)),
+                                 csv_data_file=bl_cl.airfoil_calc, num_sections=None)
+    assert thick.section_polars.coefs[0] == pytest.approx(bl_cl.airfoil_calc.coefs[2])
+
+    csv_file = tmp_path / "polar.csv"
+    csv_file.write_text(open("csv_data_file_DTU.csv").read())
+    hansen = d10.Hansen_Algorithm(blade_geom_DTU="blade_geom_DTU.json", csv_data_file=str(csv_file))
+    polars = hansen.section_polars
+    csv_file.write_text(open("csv_data_file_DTU.csv").read().replace(";0.6;", ";0.7;"))
+    os.utime(csv_file, ns=(0, 0))
+    assert hansen.section_polars is not polars
+    assert hansen.section_polars.coefficients(180.0, 0).Cd == pytest.approx(0.7)
+
+def test_bracketed_solver(bl_cl):
+    results, power, torque, thrust = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=1.0, vectorized=True)
+    results_br, power_br, torque_br, thrust_br = bl_cl.DTU_blade_calculation(
+        wind_speed_V0=10, rotation_speed=1.0, vectorized=True, solver='bracketed')
+    assert all(res["bracket_found"] for res in results_br)
+    assert max(res["counter"] for res in results_br) < min(max(res["counter"] for res in results), 20)
+    for res in results_br:
+        assert res["a"] == res["a_new"]
+        residual = bl_cl.calculation_of_flow_angle_residual(
+            Cn=res["Cn"], Ct=res["Ct"], r=res["r_i (m)"], chord=res["chord (m)"],
+            flow_angle_rad=res["flow_angle (rads)"], v0=10, w_rps=1.0)
+        assert residual == pytest.approx(0, abs=1e-8)
+    assert power_br == pytest.approx(power, rel=1e-3)
+    assert thrust_br == pytest.approx(thrust, rel=1e-3)
+
+def test_bracketed_segment_calculation(bl_cl):
+    res = bl_cl.segment_calculation(wind_speed_V0=10, omega_rad_sec=0.5, r=bl_cl.r_is[3], chord=bl_cl.chords[3],
+                                    pitch_angle_deg=bl_cl.pitch[3], twist_deg=0, tc_ratio=bl_cl.tc_ratios[3], solver='bracketed')
+    expected = bl_cl.segment_calculation(wind_speed_V0=10, omega_rad_sec=0.5, r=bl_cl.r_is[3], chord=bl_cl.chords[3],
+                                         pitch_angle_deg=bl_cl.pitch[3], twist_deg=0, tc_ratio=bl_cl.tc_ratios[3])
+    assert res["bracket_found"]
+    assert res["flow_angle (rads)"] == pytest.approx(expected["flow_angle (rads)"], abs=1e-3)
+    assert res["counter"] < expected["counter"]
+
+def test_segment_calculation_trace_writer(bl_cl, tmp_path):
+    import csv
+    from trace_writer import TraceWriter
+    path = tmp_path / "trace.csv"
+    counters = []
+    with TraceWriter(str(path)) as writer:
+        for i in (2, 5):
+            res = bl_cl.segment_calculation(
+                wind_speed_V0=10, omega_rad_sec=0.5, r=bl_cl.r_is[i], chord=bl_cl.chords[i],
+                pitch_angle_deg=bl_cl.pitch[i], twist_deg=0, tc_ratio=bl_cl.tc_ratios[i], trace_writer=writer)
+            counters.append(res["counter"])
+    with open(path, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == sum(counters)
+    assert [row["trace_id"] for row in rows] == ["0"] * counters[0] + ["1"] * counters[1]
+    assert float(rows[-1]["r"]) == pytest.approx(bl_cl.r_is[5])
+    assert float(rows[-1]["a_new"]) == pytest.approx(res["a_new"])
+    with pytest.raises(ValueError):
+        writer.submit(res["trace"], r=1.0)
+
+def test_trace_writer_column_union(bl_cl, tmp_path):
+    import csv
+    import trace_writer
+    assert os.path.isabs(trace_writer.DEFAULT_TRACE_FILE)
+    path = tmp_path / "trace.csv"
+    res = bl_cl.segment_calculation(wind_speed_V0=10, omega_rad_sec=0.5, r=bl_cl.r_is[2], chord=bl_cl.chords[2],
+                                    pitch_angle_deg=bl_cl.pitch[2], twist_deg=0, tc_ratio=bl_cl.tc_ratios[2], trace='full')
+    # ιστορικά με διαφορετικά κλειδιά (π.χ. του NACA χωρίς tc_ratio) στο ίδιο αρχείο, και με νέα στήλη μετά την πρώτη εγγραφή
+    with trace_writer.TraceWriter(str(path)) as writer:
+        writer.submit(res["trace"], r=1.0, tc_ratio=24.1)
+        writer.flush()
+        writer.submit(res["trace"], r=2.0)
+        writer.submit(res["trace"], r=3.0, Re=1e6)
+    with open(path, newline='') as file:
+        header = next(csv.reader(file))
+        file.seek(0)
+        rows = list(csv.DictReader(file))
+    assert header == ["trace_id", "r", "tc_ratio"] + list(res["trace"].dtype.names) + ["Re"]
+    assert len(rows) == 3 * len(res["trace"])
+    assert all(None not in row and len(row) == len(header) for row in rows)
+    first, second, third = (rows[k * len(res["trace"])] for k in range(3))
+    assert (first["tc_ratio"], first["Re"]) == ("24.1", "")
+    assert (second["r"], second["tc_ratio"], second["Re"]) == ("2.0", "", "")
+    assert (third["tc_ratio"], third["Re"]) == ("", "1000000.0")
+    assert float(third["a_new"]) == pytest.approx(res["trace"]["a_new"][0])
+
+def test_reynolds_dependent_polars(bl_cl, tmp_path):
+    from test_Dtu_table import write_reynolds_csv
+    csv_file = write_reynolds_csv(bl_cl.airfoil_calc, tmp_path / 'polars_re.csv', {1e6: 1.0, 1e8: 1.1})
+    hansen = d10.Hansen_Algorithm(blade_geom_DTU="blade_geom_DTU.json", csv_data_file=csv_file, backend='numpy')
+    assert hansen.uses_reynolds and not bl_cl.uses_reynolds
+    res = hansen.sections_calculation(
+        wind_speed_V0=10, omega_rad_sec=1.0, r=hansen.r_is, chord=hansen.chords, pitch_angle_deg=hansen.pitch,
+        twist_deg=0, tc_ratio=hansen.tc_ratios, section_index=np.arange(hansen.no_sections))
+    reference = bl_cl.sections_calculation(
+        wind_speed_V0=10, omega_rad_sec=1.0, r=bl_cl.r_is, chord=bl_cl.chords, pitch_angle_deg=bl_cl.pitch,
+        twist_deg=0, tc_ratio=bl_cl.tc_ratios, section_index=np.arange(bl_cl.no_sections))
+    assert "Reynolds number" not in reference
+    # ο Cl αυξάνεται με τον αριθμό Reynolds των τμημάτων, που είναι μεταξύ των δύο πινάκων
+    reynolds = res["Reynolds number"]
+    assert np.all((reynolds > 1e6) & (reynolds < 1e8))
+    assert np.all(res["Cl"][1:] > reference["Cl"][1:]) # (Cl = 0 στην κυλινδρική ρίζα)
+    for i in (2, 7):
+        expected = hansen.segment_calculation(
+            wind_speed_V0=10, omega_rad_sec=1.0, r=hansen.r_is[i], chord=hansen.chords[i],
+            pitch_angle_deg=hansen.pitch[i], twist_deg=0, tc_ratio=hansen.tc_ratios[i])
+        assert res["counter"][i] == expected["counter"]
+        assert res["a"][i] == pytest.approx(expected["a"], rel=1e-12)
+        assert res["Reynolds number"][i] == pytest.approx(expected["Reynolds number"], rel=1e-12)
+    with pytest.raises(ValueError):
+        hansen.DTU_blade_calculation(10, 1.0, vectorized=True, solver='bracketed')
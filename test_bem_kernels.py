@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import bem_kernels
+from _algorithmos_DTU import Hansen_Algorithm
+
+@pytest.fixture
+def bl_cl():
+    return Hansen_Algorithm(blade_geom_DTU="blade_geom_DTU.json", backend='numpy')
+
+def test_resolve_backend():
+    assert bem_kernels.resolve_backend('numpy') == 'numpy'
+    assert bem_kernels.resolve_backend('auto') == ('numba' if bem_kernels.HAS_NUMBA else 'numpy')
+    with pytest.raises(ValueError):
+        bem_kernels.resolve_backend('cuda')
+
+@pytest.mark.parametrize("omega", [0.8, 0.0]) # για ω = 0 (πρώτο σημείο του πλέγματος της _execute_DTU) φ = π/2
+def test_kernel_matches_numpy_iteration(bl_cl, omega):
+    n = bl_cl.no_sections
+    v0, w_rps = np.full(n, 10.0), np.full(n, omega)
+    twist, section_index = np.zeros(n), np.arange(n)
+    expected = bl_cl.sections_calculation(v0, w_rps, bl_cl.r_is, bl_cl.chords, bl_cl.pitch, twist, bl_cl.tc_ratios,
+                                          section_index=section_index)
+    polars = bl_cl.section_polars
+    a, a_p = np.zeros(n), np.zeros(n)
+    # ο κώδικας Python δεν διαιρεί με το μηδέν (π.χ. ZeroDivisionError για ω = 0 με float της Python)
+    with np.errstate(divide='raise', invalid='raise'):
+        results = bem_kernels.fixed_point_sections(
+            v0, w_rps, bl_cl.r_is, bl_cl.chords, bl_cl.pitch, twist, section_index, a, a_p,
+            polars.angles, polars.coefs, 0.0, 3.0, 0.3, bl_cl.tolerance, bl_cl.max_iter)
+    assert a == pytest.approx(expected["a"], rel=1e-9, abs=1e-12)
+    assert a_p == pytest.approx(expected["a_p"], rel=1e-9, abs=1e-12)
+    for key, value in zip(bl_cl._evaluation_keys, results[:-2]):
+        assert value == pytest.approx(expected[key], rel=1e-9, abs=1e-12)
+    assert results[-2].tolist() == expected["counter"].tolist()
+    assert not results[-1].any()
+
+def test_numba_backend_operating_grid(bl_cl):
+    pytest.importorskip("numba")
+    grid = bl_cl.operating_grid([6, 10, 14], [0.5, 1.0], pitch_offsets_deg=[0, 3])
+    grid_numba = Hansen_Algorithm(blade_geom_DTU="blade_geom_DTU.json", backend='numba').operating_grid(
+        [6, 10, 14], [0.5, 1.0], pitch_offsets_deg=[0, 3])
+    assert grid_numba["power"] == pytest.approx(grid["power"], rel=1e-9)
+    assert grid_numba["iterations"] == grid["iterations"]
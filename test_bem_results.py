@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from bem_results import BEMResults
+from _algorithmos_DTU import Hansen_Algorithm
+
+@pytest.fixture
+def bl_cl():
+    return Hansen_Algorithm(blade_geom_DTU="blade_geom_DTU.json")
+
+def test_columnar_blade_calculation(bl_cl):
+    records, power, torque, thrust = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=0.8, vectorized=True)
+    results, power_c, _, _ = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=0.8, vectorized=True, columnar=True)
+    assert isinstance(results, BEMResults)
+    assert len(results) == len(records)
+    assert results.columns == tuple(records[0])
+    assert results["pn (N/m)"].dtype == np.float64
+    assert results.totals["power"] == power_c == power
+    assert results.to_records()[3]["Power (Watt)"] == records[3]["Power (Watt)"]
+    assert results["Power (Watt)"].sum() * 3 == pytest.approx(power, rel=1e-12)
+
+def test_columnar_matches_scalar_records(bl_cl):
+    records, *_ = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=0.8)
+    results, *_ = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=0.8, columnar=True)
+    assert results.columns == tuple(records[0])
+    assert results["a"] == pytest.approx([record["a"] for record in records])
+
+def test_operating_grid_columns(bl_cl):
+    grid = bl_cl.operating_grid([8, 10], [0.5, 1.0, 1.2], pitch_offsets_deg=[0, 2], per_section=True)
+    results = BEMResults.from_operating_grid(grid)
+    assert len(results) == 2 * 3 * 2 * bl_cl.no_sections
+    assert np.shares_memory(results["a"], grid["sections"]["a"])
+    row = np.flatnonzero((results["wind_speed_V0"] == 10) & (results["rotation_speed"] == 1.2)
+                         & (results["pitch_offset"] == 2) & (results["section"] == 4))
+    assert results["pt (N/m)"][row] == grid["sections"]["pt (N/m)"][1, 2, 1, 4]
+    assert results.totals["power"].shape == (2, 3, 2)
+
+def test_npy_round_trip(bl_cl, tmp_path):
+    results, *_ = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=0.8, vectorized=True, columnar=True)
+    results.save_npy(tmp_path / "results.npy")
+    loaded = BEMResults.load_npy(tmp_path / "results.npy")
+    assert loaded.columns == results.columns
+    for name in results.columns:
+        assert np.array_equal(loaded[name], results[name])
+
+def test_to_dataframe(bl_cl):
+    pd = pytest.importorskip("pandas")
+    results, *_ = bl_cl.DTU_blade_calculation(wind_speed_V0=10, rotation_speed=0.8, vectorized=True, columnar=True)
+    df = results.to_dataframe()
+    assert list(df.columns) == list(results.columns)
+    assert df["Cl"].to_numpy() == pytest.approx(results["Cl"])
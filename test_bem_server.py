@@ -0,0 +1,91 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import _algorithmos_DTU as d10
+from bem_server import BEMServer, MicroBatcher, ServerStats, request
+
+@pytest.fixture(scope="module")
+def hansen():
+    return d10.Hansen_Algorithm("blade_geom_DTU.json")
+
+async def post(port, payload):
+    """ μία αίτηση POST /evaluate σε νέα σύνδεση (με τα streams του asyncio) """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode()
+    writer.write(b"POST /evaluate HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+def test_micro_batching(hansen):
+    points = [(6 + k % 9, 0.5 + 0.05 * k, (k % 3) * 1.5) for k in range(24)]
+
+    async def scenario():
+        server = await BEMServer({"DTU": hansen}, window=0.05).start(port=0)
+        port = server.address[1]
+        try:
+            responses = await asyncio.gather(*(
+                post(port, {"wind_speed": V0, "rotation_speed": [omega, omega + 0.1], "pitch_offset": pitch, "per_section": k == 0})
+                for k, (V0, omega, pitch) in enumerate(points)))
+            bad = await post(port, {"rotor": "NREL", "wind_speed": 8, "rotation_speed": 1})
+            return responses, bad, server.stats.summary()
+        finally:
+            await server.close()
+
+    responses, bad, stats = asyncio.run(scenario())
+    for (V0, omega, pitch), (status, result) in zip(points, responses):
+        assert status == 200
+        expected = hansen.operating_points(V0, [omega, omega + 0.1], pitch)
+        for key in ("power", "torque", "thrust", "Cp", "CT"):
+            assert np.array_equal(result[key], expected[key]), key
+    assert "sections" in responses[0][1] and "sections" not in responses[1][1]
+    assert len(responses[0][1]["sections"]["a"][0]) == hansen.no_sections
+    assert bad[0] == 400 and "NREL" in bad[1]["error"]
+    # οι ταυτόχρονες αιτήσεις επιλύθηκαν σε λίγες παρτίδες
+    assert stats["requests"] == 25 and stats["errors"] == 1
+    assert stats["batches"] < len(points) and stats["batch_points"]["max"] > 2
+    assert set(stats["latency_ms"]) == {"p50", "p90", "p99", "max"}
+
+def test_batcher_close(hansen):
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(hansen, executor, ServerStats(), window=10.0, max_points=2)
+            running = asyncio.ensure_future(batcher.evaluate(np.array([[8.0, 1.0, 0.0], [10.0, 1.0, 0.0]])))
+            waiting = asyncio.ensure_future(batcher.evaluate(np.array([[9.0, 1.0, 0.0]])))
+            await asyncio.sleep(0)
+            # η πρώτη παρτίδα επιλύεται και κρατείται από τον batcher μέχρι να ολοκληρωθεί
+            assert len(batcher._tasks) == 1
+            await batcher.close()
+            assert not batcher._tasks and not batcher._timers
+            return await running, await asyncio.gather(waiting, return_exceptions=True)
+
+    result, (waiting,) = asyncio.run(scenario())
+    assert np.array_equal(result["power"], hansen.operating_points([8, 10], 1.0)["power"])
+    assert isinstance(waiting, asyncio.CancelledError)
+
+def test_unix_socket_and_client(hansen, tmp_path):
+    path = str(tmp_path / "bem.sock")
+
+    async def scenario():
+        server = await BEMServer({"DTU": hansen}).start(unix_path=path)
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, lambda: request(
+                "/evaluate", {"wind_speed": [8, 10], "rotation_speed": 1.0}, unix_path=path))
+            rotors = await loop.run_in_executor(None, lambda: request("/rotors", unix_path=path))
+            with pytest.raises(RuntimeError):
+                await loop.run_in_executor(None, lambda: request("/evaluate", {"wind_speed": -1, "rotation_speed": 1.0}, unix_path=path))
+            return result, rotors
+        finally:
+            await server.close()
+
+    result, rotors = asyncio.run(scenario())
+    assert np.array_equal(result["power"], hansen.operating_points([8, 10], 1.0)["power"])
+    assert rotors["DTU"]["no_sections"] == hansen.no_sections
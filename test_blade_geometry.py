@@ -0,0 +1,64 @@
+import json
+import numpy as np
+import pytest
+
+from blade_geometry import BladeGeometry
+import _algorithmos_DTU as d10
+
+@pytest.fixture
+def geometry():
+    return BladeGeometry.from_json("blade_geom_DTU.json")
+
+def test_from_json(geometry):
+    with open("blade_geom_DTU.json") as file:
+        data = json.load(file)
+    assert geometry.no_sections == data["no_sections"]
+    assert np.array_equal(geometry.chords, data["chords"])
+    assert geometry.R == data["R"]
+
+def test_json_round_trip(geometry, tmp_path):
+    geometry.to_json(tmp_path / "geometry.json")
+    loaded = BladeGeometry.from_json(tmp_path / "geometry.json")
+    for name in ("r_is", "chords", "pitch", "tc_ratios"):
+        assert np.array_equal(getattr(loaded, name), getattr(geometry, name))
+
+def test_resample_matches_blade_geometry_seperation(geometry):
+    resampled = geometry.resample(10)
+    expected = d10.blade_geometry_seperation(geometry.r_is, geometry.chords, geometry.pitch, geometry.tc_ratios,
+                                             geometry.r_is[0], geometry.r_is[-1], num_sections=10)
+    for actual, values in zip((resampled.r_is, resampled.chords, resampled.pitch, resampled.tc_ratios), expected):
+        assert np.array_equal(actual, values)
+    # η επαναδειγματοληψία υπολογίζεται μία φορά για κάθε (n, spacing)
+    assert geometry.resample(10) is resampled
+    assert geometry.resample(10, spacing='cosine') is not resampled
+    cosine = geometry.resample(20, spacing='cosine')
+    assert cosine.r_is[0] == geometry.r_is[0] and cosine.r_is[-1] == geometry.r_is[-1]
+    assert np.diff(cosine.r_is)[0] < np.diff(cosine.r_is)[9]
+
+def test_geometry_is_read_only(geometry):
+    with pytest.raises(AttributeError):
+        geometry.R = 100
+    with pytest.raises(ValueError):
+        geometry.chords[0] = 1
+    with pytest.raises(AttributeError):
+        geometry.extra = 1
+
+@pytest.mark.parametrize("kwargs", [
+    dict(r_is=[1, 2, 2], chords=[1, 1, 1], pitch=0),
+    dict(r_is=[1, 2, 3], chords=[1, 1], pitch=0),
+    dict(r_is=[1, 2, 3], chords=[1, 0, 1], pitch=0),
+    dict(r_is=[1, 2, 3], chords=[1, 1, 1], pitch=[0, np.nan, 0]),
+    dict(r_is=[1, 2, 3], chords=[1, 1, 1], pitch=0, R=2.5),
+])
+def test_geometry_validation(kwargs):
+    with pytest.raises(ValueError):
+        BladeGeometry(**kwargs)
+
+def test_solver_accepts_geometry(geometry):
+    from_file = d10.Hansen_Algorithm("blade_geom_DTU.json")
+    from_geometry = d10.Hansen_Algorithm(geometry)
+    assert from_geometry.geometry is geometry.resample(10)
+    assert np.array_equal(from_geometry.r_is, from_file.r_is)
+    assert from_geometry.DTU_blade_calculation(10, 1.0)[1] == from_file.DTU_blade_calculation(10, 1.0)[1]
+    finer = d10.Hansen_Algorithm(geometry, num_sections=30)
+    assert finer.no_sections == 30
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("pandas", "matplotlib", "scipy", "numba", "openpyxl")
+
+# ο χρόνος εισαγωγής μετριέται σε νέα διεργασία, ώστε να μην επηρεάζεται από όσα έχουν ήδη φορτωθεί από άλλα tests
+IMPORT_BENCHMARK = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+def import_in_subprocess(module, cwd):
+    """ εισαγωγή της ενότητας module σε νέα διεργασία: ο χρόνος εισαγωγής (s) και οι βαριές ενότητες που φορτώθηκαν """
+    # οι ενότητες του NACA χρειάζονται και τις κοινές ενότητες του αποθετηρίου στο sys.path
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (repo_dir, os.environ.get("PYTHONPATH")))))
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_BENCHMARK.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=cwd, capture_output=True, text=True, check=True, env=env).stdout.splitlines()
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+@pytest.mark.parametrize("module, cwd", [
+    ("_algorithmos_DTU", "."),
+    ("Dtu_table", "."),
+    ("bem_kernels", "."),
+    ("bem_results", "."),
+    ("trace_writer", "."),
+    ("blade_geometry", "."),
+    ("solve_cache", "."),
+    ("rotor_cache", "."),
+    ("parallel_sweep", "."),
+    ("solver_config", "."),
+    ("bem_server", "."),
+    ("aep", "."),
+    ("algorithmos_Naca", "NACA"),
+])
+def test_core_import_loads_only_numpy(module, cwd):
+    elapsed, loaded = import_in_subprocess(module, os.path.join(os.path.dirname(os.path.abspath(__file__)), cwd))
+    print(f"import {module}: {elapsed * 1000:.1f} ms")
+    assert loaded == []
+
+if __name__ == "__main__":
+    for module, cwd in (("_algorithmos_DTU", "."), ("algorithmos_Naca", "NACA")):
+        elapsed, loaded = import_in_subprocess(module, cwd)
+        print(f"import {module}: {elapsed * 1000:.1f} ms {loaded}")
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import _algorithmos_DTU as d10
+from parallel_sweep import ParallelSweep, SharedArrays, _build_rotor, _rotor_arrays, _rotor_settings
+
+@pytest.fixture
+def hansen():
+    return d10.Hansen_Algorithm("blade_geom_DTU.json")
+
+def test_shared_arrays():
+    values = np.arange(12.0).reshape(3, 4)
+    with SharedArrays.create({"values": values, "flags": (bool, (5,))}) as shared:
+        attached = SharedArrays.attach(shared.descriptor)
+        assert np.array_equal(attached.arrays["values"], values)
+        assert attached.arrays["flags"].shape == (5,)
+        with pytest.raises(ValueError):
+            attached.arrays["values"][0, 0] = 1.0 # μόνο για ανάγνωση
+        attached.close()
+
+def test_rotor_from_shared_arrays(hansen):
+    # ο αλγόριθμος των διεργασιών δίνει τα ίδια αποτελέσματα με τον αρχικό
+    rotor = _build_rotor(_rotor_arrays(hansen), _rotor_settings(hansen))
+    assert np.array_equal(rotor.r_is, hansen.r_is)
+    expected = hansen.operating_grid([8, 11], [0.7, 1.1], per_section=True)
+    grid = rotor.operating_grid([8, 11], [0.7, 1.1], per_section=True)
+    for key, value in expected["sections"].items():
+        assert np.array_equal(grid["sections"][key], value, equal_nan=True), key
+
+def test_parallel_operating_grid(hansen):
+    wind_speeds = [6, 9, 12]
+    rotation_speeds = 2 * np.pi * np.linspace(4, 14, 7) / 60
+    expected = hansen.operating_grid(wind_speeds, rotation_speeds, pitch_offsets_deg=[0, 3], per_section=True)
+    with ParallelSweep(hansen, processes=2, chunk_size=5) as sweep:
+        grid = sweep.operating_grid(wind_speeds, rotation_speeds, pitch_offsets_deg=[0, 3], per_section=True)
+        assert grid["chunks"] == 9 # 42 σημεία λειτουργίας σε τμήματα των 5
+        # τα αποτελέσματα είναι ίδια σε όλα τα ψηφία και στη σειρά του πλέγματος
+        for key in ("power", "torque", "thrust", "Cp", "CT", "iterations"):
+            assert np.array_equal(grid[key], expected[key], equal_nan=True), key
+        for key, value in expected["sections"].items():
+            assert np.array_equal(grid["sections"][key], value, equal_nan=True), key
+        bracketed = sweep.operating_grid(wind_speeds, rotation_speeds, solver='bracketed')
+        assert np.array_equal(bracketed["power"], hansen.operating_grid(wind_speeds, rotation_speeds, solver='bracketed')["power"])
@@ -0,0 +1,59 @@
+import shutil
+import numpy as np
+import pytest
+
+import _algorithmos_DTU as d10
+from rotor_cache import RotorResultCache
+from solver_config import SolverConfig
+
+@pytest.fixture
+def hansen():
+    return d10.Hansen_Algorithm("blade_geom_DTU.json")
+
+def test_operating_grid_result_cache(hansen, tmp_path):
+    expected = hansen.operating_grid([8, 10], [0.6, 0.9, 1.2], pitch_offsets_deg=[0, 2], per_section=True)
+    with RotorResultCache(str(tmp_path)) as cache:
+        first = hansen.operating_grid([8, 10], [0.6, 0.9, 1.2], pitch_offsets_deg=[0, 2], per_section=True, result_cache=cache)
+        assert first["cached_points"] == 0 and cache.stats()["entries"] == 12
+    # νέα σύνδεση στην ίδια βάση: υπολογίζεται μόνο το V0 = 12
+    with RotorResultCache(str(tmp_path)) as cache:
+        second = hansen.operating_grid([8, 10, 12], [0.6, 0.9, 1.2], pitch_offsets_deg=[0, 2], per_section=True, result_cache=cache)
+        assert second["cached_points"] == 12 and cache.stats()["entries"] == 18
+    for grid in (first, second):
+        assert np.array_equal(grid["power"][:2], expected["power"])
+        for key, value in expected["sections"].items():
+            assert np.array_equal(grid["sections"][key][:2], value, equal_nan=True), key
+            assert grid["sections"][key].dtype == value.dtype
+
+def test_operating_grid_result_cache_empty_grid(hansen, tmp_path):
+    expected = hansen.operating_grid([], [0.6, 0.9], per_section=True)
+    with RotorResultCache(str(tmp_path)) as cache:
+        grid = hansen.operating_grid([], [0.6, 0.9], per_section=True, result_cache=cache)
+        assert grid["cached_points"] == 0 and cache.stats()["entries"] == 0
+    assert grid["power"].shape == expected["power"].shape == (0, 2, 1)
+    for key, value in expected["sections"].items():
+        assert grid["sections"][key].shape == value.shape and grid["sections"][key].dtype == value.dtype, key
+
+def test_result_cache_key(hansen, tmp_path):
+    key = hansen.result_cache_key()
+    assert key == d10.Hansen_Algorithm("blade_geom_DTU.json").result_cache_key()
+    assert key != hansen.result_cache_key(solver='bracketed')
+    assert key != hansen.result_cache_key(config=SolverConfig(relaxation=0.6))
+    assert key != d10.Hansen_Algorithm("blade_geom_DTU.json", num_sections=12).result_cache_key()
+    # αλλαγή στο περιεχόμενο του αρχείου της αεροτομής
+    csv_file = tmp_path / "polars.csv"
+    shutil.copy("csv_data_file_DTU.csv", csv_file)
+    other = d10.Hansen_Algorithm("blade_geom_DTU.json", csv_data_file=str(csv_file))
+    assert other.result_cache_key() == key # το κλειδί εξαρτάται από το περιεχόμενο και όχι από τη διαδρομή του αρχείου
+    with open(csv_file, "a") as file:
+        file.write("\n")
+    assert other.result_cache_key() != key
+
+def test_result_cache_eviction(hansen, tmp_path):
+    with RotorResultCache(str(tmp_path)) as cache:
+        hansen.operating_grid([8], [0.6, 0.9], result_cache=cache)
+        size = cache.stats()["bytes"]
+        cache.max_bytes = size # χωρούν μόνο δύο σημεία: τα παλαιότερα διαγράφονται
+        hansen.operating_grid([10], [0.6], result_cache=cache)
+        assert cache.stats()["entries"] == 2
+        assert hansen.operating_grid([10], [0.6], result_cache=cache)["cached_points"] == 1
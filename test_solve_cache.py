@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import _algorithmos_DTU as d10
+from solve_cache import SectionSolveCache
+
+@pytest.fixture
+def hansen():
+    return d10.Hansen_Algorithm("blade_geom_DTU.json", solve_cache=SectionSolveCache())
+
+def test_lru_eviction():
+    cache = SectionSolveCache(max_bytes=10**9)
+    keys = cache.keys(("settings",), [1.0, 2.0, 3.0], [0.5, 0.5, 0.5])
+    assert keys[0] == (("settings",), 1.0, 0.5)
+    for i, key in enumerate(keys):
+        cache.put(key, ("a",), (float(i),))
+    assert cache.get(keys[0]).values == (0.0,)
+    assert cache.get(("settings", 4.0, 0.5)) is None
+    cache.max_bytes = cache.bytes - 1 # διαγράφεται το λιγότερο πρόσφατα χρησιμοποιημένο (keys[1])
+    cache.put(keys[2], ("a",), (2.0,))
+    assert cache.get(keys[1]) is None and cache.get(keys[0]) is not None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 2, 1, 2)
+
+def test_segment_calculation_cache(hansen):
+    kwargs = dict(wind_speed_V0=10, omega_rad_sec=0.5, r=hansen.r_is[3], chord=hansen.chords[3],
+                  pitch_angle_deg=hansen.pitch[3], twist_deg=0, tc_ratio=hansen.tc_ratios[3])
+    first = hansen.segment_calculation(**kwargs)
+    first["extra"] = 1 # το αποτέλεσμα είναι αντίγραφο και δεν αλλάζει την cache
+    second = hansen.segment_calculation(**kwargs)
+    assert "extra" not in second
+    assert second["a"] == first["a"] and second["counter"] == first["counter"]
+    assert hansen.solve_cache.stats()["hits"] == 1
+    # με καταγραφή των επαναλήψεων η cache δεν χρησιμοποιείται
+    assert "trace" in hansen.segment_calculation(**kwargs, trace='full')
+
+def test_sections_calculation_cache(hansen):
+    reference = d10.Hansen_Algorithm("blade_geom_DTU.json")
+    expected = reference.operating_grid([8, 10, 12], np.linspace(0.5, 1.2, 8), per_section=True)
+    hansen.operating_grid([10], np.linspace(0.5, 1.2, 8))
+    stats = hansen.solve_cache.stats()
+    assert stats["hits"] == 0 and stats["entries"] == 8 * hansen.no_sections
+    # το V0 = 10 υπάρχει ήδη στην cache, επομένως επιλύονται μόνο τα 8 και 12
+    grid = hansen.operating_grid([8, 10, 12], np.linspace(0.5, 1.2, 8), per_section=True)
+    assert hansen.solve_cache.stats()["hits"] == 8 * hansen.no_sections
+    for key, value in expected["sections"].items():
+        assert np.array_equal(grid["sections"][key], value, equal_nan=True), key
+        assert grid["sections"][key].dtype == value.dtype
+    assert np.array_equal(grid["power"], expected["power"])
+    # όλα τα τμήματα από την cache
+    again = hansen.operating_grid([8, 10, 12], np.linspace(0.5, 1.2, 8))
+    assert np.array_equal(again["power"], expected["power"])
@@ -0,0 +1,133 @@
+import os
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import _algorithmos_DTU as d10
+import bem_kernels
+from Dtu_table import DTU_calc
+from solve_cache import SectionSolveCache
+from solver_config import SolverConfig
+
+@pytest.fixture(scope="module")
+def hansen():
+    return d10.Hansen_Algorithm("blade_geom_DTU.json", solve_cache=SectionSolveCache())
+
+def test_solver_config():
+    config = SolverConfig()
+    assert (config.tolerance, config.max_iter, config.relaxation) == (1e-4, 100, 0.3)
+    assert config.replace(max_iter=50) == SolverConfig(1e-4, 50, 0.3)
+    with pytest.raises(AttributeError):
+        config.tolerance = 1e-6
+    for invalid in ({"tolerance": 0}, {"max_iter": 2.5}, {"max_iter": 0}, {"relaxation": 1.5}):
+        with pytest.raises(ValueError):
+            config.replace(**invalid)
+
+def test_config_per_instance_and_per_call(hansen):
+    strict = SolverConfig(tolerance=1e-8, max_iter=400)
+    per_call = hansen.operating_grid([8, 11], [0.7, 1.1], config=strict)
+    per_instance = hansen.with_config(strict).operating_grid([8, 11], [0.7, 1.1])
+    assert np.array_equal(per_call["power"], per_instance["power"])
+    assert per_call["iterations"] > hansen.operating_grid([8, 11], [0.7, 1.1])["iterations"]
+    # οι ρυθμίσεις και η κατάσταση του αρχικού αλγορίθμου δεν αλλάζουν
+    assert hansen.config == SolverConfig() and hansen.with_config(max_iter=5).max_iter == 5 and hansen.max_iter == 100
+    for name, value in (("tolerance", 1e-6), ("max_iter", 5), ("B", 2), ("rotation_speed", 1.0)):
+        with pytest.raises(AttributeError):
+            setattr(hansen, name, value)
+    with pytest.raises(TypeError):
+        hansen.operating_grid(8, 1.0, config={"tolerance": 1e-6})
+    restored = pickle.loads(pickle.dumps(d10.Hansen_Algorithm("blade_geom_DTU.json", config=strict)))
+    assert restored.config == strict
+    assert np.array_equal(restored.operating_grid([8, 11], [0.7, 1.1])["power"], per_call["power"])
+
+def test_shared_instance_under_threads(hansen):
+    configs = [None, SolverConfig(tolerance=1e-6, max_iter=200), SolverConfig(relaxation=0.5)]
+    backends = ['numpy', 'numba'] if bem_kernels.HAS_NUMBA else ['numpy']
+    rng = np.random.default_rng(0)
+
+    def task(k):
+        """ ένας συνδυασμός μεθόδου, σημείου λειτουργίας και ρυθμίσεων για κάθε k """
+        config = configs[k % len(configs)]
+        V0, omega = 6 + 8 * rng_points[k, 0], 0.3 + 1.0 * rng_points[k, 1]
+        kind = k % 4
+        if kind == 0:
+            return hansen.segment_calculation(V0, omega, hansen.r_is[5], hansen.chords[5], hansen.pitch[5], 0,
+                                              hansen.tc_ratios[5], config=config)
+        if kind == 1:
+            return hansen.sections_calculation(V0, omega, hansen.r_is, hansen.chords, hansen.pitch, 0, hansen.tc_ratios,
+                                               section_index=np.arange(hansen.no_sections), config=config,
+                                               backend=backends[k % len(backends)])
+        if kind == 2:
+            grid = hansen.operating_grid([V0, V0 + 1], [omega, omega + 0.2], per_section=True, config=config,
+                                         solver=('fixed_point', 'bracketed')[k % 2])
+            return {"power": grid["power"], **grid["sections"]}
+        results, power, torque, thrust = hansen.DTU_blade_calculation(V0, omega, vectorized=True, columnar=True, config=config)
+        return {"power": power, "torque": torque, "thrust": thrust, **{name: results[name] for name in results.columns}}
+
+    rng_points = rng.random((240, 2))
+    serial = [task(k) for k in range(len(rng_points))]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6) # συχνότερη εναλλαγή των νημάτων
+    try:
+        for _ in range(2): # (η δεύτερη επανάληψη διαβάζει τις λύσεις από τη solve_cache)
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                threaded = list(pool.map(task, range(len(rng_points))))
+            for expected, result in zip(serial, threaded):
+                assert expected.keys() == result.keys()
+                for key, value in expected.items():
+                    assert np.array_equal(np.asarray(result[key]), np.asarray(value), equal_nan=True), key
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+def write_polars(path, tc_values, angles, cl_factor):
+    """ αρχείο αεροτομής με Cl = cl_factor * (α / 10 + t/c / 100), μέσω προσωρινού αρχείου (όπως ένα πρόγραμμα που το ξαναγράφει) """
+    rows = [f"{angle};{cl_factor * (angle / 10 + tc / 100)};{0.01 * cl_factor};0.0;{tc}" for tc in tc_values for angle in angles]
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text("\n".join(["angle_of_attack;Cl;Cd;Cm;t/c ratio"] + rows) + "\n")
+    os.replace(temp_path, path)
+
+def test_polar_reload_while_reading(tmp_path):
+    # δύο εκδόσεις του αρχείου με διαφορετικά πλέγματα: ένα μείγμα των πινάκων τους δίνει λάθος τιμές ή IndexError
+    versions = [((24.0, 100.0), (-10.0, 0.0, 10.0), 1.0), ((24.0, 36.0, 60.0, 100.0), (-10.0, -5.0, 0.0, 2.5, 5.0, 10.0), 2.0)]
+    angles = np.array([-7.5, -1.0, 3.0, 9.0])
+    tc_ratios = np.array([30.0, 50.0, 80.0, 99.0])
+    expected = []
+    for i, version in enumerate(versions):
+        write_polars(tmp_path / f"expected{i}.csv", *version)
+        reference = DTU_calc(str(tmp_path / f"expected{i}.csv"), use_cache=False)
+        expected.append((reference.coefficients(angles, tc_ratios).Cl, reference.blend(tc_ratios).coefs))
+    csv_file = tmp_path / "polars.csv"
+    write_polars(csv_file, *versions[0])
+    dtu = DTU_calc(str(csv_file), use_cache=False)
+    stop = threading.Event()
+
+    def writer():
+        for i in range(60):
+            write_polars(csv_file, *versions[(i + 1) % 2])
+            time.sleep(0.002)
+        stop.set()
+
+    def reader(reloads):
+        checked = 0
+        while not stop.is_set() or checked == 0:
+            if reloads:
+                dtu.reload_if_changed()
+            Cl = dtu.coefficients(angles, tc_ratios).Cl
+            assert any(np.array_equal(Cl, values[0]) for values in expected)
+            scalar = [dtu.cl(angle, tc) for angle, tc in zip(angles, tc_ratios)]
+            assert any(np.allclose(scalar, values[0], rtol=0, atol=1e-12) for values in expected)
+            blended = dtu.blend(tc_ratios).coefs
+            assert any(blended.shape == values[1].shape and np.array_equal(blended, values[1]) for values in expected)
+            checked += 1
+        return checked
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        readers = [executor.submit(reader, reloads) for reloads in (True, True, False, False)]
+        executor.submit(writer).result()
+        assert all(future.result() > 0 for future in readers)
+    assert dtu.version > 1
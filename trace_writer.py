@@ -0,0 +1,157 @@
+#%%
+"""
+Εγγραφή των ιστορικών σύγκλισης (trace) της segment_calculation σε αρχείο CSV από νήμα στο παρασκήνιο.
+Το νήμα του αλγορίθμου μόνο προσθέτει το ιστορικό σε μία ουρά και συνεχίζει αμέσως, χωρίς να περιμένει την εγγραφή.
+"""
+import atexit
+import csv
+import itertools
+import os
+import queue
+import tempfile
+import threading
+
+# το αρχείο της debug_mode=True, στον φάκελο του αποθετηρίου (και όχι στον τρέχοντα φάκελο της διεργασίας)
+DEFAULT_TRACE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "save_res.csv")
+
+_default_writer = None
+_default_writer_lock = threading.Lock()
+
+def get_default_trace_writer():
+    """ 
+    ο κοινός TraceWriter της διεργασίας για το debug_mode=True (δημιουργείται στην πρώτη χρήση), στο αρχείο DEFAULT_TRACE_FILE.
+    Τον μοιράζονται οι αλγόριθμοι DTU και NACA, ακόμη και αν τα ιστορικά τους έχουν διαφορετικά κλειδιά.
+    """
+    global _default_writer
+    with _default_writer_lock:
+        if _default_writer is None or _default_writer.closed:
+            _default_writer = TraceWriter(DEFAULT_TRACE_FILE)
+        return _default_writer
+
+class TraceWriter:
+    """
+    Νήμα που γράφει τα ιστορικά σύγκλισης σε ένα αρχείο CSV: μία γραμμή ανά επανάληψη, με στήλες το μοναδικό
+    αναγνωριστικό "trace_id" του ιστορικού, τα κλειδιά που το συνοδεύουν (π.χ. ταχύτητα ανέμου, ακτίνα τμήματος)
+    και τα πεδία του ιστορικού. Οι στήλες είναι η ένωση των στηλών όλων των ιστορικών, με τη σειρά που εμφανίστηκαν:
+    οι στήλες που λείπουν από ένα ιστορικό (π.χ. το tc_ratio στα ιστορικά του NACA) μένουν κενές, και όταν ένα ιστορικό
+    φέρνει νέες στήλες το αρχείο ξαναγράφεται με τη νέα επικεφαλίδα. Τα δεδομένα γράφονται όλα
+    με την close (ή τη flush), που καλείται αυτόματα και κατά τον τερματισμό του προγράμματος.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): το αρχείο CSV (αντικαθίσταται αν υπάρχει)
+        """
+        self.path = path
+        self.closed = False
+        self._queue = queue.Queue()
+        self._trace_ids = itertools.count()
+        self._columns = ["trace_id"] # η ένωση των στηλών (χρησιμοποιείται μόνο από το νήμα εγγραφής)
+        self._positions = {"trace_id": 0}
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="TraceWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, trace, **key):
+        """
+        προσθήκη ενός ιστορικού στην ουρά εγγραφής (δεν περιμένει την εγγραφή)
+
+        Args:
+            trace (np.ndarray): δομημένος πίνακας με μία γραμμή ανά επανάληψη (π.χ. το "trace" της segment_calculation)
+            **key: τα μεγέθη που προσδιορίζουν το ιστορικό, π.χ. wind_speed_V0=10, r=20.5
+
+        Returns:
+            (int): το αναγνωριστικό "trace_id" του ιστορικού στο αρχείο
+        """
+        if self.closed:
+            raise ValueError("Ο TraceWriter έχει κλείσει")
+        trace_id = next(self._trace_ids)
+        self._queue.put((trace_id, key, trace))
+        return trace_id
+
+    def _run(self):
+        file = open(self.path, mode='w', newline='')
+        try:
+            writer = csv.writer(file)
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None:
+                        return
+                    if self._error is None:
+                        trace_id, key, trace = item
+                        names = tuple(key) + trace.dtype.names
+                        new_names = [name for name in names if name not in self._positions]
+                        if new_names:
+                            header_written = len(self._columns) > 1
+                            for name in new_names:
+                                self._positions[name] = len(self._columns)
+                                self._columns.append(name)
+                            if header_written: # νέες στήλες: το αρχείο ξαναγράφεται με την ένωση των στηλών
+                                file.close()
+                                self._rewrite_header()
+                                file = open(self.path, mode='a', newline='')
+                                writer = csv.writer(file)
+                            else:
+                                writer.writerow(self._columns)
+                        prefix = (trace_id,) + tuple(key.values())
+                        positions = [self._positions[name] for name in names]
+                        if positions == list(range(1, len(self._columns))):
+                            writer.writerows(prefix + row for row in trace.tolist())
+                        else:
+                            writer.writerows(self._arrange(prefix + row, positions) for row in trace.tolist())
+                        if self._queue.empty():
+                            file.flush()
+                except Exception as error:
+                    self._error = error
+                finally:
+                    self._queue.task_done()
+        finally:
+            file.close()
+
+    def _arrange(self, values, positions):
+        """ οι τιμές values (trace_id και τιμές στις θέσεις positions) στη σειρά των στηλών, με κενές τις στήλες που λείπουν """
+        row = [""] * len(self._columns)
+        row[0] = values[0]
+        for position, value in zip(positions, values[1:]):
+            row[position] = value
+        return row
+
+    def _rewrite_header(self):
+        """ αντικατάσταση της επικεφαλίδας με την ένωση των στηλών (οι προηγούμενες γραμμές συμπληρώνονται με κενές τιμές) """
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+        try:
+            with open(self.path, newline='') as source, os.fdopen(fd, 'w', newline='') as target:
+                rows = csv.reader(source)
+                next(rows)
+                writer = csv.writer(target)
+                writer.writerow(self._columns)
+                padding = [""] * len(self._columns)
+                writer.writerows(row + padding[len(row):] for row in rows)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def flush(self):
+        """ αναμονή μέχρι να γραφτούν όλα τα ιστορικά που έχουν προστεθεί """
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        """ εγγραφή όσων απομένουν στην ουρά και κλείσιμο του αρχείου """
+        if not self.closed:
+            self.closed = True
+            self._queue.put(None)
+            self._thread.join()
+            atexit.unregister(self.close)
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()